@@ -1,160 +1,240 @@
 import time
-from typing import Tuple
-import cv2
-import numpy as np
-
-from hastayanam.config import VIDEO, THRESHOLDS
-from hastayanam.tracking import HandTracker, open_camera
-from hastayanam.gestures import GestureClassifier
-from hastayanam.modes import ModeManager, Mode
-from hastayanam.overlay import draw_hud
-from hastayanam.utils import FpsMeter, CooldownManager
-
-from hastayanam import actions_system as sys_actions
-from hastayanam import actions_media as media_actions
-from hastayanam import actions_browser as browser_actions
-
-
-def map_action_system(gesture_name: str, is_hold: bool):
-	if gesture_name == "open_palm":
-		return "Show Desktop", sys_actions.show_desktop, 1.0
-	if gesture_name == "point_up":
-		return "Volume Up", lambda: sys_actions.volume_up(steps=1), 0.25
-	if gesture_name == "point_down":
-		return "Volume Down", lambda: sys_actions.volume_down(steps=1), 0.25
-	if gesture_name == "swipe_right":
-		return "Next Window", sys_actions.next_window, 0.9
-	if gesture_name == "swipe_left":
-		return "Previous Window", sys_actions.prev_window, 0.9
-	if gesture_name == "fist":
-		return ("Lock Screen" if not is_hold else "Sleep"), (sys_actions.lock_screen if not is_hold else sys_actions.sleep_computer), 1.5
-	if gesture_name == "thumbs_up":
-		return "Confirm / Enter", sys_actions.confirm_enter, 0.9
-	return "", None, 0.9
-
-
-def map_action_media(gesture_name: str, is_hold: bool):
-	if gesture_name == "swipe_right":
-		return "Next Slide/Video/Track", media_actions.next_slide, 0.8
-	if gesture_name == "swipe_left":
-		return "Previous Slide/Video/Track", media_actions.prev_slide, 0.8
-	if gesture_name == "open_palm":
-		return "Start/Resume", media_actions.start_presentation, 1.0
-	if gesture_name == "fist":
-		return "Pause", media_actions.play_pause, 0.9
-	if gesture_name == "two_fingers":
-		return "Play/Pause", media_actions.play_pause, 0.9
-	if gesture_name == "thumbs_up":
-		return "Volume Up", media_actions.volume_up, 0.25
-	if gesture_name == "thumbs_down":
-		return "Volume Down", media_actions.volume_down, 0.25
-	return "", None, 0.9
-
-
-def map_action_browser(gesture_name: str, is_hold: bool):
-	if gesture_name == "swipe_right":
-		return "Next Tab", browser_actions.next_tab, 0.8
-	if gesture_name == "swipe_left":
-		return "Previous Tab", browser_actions.prev_tab, 0.8
-	if gesture_name == "open_palm":
-		return "New Tab", browser_actions.new_tab, 1.0
-	if gesture_name == "fist":
-		return "Close Tab", browser_actions.close_tab, 0.9
-	if gesture_name == "thumbs_up":
-		return "Reload Page", browser_actions.reload_page, 1.0
-	if gesture_name == "thumbs_down":
-		return "Go Back", browser_actions.go_back, 0.8
-	if gesture_name == "two_fingers":
-		return "Go Forward", browser_actions.go_forward, 0.9
-	if gesture_name == "open_palm" and is_hold:
-		return "Incognito Window", browser_actions.open_incognito, 1.5
-	return "", None, 0.9
+_T_START = time.perf_counter()  # Before the imports below, so time-to-first-frame includes them
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import threading
+
+from hastayanam.dispatcher import ActionDispatcher
+from hastayanam.config import ACTIONS, VIDEO, METRICS, POOL, SERVICE, FRAMES, BINDINGS, TRACKING, CAPTURE
+from hastayanam.capture import open_capture
+from hastayanam.bindings import BindingTable
+from hastayanam.controller import GestureController
+from hastayanam.learned import load_backend
+from hastayanam.tracking import HandTracker, draw_hands
+from hastayanam.tasks_tracking import LiveStreamStage, LiveStreamTracker
+from hastayanam.frames import FrameRing, frame_shape
+from hastayanam.inference_pool import InferencePool, PoolStage
+from hastayanam.scheduler import AdaptiveScheduler
+from hastayanam.input_backends import BACKENDS, get_backend, set_backend
+from hastayanam.lazy import lazy_import
+from hastayanam.metrics import PROFILER, StartupTimer, start_periodic_dump
+from hastayanam.overlay import HudCompositor, draw_metrics_panel
+from hastayanam.recording import LandmarkRecorder
+from hastayanam.service import ControlServer, write_status
+from hastayanam.pipeline import CaptureThread, FramePacket, InferenceThread, LatestSlot, format_timings
+from hastayanam.utils import FpsMeter, now
+
+cv2 = lazy_import("cv2")
 
 
 def main():
-	cap = open_camera()
-	tracker = HandTracker()
-	classifier_right = GestureClassifier()
-	classifier_left = GestureClassifier()
-	modes = ModeManager()  # Global mode: System ↔ Media ↔ Browser
+	parser = argparse.ArgumentParser(description="Hastayanam gesture control")
+	parser.add_argument("--source", default=CAPTURE.source, help="Camera index, video file path or \"synthetic\" (default: VIDEO.camera_index)")
+	parser.add_argument("--record", metavar="PATH", help="Write every frame's landmarks to a .hlm recording")
+	parser.add_argument("--metrics", metavar="PATH", help="Periodically dump stage timings to PATH (.json or .csv)")
+	parser.add_argument("--headless", action="store_true", default=SERVICE.headless, help="Run without the preview window, landmark drawing or HUD")
+	parser.add_argument("--control-port", type=int, default=SERVICE.control_port, help="Accept quit/mode/preview/status commands on this local TCP port")
+	parser.add_argument("--workers", type=int, default=POOL.workers, help="Run hand tracking in this many processes")
+	parser.add_argument("--tracker", default=TRACKING.backend, choices=("solutions", "tasks"), help="Legacy synchronous MediaPipe Hands, or the Tasks HandLandmarker in LIVE_STREAM mode")
+	parser.add_argument("--max-hands", type=int, default=TRACKING.max_num_hands, help="Hands to track at once (more than 2 for several people in view)")
+	parser.add_argument("--bindings", default=BINDINGS.path, metavar="PATH", help="JSON gesture->action bindings, reloaded when edited")
+	parser.add_argument("--classifier-model", metavar="PATH", help="Classify static poses with this trained MLP (.npz) instead of CLASSIFIER.backend")
+	parser.add_argument("--actions", default=ACTIONS.backend, choices=("auto", *BACKENDS), help="Where gesture actions send input (recording only logs them)")
+	parser.add_argument("--status-file", default=SERVICE.status_path, help="Rewrite a JSON status file every SERVICE.status_interval_s")
+	args = parser.parse_args()
+	if args.tracker == "tasks" and args.workers > 1:
+		parser.error("--tracker tasks runs inference asynchronously in-process; it does not combine with --workers")
+	startup = StartupTimer(_T_START)
+	startup.mark("imports")
+
+	def report_actions(future):
+		if future.exception() is not None:
+			print(f"warning: action backend {args.actions!r} unavailable, gesture actions will fail: {future.exception()}")
+
+	def warm_tracker():
+		with startup.phase("model"):
+			tracker = LiveStreamTracker(num_hands=args.max_hands) if args.tracker == "tasks" else HandTracker(max_hands=args.max_hands)
+			tracker.warmup()
+			return tracker
+
+	# Model load and action backend setup overlap the camera open, which can itself take
+	# a second or more; pool workers warm their own trackers once the pool starts
+	warmup = ThreadPoolExecutor(max_workers=2, thread_name_prefix="warmup")
+	warm = warmup.submit(warm_tracker) if args.workers <= 1 else None
+	set_backend(args.actions)
+	warmup.submit(get_backend).add_done_callback(report_actions)
+	warmup.shutdown(wait=False)
+	with startup.phase("camera"):
+		cap = open_capture(args.source)
+		shape = frame_shape(cap)
+	print(f"capture: {cap.describe()}")
+	pool = None
+	if args.workers > 1:
+		# Trackers live in the worker processes; adaptive skipping/ROI stats stay per-worker.
+		# Capture reads straight into the pool's shared ring, so frames reach workers uncopied.
+		pool = InferencePool(workers=args.workers, frame_shape=shape, max_hands=args.max_hands)
+		ring = pool.ring
+		tracker = scheduler = live = None
+	elif args.tracker == "tasks":
+		# HandLandmarker tracks across frames itself; the adaptive scheduler and ROI don't apply
+		ring = FrameRing(shape, FRAMES.ring_slots, FRAMES.shared)
+		live = warm.result()
+		tracker = scheduler = None
+	else:
+		ring = FrameRing(shape, FRAMES.ring_slots, FRAMES.shared)
+		tracker = warm.result()
+		scheduler = AdaptiveScheduler(tracker)
+		live = None
+	dispatcher = ActionDispatcher()
+	backend = load_backend("mlp", args.classifier_model) if args.classifier_model else load_backend()
+	controller = GestureController(dispatcher, BindingTable(args.bindings), backend)
 	fpsm = FpsMeter(smoothing=VIDEO.fps_smoothing)
-	cooldown = CooldownManager(default_seconds=THRESHOLDS.gesture_cooldown_s)
-
-	last_executed_action = ""
-
-	while True:
-		ok, frame = cap.read()
-		if not ok:
-			break
-
-		h, w = frame.shape[:2]
-		proc = tracker.process(frame)
-		hands = proc["hands"]
-		handed = proc["handedness"]
-
-		per_hand_info = []
-		right_gesture = ("unknown", 0.0, False)
-		left_gesture = ("unknown", 0.0, False)
-
-		pairs = tracker.extract_normalized(frame)
-		for item in pairs:
-			lab = item["label"]
-			if lab == "Right":
-				res = classifier_right.infer(item["pts"], (w, h))
-				right_gesture = (res.name, res.confidence, res.is_hold)
-				per_hand_info.append({"label": "Right", "gesture": res.name, "conf": res.confidence})
-			elif lab == "Left":
-				res = classifier_left.infer(item["pts"], (w, h))
-				left_gesture = (res.name, res.confidence, res.is_hold)
-				per_hand_info.append({"label": "Left", "gesture": res.name, "conf": res.confidence})
-
-		# Draw hands
-		tracker.draw(frame, proc)
-
-		# Global mode switch by pinch (either hand)
-		if right_gesture[0] == "pinch" or left_gesture[0] == "pinch":
-			modes.maybe_cycle_on_gesture("pinch")
-		mode = modes.get()
-		progress = modes.mode_switch_progress()
-
-		# Determine the active gesture for this frame (prioritize Right if both present)
-		active_gesture = right_gesture if right_gesture[1] >= left_gesture[1] else left_gesture
-
-		# Map only within the active global mode
-		if active_gesture[1] >= THRESHOLDS.confidence_min:
-			if mode == Mode.SYSTEM:
-				action_text, action_fn, cd = map_action_system(active_gesture[0], active_gesture[2])
-			elif mode == Mode.MEDIA:
-				action_text, action_fn, cd = map_action_media(active_gesture[0], active_gesture[2])
-			else:
-				action_text, action_fn, cd = map_action_browser(active_gesture[0], active_gesture[2])
+	hud_layer = HudCompositor()
+
+	# capture -> inference -> render, each stage only ever sees the newest frame
+	stop = threading.Event()
+	dumper = start_periodic_dump(stop, args.metrics)
+	show_panel = METRICS.hud_panel
+	preview = not args.headless
+	# Replaced packets hand their ring slot back
+	frames = LatestSlot(on_drop=FramePacket.release)
+	results = LatestSlot(on_drop=FramePacket.release)
+	latest = {"hud": {}, "fps": 0.0}
+
+	recorder = None
+	if args.record:
+		recorder = LandmarkRecorder(args.record, int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+	def handle(packet, frame_res):
+		if recorder is not None:
+			recorder.write(now(), frame_res)
+		return frame_res, controller.step(frame_res)
+
+	def infer(packet):
+		# Single inference per frame; classifier, draw and HUD all share it
+		return handle(packet, scheduler.process(packet.frame))
+
+	def status():
+		return {
+			**latest["hud"],
+			"fps": latest["fps"],
+			"preview": preview,
+			"stages_ms": PROFILER.snapshot(),
+			"roi": tracker.roi.stats() if tracker is not None and tracker.roi is not None else None,
+			"scheduler": scheduler.stats() if scheduler is not None else None,
+			"pool": {"workers": pool.workers, "dropped": pool.dropped, "errors": pool.errors, "in_flight": pool.in_flight()} if pool is not None else None,
+			"tasks": live.stats() if live is not None else None,
+			"bindings": {"path": controller.bindings.path, "entries": len(controller.bindings), "error": controller.bindings.error},
+			"classifier": controller.backend.name,
+			"actions": {"backend": args.actions, "dropped": dispatcher.dropped, "per_action": dispatcher.action_stats()},
+			"filter_predicted": controller.filter.predicted if controller.filter is not None else None,
+			"tracks": {"live": len(controller.tracks.tracks), "created": controller.tracks.created, "relabeled": controller.tracks.relabeled},
+			"capture": cap.info(),
+			"frames": {"slots": ring.slots, "free": ring.free(), "misses": ring.misses},
+			"startup": startup.as_dict(),
+		}
+
+	control = ControlServer(status, port=args.control_port).start() if args.control_port else None
+	next_status = 0.0
+
+	if pool is not None:
+		inference = PoolStage(pool, handle, results, PROFILER, stop)
+		capture = CaptureThread(cap, inference, PROFILER, stop, ring)
+	elif live is not None:
+		inference = LiveStreamStage(live, handle, results, PROFILER, stop)
+		capture = CaptureThread(cap, inference, PROFILER, stop, ring)
+	else:
+		capture = CaptureThread(cap, frames, PROFILER, stop, ring)
+		inference = InferenceThread(infer, frames, results, PROFILER, stop)
+	capture.start()
+	inference.start()
+
+	try:
+		while not stop.is_set():
+			command = control.poll() if control is not None else None
+			while command is not None:
+				cmd, arg = command
+				if cmd == "quit":
+					stop.set()
+				elif cmd == "mode":
+					controller.request_mode(arg)
+				elif cmd == "reload":
+					controller.request_reload()
+				elif cmd == "preview":
+					preview = (not preview) if arg in ("", "toggle") else arg == "on"
+					if not preview:
+						cv2.destroyAllWindows()
+				command = control.poll()
+
+			packet = results.get(timeout=0.1)
+			if packet is None:
+				continue
+			t0 = time.perf_counter()
+			if "first_frame" not in startup.marks:
+				startup.mark("first_frame")
+				print(startup.summary())
+			frame_res, hud = packet.payload
+			latest["hud"] = hud
+			latest["fps"] = fps = fpsm.tick()
+			if args.status_file and t0 >= next_status:
+				write_status(args.status_file, status())
+				next_status = t0 + SERVICE.status_interval_s
+
+			if not preview:
+				# Headless: no drawing, HUD or GUI calls at all
+				PROFILER.record("latency", time.perf_counter() - packet.t_capture)
+				packet.release()
+				continue
+
+			frame = packet.frame
+			# Draw hands
+			draw_hands(frame, frame_res, tracker.drawer if tracker is not None else None)
+
+			timings = format_timings(PROFILER.snapshot())
+			if tracker is not None and tracker.roi is not None:
+				timings += f" | roi {tracker.roi.stats()['hit_rate'] * 100:.0f}%"
+			if scheduler is not None and scheduler.enabled:
+				timings += f" | run {scheduler.stats()['infer_ratio'] * 100:.0f}%"
+			with PROFILER.stage("hud"):
+				hud_layer.draw(frame, fps=fps, timings=timings, **hud)
+				if show_panel:
+					draw_metrics_panel(frame, PROFILER.report())
+
+			with PROFILER.stage("display"):
+				cv2.imshow("Hastayanam", frame)
+				key = cv2.waitKey(1) & 0xFF
+			# imshow keeps its own copy, so the slot can be reused right away
+			packet.release()
+			PROFILER.record("render", time.perf_counter() - t0)
+			PROFILER.record("latency", time.perf_counter() - packet.t_capture)
+			if key == ord('q'):
+				break
+			if key == ord('m'):
+				show_panel = not show_panel
+			if key == ord('h'):
+				hud_layer.cycle_layout()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		stop.set()
+		capture.join(timeout=1.0)
+		inference.join(timeout=1.0)
+		if dumper is not None:
+			dumper.join(timeout=1.0)
+		if control is not None:
+			control.close()
+		dispatcher.close()
+		if pool is not None:
+			pool.close()
 		else:
-			action_text, action_fn, cd = "", None, 0.0
-
-		cooldown_hint = ""
-		if action_fn is not None:
-			g = f"{mode.name}:{active_gesture[0]}"
-			if cooldown.ready(g):
-				try:
-					action_fn()
-					last_executed_action = action_text
-					cooldown.trigger(g, seconds=cd)
-				except Exception:
-					last_executed_action = f"Failed: {action_text}"
-			else:
-				cooldown_hint = f"Cooling down: {g}"
-
-		fps = fpsm.tick()
-		both_g = f"R:{right_gesture[0]} L:{left_gesture[0]}"
-		draw_hud(frame, mode=mode.name.title(), gesture=both_g, action=last_executed_action, confidence=max(right_gesture[1], left_gesture[1]), fps=fps, mode_progress=progress, cooldown_hint=cooldown_hint, per_hand=per_hand_info)
-
-		cv2.imshow("Hastayanam", frame)
-		key = cv2.waitKey(1) & 0xFF
-		if key == ord('q'):
-			break
-
-	cap.release()
-	cv2.destroyAllWindows()
+			ring.close()
+		if live is not None:
+			live.close()
+		if recorder is not None:
+			recorder.close()
+		cap.release()
+		cv2.destroyAllWindows()
 
 
 if __name__ == "__main__":
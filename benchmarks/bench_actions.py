@@ -0,0 +1,78 @@
+"""Per-action dispatch latency through ActionDispatcher with an in-memory input backend.
+
+Every action in the default binding table runs against a RecordingBackend, once as is (what
+SendInput / pynput cost is dominated by: no sleeps) and once with pyautogui's default 0.1 s
+PAUSE emulated after each call. Then a burst (three quick swipes plus a hold) shows how that
+pause queues later actions behind earlier ones.
+
+Usage: python benchmarks/bench_actions.py [pause_s]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hastayanam.bindings import DEFAULT_BINDINGS, compile_bindings
+from hastayanam.dispatcher import ActionDispatcher
+from hastayanam.input_backends import RecordingBackend, set_backend
+from hastayanam.modes import Mode
+
+
+class PausingBackend(RecordingBackend):
+	"""RecordingBackend that sleeps after every call, as pyautogui does with PAUSE."""
+
+	name = "recording+pause"
+
+	def __init__(self, pause_s: float):
+		super().__init__()
+		self.pause_s = pause_s
+
+	def _record(self, op: str, *args):
+		super()._record(op, *args)
+		time.sleep(self.pause_s)
+
+
+def drain(dispatcher: ActionDispatcher, expected: int, timeout: float = 10.0):
+	done, deadline = [], time.perf_counter() + timeout
+	while len(done) < expected and time.perf_counter() < deadline:
+		done.extend(dispatcher.poll())
+		time.sleep(0.001)
+	return done
+
+
+def main():
+	pause = float(sys.argv[1]) if len(sys.argv) > 1 else 0.1
+	table = compile_bindings(DEFAULT_BINDINGS)
+	# One run per label (Volume Up etc. are bound in more than one mode)
+	bindings = {binding.label: binding for binding in table.values()}
+	print(f"{len(bindings)} actions; latency = submit to completion, one at a time")
+	results = {}
+	for backend in (RecordingBackend(), PausingBackend(pause)):
+		set_backend(backend)
+		dispatcher = ActionDispatcher()
+		try:
+			for label, binding in bindings.items():
+				dispatcher.submit(label, binding.fn)
+				drain(dispatcher, 1)
+			results[backend.name] = dispatcher.action_stats()
+
+			burst = [table[(Mode.BROWSER, "swipe_right", False)], table[(Mode.BROWSER, "swipe_left", False)],
+				table[(Mode.BROWSER, "swipe_right", False)], table[(Mode.BROWSER, "open_palm", True)]]
+			for i, binding in enumerate(burst):
+				dispatcher.submit(f"burst {i}", binding.fn)
+			outcomes = drain(dispatcher, len(burst))
+			worst = max(o.latency_s for o in outcomes) * 1000 if outcomes else float("nan")
+			print(f"{backend.name:>16}: burst of {len(burst)} -> last one done after {worst:6.1f} ms ({len(backend.events)} backend calls total)")
+		finally:
+			dispatcher.close()
+	set_backend(None)
+
+	names = list(results)
+	print(f"\n{'action':>28} | " + " | ".join(f"{n + ' p50 ms':>22}" for n in names))
+	for label in bindings:
+		print(f"{label:>28} | " + " | ".join(f"{results[n][label]['latency_p50_ms']:22.2f}" for n in names))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,74 @@
+"""Age of the frame a slow reader gets, with and without newest-frame reads.
+
+A synthetic 30 FPS camera whose driver queues 4 frames (and ignores requests for fewer) is read
+by a loop that spends 10, 50 or 100 ms on each frame, like a single-threaded capture+inference
+loop. Plain reads return the oldest queued frame, so a slow reader sees frames that waited in
+the queue; newest-frame reads grab past them first, and then wait for the next exposure, which
+the read time shows. Reports frame age (read time minus exposure) p50/p95, frames skipped in
+the queue and by the reader, and the median time of one read.
+
+With a camera index, it also prints what open_capture negotiated with that camera and the
+frame interval it delivers.
+
+Usage: python benchmarks/bench_capture.py [camera_index]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hastayanam.capture import open_capture
+
+FRAMES = 60
+
+
+def run(latest_frame: str, work_s: float):
+	cap = open_capture("synthetic", 1280, 720, latest_frame=latest_frame)
+	image = np.empty((720, 1280, 3), dtype=np.uint8)
+	ages, reads = [], []
+	for _ in range(FRAMES):
+		t0 = time.perf_counter()
+		cap.read(image)
+		t1 = time.perf_counter()
+		ages.append(t1 - cap.frame_time)
+		reads.append(t1 - t0)
+		time.sleep(work_s)
+	info = cap.info()
+	cap.release()
+	return np.array(ages[FRAMES // 4:]) * 1e3, info, np.median(reads) * 1e3
+
+
+def camera(index: str):
+	cap = open_capture(index)
+	print(f"camera: {cap.describe()}")
+	stamps = []
+	for _ in range(FRAMES):
+		ok, _ = cap.read()
+		if not ok:
+			break
+		stamps.append(cap.frame_time)
+	cap.release()
+	if len(stamps) > 1:
+		gaps = np.diff(stamps) * 1e3
+		print(f"  frame interval p50 {np.median(gaps):.1f} ms, p95 {np.percentile(gaps, 95):.1f} ms over {len(stamps)} frames")
+
+
+def main():
+	print(f"synthetic 30 FPS camera, 4-frame driver queue, {FRAMES} reads per run:")
+	for work_s in (0.010, 0.050, 0.100):
+		for latest_frame in ("off", "on"):
+			ages, info, read_ms = run(latest_frame, work_s)
+			name = "newest" if latest_frame == "on" else "plain"
+			print(
+				f"  {work_s * 1e3:3.0f} ms/frame, {name:>6} reads: age p50 {np.median(ages):5.1f} ms, p95 {np.percentile(ages, 95):5.1f} ms;"
+				f" skipped {info['dropped_in_queue']:3d} in queue, {info['drained']:3d} by reader; read {read_ms:5.1f} ms"
+			)
+	if len(sys.argv) > 1:
+		camera(sys.argv[1])
+
+
+if __name__ == "__main__":
+	main()
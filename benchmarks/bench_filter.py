@@ -0,0 +1,107 @@
+"""Frames-to-stable and label flapping with and without the One Euro landmark filter.
+
+Synthetic hands alternate between poses whose finger extensions sit close to the rule margin,
+with Gaussian landmark jitter, at a fixed frame rate. For each pose segment it reports how many
+frames the classifier needed to emit the pose and how often it then dropped out of it.
+
+Usage: python benchmarks/bench_filter.py [jitter] [fps]
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hastayanam.config import THRESHOLDS
+from hastayanam.filtering import OneEuroFilter
+from hastayanam.gestures import EXTENDED_MARGIN, GestureClassifier, classify_static
+from hastayanam.utils import set_clock
+
+# Finger directions (radians from straight up) for thumb, index, middle, ring, pinky
+_ANGLES = np.radians([-55.0, -18.0, 0.0, 16.0, 32.0])
+_SEGMENTS = {
+	"fist": (False, False, False, False, False),
+	"open_palm": (True, True, True, True, True),
+	"two_fingers": (False, True, True, False, False),
+	"point_up": (False, True, False, False, False),
+}
+
+
+def make_hand(extended, margin: float, wrist=(0.5, 0.7)) -> np.ndarray:
+	"""(21, 3) landmarks; extended fingers' tips are margin beyond the rule's threshold."""
+	pts = np.zeros((21, 3), dtype=np.float32)
+	pts[0, :2] = wrist
+	for f, (ext, ang) in enumerate(zip(extended, _ANGLES)):
+		d = np.array([np.sin(ang), -np.cos(ang)])
+		base = 1 + 4 * f
+		radii = (0.07, 0.12, 0.14) if f else (0.03, 0.06, 0.08)
+		for j, r in enumerate(radii):
+			pts[base + j, :2] = pts[0, :2] + d * r
+		# The rules compare the tip with the PIP (IP for the thumb): put it just past the margin,
+		# or curled back inside that joint
+		ref_r = radii[2] if f == 0 else radii[1]
+		tip_r = ref_r + EXTENDED_MARGIN + margin if ext else ref_r - margin - 0.02
+		pts[base + 3, :2] = pts[0, :2] + d * tip_r
+	return pts
+
+
+def run(frames, t, classifier_filter):
+	clf = GestureClassifier()
+	clock = [0.0]
+	set_clock(lambda: clock[0])
+	out = []
+	try:
+		for k in range(len(frames)):
+			clock[0] = t[k]
+			pts = classifier_filter(frames[k], t[k]) if classifier_filter else frames[k]
+			out.append(clf.infer(pts, (1280, 720)).name)
+	finally:
+		set_clock(None)
+	return out
+
+
+def score(names, truth, seg_len):
+	delays, flaps = [], 0
+	for s in range(0, len(truth), seg_len):
+		seg, want = names[s:s + seg_len], truth[s]
+		hits = [i for i, n in enumerate(seg) if n == want]
+		if not hits:
+			delays.append(seg_len)
+			continue
+		delays.append(hits[0])
+		flaps += sum(1 for a, b in zip(seg[hits[0]:], seg[hits[0] + 1:]) if a == want and b != want)
+	return float(np.mean(delays)), flaps
+
+
+def main():
+	jitter = float(sys.argv[1]) if len(sys.argv) > 1 else 0.004
+	fps = float(sys.argv[2]) if len(sys.argv) > 2 else 30.0
+	rng = np.random.default_rng(0)
+	seg_len = int(fps * 1.5)
+	order = list(_SEGMENTS) * 10
+	truth, frames = [], []
+	for name in order:
+		clean = make_hand(_SEGMENTS[name], margin=0.008)
+		assert classify_static(clean)[0] == name, name
+		frames.extend(clean + rng.normal(0.0, jitter, size=(seg_len, 21, 3)).astype(np.float32))
+		truth.extend([name] * seg_len)
+	t = np.arange(len(frames)) / fps
+	print(f"{len(order)} pose segments, {seg_len} frames each at {fps:.0f} fps, jitter sigma {jitter}, stability_frames {THRESHOLDS.stability_frames}")
+
+	raw = run(frames, t, None)
+	filt = OneEuroFilter()
+	smooth = run(frames, t, filt)
+	for label, names in (("raw landmarks", raw), ("one euro", smooth)):
+		delay, flaps = score(names, truth, seg_len)
+		print(f"{label:14s}: {delay:5.1f} frames to stable ({delay / fps * 1000:5.0f} ms), {flaps} drop-outs after stable")
+
+	pts = frames[0]
+	f = OneEuroFilter()
+	per = min(timeit.repeat(lambda: f(pts, 0.0), number=2000, repeat=3)) / 2000
+	print(f"filter cost: {per * 1e6:.1f} us/hand")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,87 @@
+"""Per-frame allocations: cap.read() + cvtColor + HUD darken as they were, vs the frame ring path.
+
+Decodes a generated MJPG clip, so no camera is needed. tracemalloc sees NumPy/OpenCV buffers,
+so the peak above the steady-state baseline is what one frame allocates transiently.
+
+Usage: python benchmarks/bench_frames.py [frames]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hastayanam.frames import FrameRing, read_into
+from hastayanam.overlay import _darken
+
+W, H = 1280, 720
+BOX = (0, 0, 561, 239)
+
+
+def make_clip(path: str, n: int):
+	writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (W, H))
+	rng = np.random.default_rng(0)
+	base = rng.integers(0, 255, size=(H, W, 3), dtype=np.uint8)
+	for i in range(n):
+		writer.write(np.roll(base, i * 8, axis=1))
+	writer.release()
+
+
+# Reference: every stage allocating its own output, as before the ring
+def reference_frame(cap, state):
+	ok, frame = cap.read()
+	rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+	x0, y0, x1, y1 = BOX
+	roi = frame[y0:y1, x0:x1]
+	roi[:] = cv2.convertScaleAbs(roi, alpha=0.65)
+	return ok and rgb is not None
+
+
+def ring_frame(cap, state):
+	ring, rgb = state
+	ok, frame, lease = read_into(cap, ring)
+	cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+	_darken(frame, *BOX)
+	if lease is not None:
+		lease.release()
+	return ok
+
+
+def measure(path: str, n: int, step, state):
+	cap = cv2.VideoCapture(path)
+	step(cap, state)  # Warm-up: first-call allocations inside OpenCV don't count
+	peaks = []
+	t0 = time.perf_counter()
+	for _ in range(n - 1):
+		base, _ = tracemalloc.get_traced_memory()
+		tracemalloc.reset_peak()
+		step(cap, state)
+		peaks.append(tracemalloc.get_traced_memory()[1] - base)
+	elapsed = time.perf_counter() - t0
+	cap.release()
+	return float(np.median(peaks)), elapsed / (n - 1)
+
+
+def main():
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+	frame_bytes = W * H * 3
+	with tempfile.TemporaryDirectory() as tmp:
+		path = os.path.join(tmp, "clip.avi")
+		make_clip(path, n)
+		ring = FrameRing((H, W, 3), slots=2)
+		tracemalloc.start()
+		ref_bytes, ref_s = measure(path, n, reference_frame, None)
+		new_bytes, new_s = measure(path, n, ring_frame, (ring, np.empty((H, W, 3), dtype=np.uint8)))
+		tracemalloc.stop()
+	print(f"reference : {ref_bytes / 1e6:6.2f} MB/frame ({ref_bytes / frame_bytes:.2f} frame buffers)  {ref_s * 1e3:6.2f} ms/frame")
+	print(f"frame ring: {new_bytes / 1e6:6.2f} MB/frame ({new_bytes / frame_bytes:.2f} frame buffers)  {new_s * 1e3:6.2f} ms/frame")
+	print(f"ring fallbacks: {ring.misses}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,80 @@
+"""Vectorized gesture features vs the original per-finger rule path.
+
+Usage: python benchmarks/bench_gestures.py [num_hands]
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hastayanam.config import THRESHOLDS
+from hastayanam.gestures import (
+	WRIST, THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP,
+	INDEX_PIP, MIDDLE_PIP, RING_PIP, PINKY_PIP, THUMB_IP,
+	classify_static, classify_batch,
+)
+from hastayanam.utils import distance
+
+
+# Reference: the rule chain as it was before vectorization, one finger at a time
+def _is_finger_extended(tip, pip, wrist) -> bool:
+	return distance(tip, wrist) - distance(pip, wrist) > 0.02
+
+
+def reference_classify(pts):
+	w = pts[WRIST]
+	thumb_ext = _is_finger_extended(pts[THUMB_TIP], pts[THUMB_IP], w)
+	index_ext = _is_finger_extended(pts[INDEX_TIP], pts[INDEX_PIP], w)
+	middle_ext = _is_finger_extended(pts[MIDDLE_TIP], pts[MIDDLE_PIP], w)
+	ring_ext = _is_finger_extended(pts[RING_TIP], pts[RING_PIP], w)
+	pinky_ext = _is_finger_extended(pts[PINKY_TIP], pts[PINKY_PIP], w)
+	if distance(pts[THUMB_TIP], pts[INDEX_TIP]) <= THRESHOLDS.pinch_distance_threshold:
+		return "pinch", 0.95
+	extended = sum([thumb_ext, index_ext, middle_ext, ring_ext, pinky_ext])
+	if extended == 0:
+		return "fist", 0.95
+	if extended == 5:
+		return "open_palm", 0.95
+	if index_ext and middle_ext and not ring_ext and not pinky_ext and not thumb_ext:
+		return "two_fingers", 0.9
+	if thumb_ext and not index_ext and not middle_ext and not ring_ext and not pinky_ext:
+		return ("thumbs_up", 0.9) if pts[THUMB_TIP][1] < w[1] else ("thumbs_down", 0.9)
+	if index_ext and not middle_ext and not ring_ext and not pinky_ext:
+		return ("point_up", 0.85) if pts[INDEX_TIP][1] < w[1] else ("point_down", 0.85)
+	return "unknown", 0.3
+
+
+def random_hands(n: int, seed: int = 0) -> np.ndarray:
+	# Wrist-centred jitter wide enough to hit every rule branch
+	rng = np.random.default_rng(seed)
+	center = rng.uniform(0.3, 0.7, size=(n, 1, 3)).astype(np.float32)
+	center[..., 2] = 0.0
+	return (center + rng.normal(0.0, 0.08, size=(n, 21, 3))).astype(np.float32)
+
+
+def main():
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+	hands = random_hands(n)
+
+	ref = [reference_classify(p) for p in hands]
+	vec = classify_batch(hands)
+	mismatches = sum(1 for a, b in zip(ref, vec) if a != b)
+	labels = sorted({name for name, _ in ref})
+	print(f"hands={n} mismatches={mismatches} labels={labels}")
+
+	reps = 3
+	t_ref = min(timeit.repeat(lambda: [reference_classify(p) for p in hands], number=1, repeat=reps)) / n
+	t_single = min(timeit.repeat(lambda: [classify_static(p) for p in hands], number=1, repeat=reps)) / n
+	t_pair = min(timeit.repeat(lambda: [classify_batch(hands[i:i + 2]) for i in range(0, n, 2)], number=1, repeat=reps)) / n
+	t_batch = min(timeit.repeat(lambda: classify_batch(hands), number=1, repeat=reps)) / n
+	print(f"per-finger reference : {t_ref * 1e6:8.2f} us/hand")
+	print(f"vectorized, 1 hand   : {t_single * 1e6:8.2f} us/hand")
+	print(f"vectorized, 2 hands  : {t_pair * 1e6:8.2f} us/hand")
+	print(f"vectorized, batch {n}: {t_batch * 1e6:8.2f} us/hand")
+
+
+if __name__ == "__main__":
+	main()
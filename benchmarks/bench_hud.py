@@ -0,0 +1,79 @@
+"""Cached HUD compositor vs the original full-frame copy + addWeighted + putText HUD.
+
+Usage: python benchmarks/bench_hud.py [frames]
+"""
+import os
+import sys
+import timeit
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hastayanam.config import OVERLAY, THRESHOLDS
+from hastayanam.overlay import HudCompositor
+
+
+# Reference: the HUD as it was before the compositor
+def reference_hud(frame, *, mode, gesture, action, confidence, fps, mode_progress=0.0, cooldown_hint="", per_hand=None, timings=""):
+	pad, row, alpha = OVERLAY.padding, OVERLAY.row_gap, OVERLAY.bg_alpha
+	rows = 6 + (1 if timings else 0) + (len(per_hand) if per_hand else 0)
+	box_h = pad * 2 + row * rows
+	overlay = frame.copy()
+	cv2.rectangle(overlay, (0, 0), (560, box_h), (0, 0, 0), -1)
+	cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
+	org_y = pad + 20
+	font = cv2.FONT_HERSHEY_SIMPLEX
+	texts = [
+		(f"Mode: {mode}", (0, 255, 255)),
+		(f"Gesture: {gesture}", (255, 255, 255)),
+		(f"Action: {action}", (0, 255, 0)),
+		(f"Conf: {confidence:.2f} (min {THRESHOLDS.confidence_min:.2f})", (200, 200, 200)),
+		(f"FPS: {fps:.1f}", (200, 200, 200)),
+		(cooldown_hint, (0, 165, 255)),
+		(timings, (200, 200, 200)),
+	]
+	for i, item in enumerate(per_hand or []):
+		texts.append((f"{item['label']}: {item['gesture']} ({item['conf']:.2f})", (180, 220, 255)))
+	for i, (text, color) in enumerate(texts):
+		if text:
+			cv2.putText(frame, text, (pad, org_y + row * i), font, OVERLAY.font_scale, color, OVERLAY.thickness, cv2.LINE_AA)
+	if mode_progress > 0.0:
+		cv2.rectangle(frame, (pad, box_h + 6), (pad + 240, box_h + 16), (80, 80, 80), 1)
+		cv2.rectangle(frame, (pad, box_h + 6), (pad + int(240 * min(1.0, mode_progress)), box_h + 16), (0, 255, 255), -1)
+
+
+def main():
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+	rng = np.random.default_rng(0)
+	base = rng.integers(0, 255, size=(720, 1280, 3), dtype=np.uint8)
+	frame = base.copy()
+	hud = dict(
+		mode="System", gesture="R:open_palm L:unknown", action="Show Desktop", confidence=0.95,
+		mode_progress=0.4, per_hand=[{"label": "Right", "gesture": "open_palm", "conf": 0.95}],
+		timings="cap 1.2 | inf 14.0 | ui 2.1 | lat 25.0 ms",
+	)
+	comp = HudCompositor(layout="full")
+
+	ref_frame, new_frame = base.copy(), base.copy()
+	reference_hud(ref_frame, fps=30.0, **hud)
+	comp.draw(new_frame, fps=30.0, **hud)
+	diff = np.abs(ref_frame.astype(np.int16) - new_frame.astype(np.int16))
+	print(f"pixels differing by >2: {(diff.max(axis=2) > 2).sum()} (max diff {diff.max()})")
+
+	def run(draw):
+		for i in range(n):
+			draw(frame, fps=25.0 + (i % 50) * 0.1, **hud)
+
+	t_ref = min(timeit.repeat(lambda: run(reference_hud), number=1, repeat=3)) / n
+	t_new = min(timeit.repeat(lambda: run(comp.draw), number=1, repeat=3)) / n
+	comp.layout = "off"
+	t_off = min(timeit.repeat(lambda: run(comp.draw), number=1, repeat=3)) / n
+	print(f"reference HUD : {t_ref * 1e3:7.3f} ms/frame")
+	print(f"compositor    : {t_new * 1e3:7.3f} ms/frame ({t_new / t_ref * 100:.0f}%)")
+	print(f"layout off    : {t_off * 1e3:7.3f} ms/frame")
+
+
+if __name__ == "__main__":
+	main()
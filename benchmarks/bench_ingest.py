@@ -0,0 +1,71 @@
+"""Offline ingestion throughput vs worker count, and the cost of decoding into a reused buffer.
+
+Copies of one clip are ingested with 1, 2, 4, ... workers up to the core count (or the counts
+given), each run from scratch into a temporary directory. For each run it reports frames per
+second and how many times faster than real time the footage went through. It also times
+decoding alone: cap.read() into a new array per frame vs into one preallocated buffer, as the
+ingest workers do.
+
+Needs mediapipe with the legacy Hands API.
+
+Usage: python benchmarks/bench_ingest.py clip.mp4 [copies] [workers ...]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hastayanam.ingest import ingest
+
+
+def decode_cost(path: str, frames: int = 300):
+	out = {}
+	for name in ("new array", "reused buffer"):
+		cap = cv2.VideoCapture(path)
+		buf = None
+		n = 0
+		t0 = time.perf_counter()
+		while n < frames:
+			ok, image = cap.read(buf) if name == "reused buffer" else cap.read()
+			if not ok:
+				break
+			buf = image
+			n += 1
+		out[name] = (time.perf_counter() - t0) / max(n, 1) * 1e3
+		cap.release()
+	return out
+
+
+def main():
+	clip = sys.argv[1]
+	copies = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+	cores = os.cpu_count() or 1
+	counts = [int(a) for a in sys.argv[3:]] or sorted({min(2 ** i, cores) for i in range(cores.bit_length() + 1)})
+	for name, ms in decode_cost(clip).items():
+		print(f"decode into {name:>13}: {ms:.2f} ms/frame")
+	tmp = tempfile.mkdtemp(prefix="bench_ingest_")
+	try:
+		videos = os.path.join(tmp, "videos")
+		os.makedirs(videos)
+		ext = os.path.splitext(clip)[1]
+		for i in range(copies):
+			shutil.copy(clip, os.path.join(videos, f"clip{i}{ext}"))
+		for workers in counts:
+			out = os.path.join(tmp, f"out{workers}")
+			t0 = time.perf_counter()
+			results, _ = ingest([videos], out, workers, interval_s=1e9)
+			wall = time.perf_counter() - t0
+			frames = sum(res.frames for res in results)
+			video_s = sum(res.video_s for res in results)
+			print(f"{workers:>2} workers: {frames / wall:7.1f} frames/s, {video_s / wall:5.1f}x real time (including worker start-up)")
+	finally:
+		shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+	main()
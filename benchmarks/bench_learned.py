@@ -0,0 +1,83 @@
+"""Rules vs the trained MLP backend on synthetic hands: accuracy, calibration and batched speed.
+
+Hands are built pose by pose (see bench_filter.make_hand), then rotated, scaled, moved and
+jittered. Scale matters: the rules use fixed normalized-distance margins, so small (distant)
+hands are where they struggle.
+
+Usage: python benchmarks/bench_learned.py [train_hands]
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_filter import make_hand
+from hastayanam.gestures import INDEX_TIP, THUMB_TIP, RULES
+from hastayanam.learned import MlpBackend, expected_calibration_error, train
+
+# (label, extended fingers, upside down)
+POSES = [
+	("fist", (False, False, False, False, False), False),
+	("open_palm", (True, True, True, True, True), False),
+	("two_fingers", (False, True, True, False, False), False),
+	("thumbs_up", (True, False, False, False, False), False),
+	("thumbs_down", (True, False, False, False, False), True),
+	("point_up", (False, True, False, False, False), False),
+	("point_down", (False, True, False, False, False), True),
+	("pinch", (True, True, True, True, True), False),
+	("unknown", (False, False, False, True, True), False),
+	("unknown", (True, True, False, False, True), False),
+	("unknown", (False, False, True, True, True), False),
+]
+
+
+def synth(n: int, seed: int):
+	rng = np.random.default_rng(seed)
+	pts = np.empty((n, 21, 3), dtype=np.float32)
+	labels, scales = [], np.empty(n)
+	for i in range(n):
+		label, ext, down = POSES[rng.integers(len(POSES))]
+		hand = make_hand(ext, margin=rng.uniform(0.0, 0.03), wrist=(0.0, 0.0))
+		if label == "pinch":
+			hand[THUMB_TIP] = hand[INDEX_TIP] + rng.normal(0.0, 0.006, size=3)
+		angle = np.radians(rng.uniform(-25.0, 25.0) + (180.0 if down else 0.0))
+		rot = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+		scale = rng.uniform(0.45, 1.3)
+		hand[:, :2] = hand[:, :2] @ rot.T * scale + rng.uniform(0.3, 0.7, size=2)
+		hand += rng.normal(0.0, 0.006 * scale, size=hand.shape)
+		pts[i], scales[i] = hand, scale
+		labels.append(label)
+	return pts, np.array(labels), scales
+
+
+def main():
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+	train_pts, train_labels, _ = synth(n, seed=0)
+	model, report = train(train_pts, train_labels.tolist(), epochs=60)
+	print(f"trained on {n} hands: val accuracy {report['val_accuracy']:.3f}, ECE {report['val_ece']:.3f}, temperature {report['temperature']:.2f}")
+
+	pts, truth, scales = synth(3000, seed=1)
+	mlp = MlpBackend(model)
+	for name, backend in (("rules", RULES), ("mlp", mlp)):
+		out = backend.classify(pts)
+		pred = np.array([p for p, _ in out])
+		conf = np.array([c for _, c in out])
+		ok = pred == truth
+		small = scales < 0.75
+		print(
+			f"{name:>5}: accuracy {ok.mean():.3f} (small hands {ok[small].mean():.3f}, others {ok[~small].mean():.3f}),"
+			f" ECE {expected_calibration_error(conf, ok):.3f}"
+		)
+
+	pair = pts[:2]
+	for name, backend in (("rules", RULES), ("mlp", mlp)):
+		per = min(timeit.repeat(lambda: backend.classify(pair), number=5000, repeat=3)) / 5000
+		print(f"{name:>5}: {per * 1e6:6.1f} us per 2-hand batch")
+
+
+if __name__ == "__main__":
+	main()
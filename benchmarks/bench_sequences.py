@@ -0,0 +1,183 @@
+"""Sequence matching cost and mode-switch timing.
+
+1. Per-frame cost for 1 / 10 / 50 / 100 declared sequences: SequenceEngine (touches only the
+   partial matches a label change or due timer concerns) vs a matcher that re-checks every
+   sequence every frame. Both run over the same 60 s of two-hand labels at 30 FPS.
+2. mode_cycle vs the old ModeManager pinch logic: a pinch held for 8 s (switch at 3 s, then every
+   3 s after the 1.2 s cooldown), and a short pinch followed by another 4.5 s later, which the old
+   logic counted as one 3 s hold because it never reset its timer on release.
+3. Re-entering a sequence's first gesture: fist, point_up, fist again (held), open_palm. The
+   second fist starts fist_release over, so the release fires; it used to be blocked by the
+   first fist's stale 0.5 s deadline.
+
+Usage: python benchmarks/bench_sequences.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hastayanam.config import THRESHOLDS
+from hastayanam.sequences import DEFAULT_SEQUENCES, HANDS, NO_HAND, SequenceEngine, compile_sequences
+
+FPS = 30.0
+GESTURES = ["fist", "open_palm", "pinch", "two_fingers", "thumbs_up", "thumbs_down", "point_up", "point_down"]
+
+
+def random_sequences(n: int, rng):
+	entries = []
+	for i in range(n):
+		steps = []
+		for j in range(rng.randint(1, 3)):
+			step = {"gesture": rng.choice(GESTURES), "hand": rng.choice(["any", "any", "Right", "Left"])}
+			if rng.random() < 0.3:
+				step["hold"] = round(rng.uniform(0.2, 1.5), 2)
+			if j and rng.random() < 0.7:
+				step["within"] = round(rng.uniform(0.3, 1.0), 2)
+			steps.append(step)
+		entries.append({"name": f"seq{i}", "steps": steps, "cooldown": 0.5})
+	return compile_sequences(entries)
+
+
+def label_stream(seconds: float, rng):
+	"""Per-frame {hand: label}: each hand changes gesture every 0.2-1.2 s, sometimes leaving."""
+	frames = []
+	labels = {hand: NO_HAND for hand in HANDS}
+	change_at = {hand: 0.0 for hand in HANDS}
+	for i in range(int(seconds * FPS)):
+		t = i / FPS
+		for hand in HANDS:
+			if t >= change_at[hand]:
+				labels[hand] = NO_HAND if rng.random() < 0.1 else rng.choice(GESTURES)
+				change_at[hand] = t + rng.uniform(0.2, 1.2)
+		frames.append((t, dict(labels)))
+	return frames
+
+
+class ScanAllMatcher:
+	"""One partial match per sequence, re-evaluated against the labels on every frame. Like the
+	engine, a match only starts when a hand enters the first step's gesture."""
+
+	def __init__(self, sequences):
+		self.sequences = sequences
+		self.state = {seq.name: None for seq in sequences}  # [index, hand, since, done, left_at, onset]
+		self.cooldown = {seq.name: 0.0 for seq in sequences}
+		self.prev = {hand: NO_HAND for hand in HANDS}
+
+	def update(self, labels, t):
+		matches = []
+		entered = {hand for hand in HANDS if labels[hand] != self.prev[hand]}
+		self.prev = dict(labels)
+		for seq in self.sequences:
+			st = self.state[seq.name]
+			if st is None:
+				if t < self.cooldown[seq.name]:
+					continue
+				first = seq.steps[0]
+				for hand in HANDS:
+					if hand in entered and labels[hand] == first.gesture and first.hand in ("any", hand):
+						st = self.state[seq.name] = [0, hand, t, False, None, t]
+						break
+				if st is None:
+					continue
+			index, hand, since, done, left_at, onset = st
+			step = seq.steps[index]
+			if not done:
+				if labels[hand] != step.gesture:
+					self.state[seq.name] = None
+					continue
+				if t - since < step.hold_s:
+					continue
+				if index == len(seq.steps) - 1:
+					matches.append(seq.name)
+					self.state[seq.name] = None
+					self.cooldown[seq.name] = t + seq.cooldown_s
+					continue
+				st[3] = done = True
+			nxt = seq.steps[index + 1]
+			if left_at is None and labels[hand] != step.gesture:
+				st[4] = left_at = t
+			if left_at is not None and nxt.within_s and t - left_at > nxt.within_s:
+				self.state[seq.name] = None
+			elif labels[hand] == nxt.gesture and nxt.hand in ("any", hand):
+				self.state[seq.name] = [index + 1, hand, t, False, None, onset]
+		return matches
+
+
+def bench_cost():
+	rng = random.Random(7)
+	frames = label_stream(60.0, rng)
+	print(f"per-frame cost over {len(frames)} frames (two hands, label changes every 0.2-1.2 s):")
+	for n in (1, 10, 50, 100):
+		sequences = random_sequences(n, random.Random(n))
+		results = {}
+		for name, matcher in (("engine", SequenceEngine(sequences)), ("scan-all", ScanAllMatcher(sequences))):
+			fired = 0
+			t0 = time.perf_counter()
+			for t, labels in frames:
+				fired += len(matcher.update(labels, t))
+			results[name] = ((time.perf_counter() - t0) / len(frames) * 1e6, fired)
+		(eng_us, eng_n), (scan_us, scan_n) = results["engine"], results["scan-all"]
+		print(f"  {n:>3} sequences: engine {eng_us:6.2f} us ({eng_n} matches), scan-all {scan_us:7.2f} us ({scan_n} matches), {scan_us / eng_us:4.1f}x")
+
+
+class OldModeSwitch:
+	"""ModeManager.maybe_cycle_on_gesture as it was, on an explicit clock."""
+
+	def __init__(self):
+		self._switch_start = None
+		self._cooldown_until = 0.0
+
+	def update(self, gesture, now):
+		# The controller only called this while a hand showed pinch
+		if gesture != "pinch" or now < self._cooldown_until:
+			return False
+		if self._switch_start is None:
+			self._switch_start = now
+		elif now - self._switch_start >= THRESHOLDS.mode_switch_hold_s:
+			self._cooldown_until = now + 1.2
+			self._switch_start = None
+			return True
+		return False
+
+
+def mode_switch(name, pinched, seconds):
+	engine = SequenceEngine(compile_sequences([s for s in DEFAULT_SEQUENCES if s["name"] == "mode_cycle"]))
+	old = OldModeSwitch()
+	new_at, old_at = [], []
+	for i in range(int(seconds * FPS) + 1):
+		t = i / FPS
+		gesture = "pinch" if pinched(t) else "open_palm"
+		if engine.update({"Right": gesture, "Left": NO_HAND}, t):
+			new_at.append(t)
+		if old.update(gesture, t):
+			old_at.append(t)
+	fmt = lambda ts: ", ".join(f"{t:.2f} s" for t in ts) or "never"
+	print(f"  {name}: engine switches at {fmt(new_at)}; old logic at {fmt(old_at)}")
+
+
+def reentry():
+	engine = SequenceEngine(compile_sequences([s for s in DEFAULT_SEQUENCES if s["name"] == "fist_release"]))
+	changes = [(0.0, "fist"), (1.0, "point_up"), (1.3, "fist"), (3.0, "open_palm")]
+	fired = []
+	for i in range(int(3.5 * FPS) + 1):
+		t = i / FPS
+		gesture = [g for at, g in changes if at <= t + 1e-9][-1]
+		fired += [(m.name, t) for m in engine.update({"Right": gesture, "Left": NO_HAND}, t)]
+	text = ", ".join(f"{name} at {t:.2f} s" for name, t in fired) or "nothing"
+	print(f"  fist 0-1 s, point_up 1-1.3 s, fist 1.3-3 s, open_palm: {text} (expected fist_release at 3.00 s)")
+
+
+def main():
+	bench_cost()
+	print("mode_cycle vs the old pinch logic:")
+	mode_switch("pinch held 0-8 s", lambda t: t < 8.0, 9.0)
+	mode_switch("pinch 0-0.3 s, again 4.8-5.5 s", lambda t: t < 0.3 or 4.8 <= t < 5.5, 6.0)
+	print("re-entering a first step:")
+	reentry()
+
+
+if __name__ == "__main__":
+	main()
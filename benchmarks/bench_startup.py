@@ -0,0 +1,51 @@
+"""Import cost of the package's entry points, each in a fresh interpreter.
+
+Reports wall time for the import and which heavy dependencies ended up loaded. Offline tools
+(replay, tuning, dataset, learned) should load none of them; hastayanam.tracking only binds them.
+For reference, also times importing each heavy dependency on its own.
+
+Usage: python benchmarks/bench_startup.py [repeats]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("cv2", "mediapipe", "pyautogui")
+MODULES = (
+	"hastayanam.controller", "hastayanam.replay", "hastayanam.tuning", "hastayanam.learned",
+	"hastayanam.tracking", "hastayanam.inference_pool", "app",
+)
+
+_PROBE = """
+import sys, time
+t0 = time.perf_counter()
+try:
+	__import__({name!r})
+	ok = "ok"
+except Exception as exc:
+	ok = type(exc).__name__
+dt = time.perf_counter() - t0
+print(dt, ok, ",".join(m for m in {heavy!r} if m in sys.modules) or "-")
+"""
+
+
+def probe(name: str, repeats: int):
+	best, ok, loaded = float("inf"), "", ""
+	for _ in range(repeats):
+		out = subprocess.run([sys.executable, "-c", _PROBE.format(name=name, heavy=HEAVY)], cwd=ROOT, capture_output=True, text=True, check=True)
+		dt, ok, loaded = out.stdout.split()
+		best = min(best, float(dt))
+	return best, ok, loaded
+
+
+def main():
+	repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+	print(f"best of {repeats} fresh interpreters")
+	for name in MODULES + HEAVY:
+		dt, ok, loaded = probe(name, repeats)
+		print(f"{name:>26}: {dt * 1000:7.1f} ms  {ok:<20} heavy loaded: {loaded}")
+
+
+if __name__ == "__main__":
+	main()
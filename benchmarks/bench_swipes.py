@@ -0,0 +1,97 @@
+"""Swipe detection latency and false triggers across frame rates: time-windowed velocity detector
+vs the original first-vs-last of 8 wrist samples.
+
+Each run renders wrist trajectories at the given frame rate with landmark jitter:
+- swipe: rest, then a 400 px minimum-jerk stroke over 350 ms -> latency from motion start
+- drift: steady 450 px/s movement for 1 s, slower than a swipe -> should not fire
+- still: jitter only -> should not fire
+
+New-detector swipes only count at confidence_min or above, as in GestureController.
+
+Usage: python benchmarks/bench_swipes.py [jitter_px]
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hastayanam.config import THRESHOLDS
+from hastayanam.gestures import TemporalState
+from hastayanam.utils import set_clock
+
+W, H = 1280, 720
+
+
+# Reference: the detector as it was before, over the last 8 samples whatever their timing
+def reference_swipe(history):
+	if len(history) < 2:
+		return None
+	dx = (history[-1][1][0] - history[0][1][0]) * W
+	if abs(dx) >= THRESHOLDS.swipe_min_displacement_px:
+		return "swipe_right" if dx > 0 else "swipe_left"
+	return None
+
+
+def trajectory(kind: str, fps: float, jitter_px: float, rng) -> np.ndarray:
+	t = np.arange(int(fps * 1.5)) / fps
+	x = np.full_like(t, 300.0)
+	if kind == "swipe":
+		s = np.clip((t - 0.5) / 0.35, 0.0, 1.0)
+		x += 400.0 * (10 * s ** 3 - 15 * s ** 4 + 6 * s ** 5)
+	elif kind == "drift":
+		x += 450.0 * np.clip(t - 0.25, 0.0, 1.0)
+	xy = np.stack([x, np.full_like(t, 400.0)], axis=1) + rng.normal(0.0, jitter_px, size=(len(t), 2))
+	return t, xy / (W, H)
+
+
+def first_detection(t, xy):
+	state = TemporalState()
+	clock = [0.0]
+	set_clock(lambda: clock[0])
+	history = []
+	ref = new = None
+	try:
+		for k in range(len(t)):
+			clock[0] = t[k]
+			state.update_wrist(xy[k])
+			history = (history + [(t[k], xy[k])])[-8:]
+			if ref is None and reference_swipe(history):
+				ref = t[k]
+			swipe = state.check_swipe(W, H)
+			if new is None and swipe and swipe[1] >= THRESHOLDS.confidence_min:
+				new = t[k]
+	finally:
+		set_clock(None)
+	return ref, new
+
+
+def main():
+	jitter = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+	trials = 20
+	print(f"jitter {jitter} px, {trials} trials per cell; latency is from motion start, '-' = never fired")
+	print(f"{'fps':>5} | {'swipe latency ref/new (ms)':>27} | {'swipe missed ref/new':>20} | {'drift fired ref/new':>19} | {'still fired ref/new':>19}")
+	for fps in (15.0, 30.0, 60.0, 120.0):
+		rng = np.random.default_rng(int(fps))
+		lat = {"ref": [], "new": []}
+		missed = {"ref": 0, "new": 0}
+		fired = {"drift": {"ref": 0, "new": 0}, "still": {"ref": 0, "new": 0}}
+		for _ in range(trials):
+			for name, at in zip(("ref", "new"), first_detection(*trajectory("swipe", fps, jitter, rng))):
+				if at is None:
+					missed[name] += 1
+				else:
+					lat[name].append((at - 0.5) * 1000)
+			for kind in ("drift", "still"):
+				for name, at in zip(("ref", "new"), first_detection(*trajectory(kind, fps, jitter, rng))):
+					fired[kind][name] += at is not None
+		fmt = lambda v: f"{np.mean(v):5.0f}" if v else "    -"
+		print(
+			f"{fps:5.0f} | {fmt(lat['ref']):>13} / {fmt(lat['new']):<11} | {missed['ref']:>9} / {missed['new']:<8} |"
+			f" {fired['drift']['ref']:>8} / {fired['drift']['new']:<8} | {fired['still']['ref']:>8} / {fired['still']['new']:<8}"
+		)
+
+
+if __name__ == "__main__":
+	main()
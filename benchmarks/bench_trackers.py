@@ -0,0 +1,142 @@
+"""Legacy HandTracker vs the Tasks HandLandmarker (LIVE_STREAM) on the same frames.
+
+Frames come from a video file (ideally a recording with hands in it) and are delivered at the
+clip's frame rate, as a camera would. For each backend:
+- answered: frames that produced a result (LIVE_STREAM drops frames while the model is busy)
+- throughput: answered frames per second of wall time
+- latency: frame delivery to result available, p50 / p95
+- loop block: how long the delivering thread was busy per frame (the whole inference for the
+  legacy API; RGB conversion and submit for LIVE_STREAM)
+It also times landmark conversion: the old per-hand list comprehension vs landmarks_to_array.
+
+Needs mediapipe with both APIs and the hand_landmarker.task bundle (TRACKING.tasks_model_path).
+
+Usage: python benchmarks/bench_trackers.py clip.mp4 [model.task] [max_frames]
+"""
+import os
+import sys
+import threading
+import time
+import timeit
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hastayanam.config import TRACKING
+from hastayanam.tasks_tracking import LiveStreamTracker
+from hastayanam.tracking import HandTracker
+from hastayanam.utils import landmarks_to_array
+
+
+def load_frames(path: str, limit: int):
+	cap = cv2.VideoCapture(path)
+	fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+	frames = []
+	while len(frames) < limit:
+		ok, frame = cap.read()
+		if not ok:
+			break
+		frames.append(frame)
+	cap.release()
+	return frames, fps
+
+
+def summarize(name, delivered, answered, wall_s, latencies, blocks, hands):
+	lat = np.asarray(latencies) * 1000 if latencies else np.zeros(1)
+	blk = np.asarray(blocks) * 1000
+	print(
+		f"{name:>10}: answered {answered}/{delivered}, {answered / wall_s:6.1f} fps, latency p50 {np.percentile(lat, 50):6.1f} / p95 {np.percentile(lat, 95):6.1f} ms,"
+		f" loop block p50 {np.percentile(blk, 50):6.2f} ms, {hands} hands"
+	)
+
+
+def run_legacy(frames, fps):
+	tracker = HandTracker(roi=False)
+	tracker.warmup(frames[0].shape[1], frames[0].shape[0])
+	latencies, blocks, hands, answered = [], [], 0, 0
+	start = time.perf_counter()
+	last = -1
+	while True:
+		# Latest frame wins, as in the app: frames delivered while we were busy are skipped
+		i = min(int((time.perf_counter() - start) * fps), len(frames) - 1)
+		if i == last:
+			if i == len(frames) - 1:
+				break
+			time.sleep(max(start + (i + 1) / fps - time.perf_counter(), 0.0))
+			continue
+		last = i
+		t0 = time.perf_counter()
+		res = tracker.process(frames[i])
+		t1 = time.perf_counter()
+		blocks.append(t1 - t0)
+		latencies.append(t1 - (start + i / fps))
+		hands += len(res.hands)
+		answered += 1
+	summarize("solutions", len(frames), answered, time.perf_counter() - start, latencies, blocks, hands)
+	return tracker
+
+
+def run_tasks(frames, fps, model_path):
+	tracker = LiveStreamTracker(model_path)
+	tracker.warmup(frames[0].shape[1], frames[0].shape[0])
+	due_at, latencies, blocks = {}, [], []
+	answered = [0, 0]  # frames, hands
+	done = threading.Event()
+
+	def collect():
+		while not done.is_set() or tracker.in_flight():
+			for frame_id, res, _ in tracker.results(timeout=0.05):
+				latencies.append(time.perf_counter() - due_at[frame_id])
+				answered[0] += 1
+				answered[1] += len(res.hands)
+
+	collector = threading.Thread(target=collect, daemon=True)
+	collector.start()
+	start = time.perf_counter()
+	for i, frame in enumerate(frames):
+		due = start + i / fps
+		wait = due - time.perf_counter()
+		if wait > 0:
+			time.sleep(wait)
+		due_at[i] = max(due, start)
+		t0 = time.perf_counter()
+		tracker.submit(frame, i)
+		blocks.append(time.perf_counter() - t0)
+	done.set()
+	collector.join(timeout=5.0)
+	summarize("tasks", len(frames), answered[0], time.perf_counter() - start, latencies, blocks, answered[1])
+	print(f"{'':>10}  refused {tracker.refused}, dropped by HandLandmarker {tracker.dropped}")
+	tracker.close()
+
+
+def conversion(frames, tracker: HandTracker):
+	for frame in frames:
+		res = tracker.process(frame)
+		if len(res.hands) == 2:
+			hands = [h.landmarks.landmark for h in res.hands]
+			break
+	else:
+		print("conversion: no frame with two hands in the clip")
+		return
+	old = min(timeit.repeat(lambda: [np.array([[lm.x, lm.y, lm.z] for lm in hand], dtype=np.float32) for hand in hands], number=2000, repeat=3)) / 2000
+	new = min(timeit.repeat(lambda: landmarks_to_array(hands), number=2000, repeat=3)) / 2000
+	print(f"conversion of 2 hands: per-hand lists {old * 1e6:.1f} us, landmarks_to_array {new * 1e6:.1f} us")
+
+
+def main():
+	if len(sys.argv) < 2:
+		sys.exit(__doc__)
+	model = sys.argv[2] if len(sys.argv) > 2 else TRACKING.tasks_model_path
+	limit = int(sys.argv[3]) if len(sys.argv) > 3 else 600
+	frames, fps = load_frames(sys.argv[1], limit)
+	h, w = frames[0].shape[:2]
+	print(f"{len(frames)} frames {w}x{h} delivered at {fps:.0f} fps")
+	legacy = run_legacy(frames, fps)
+	run_tasks(frames, fps, model)
+	conversion(frames, legacy)
+
+
+if __name__ == "__main__":
+	main()
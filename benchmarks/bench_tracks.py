@@ -0,0 +1,128 @@
+"""Per-hand gesture state keyed by handedness label vs by track id, under handedness noise.
+
+Two synthetic hands (a right fist and a left open palm, drifting slowly with landmark jitter)
+are classified for 60 s at 30 FPS while the reported handedness misbehaves the way MediaPipe's
+does: now and then one hand's label flips for 1-3 frames, or comes back "Unknown".
+- by label: one GestureClassifier per "Right"/"Left", as the controller used to; "Unknown" hands
+  are dropped, and a flipped hand feeds the other hand's stability and swipe history.
+- by track: TrackAssociator ids, one pooled classifier per track.
+For each hand it reports the share of frames showing its true gesture and how often a
+recognized gesture dropped out. It also times association for 2-8 hands.
+
+Usage: python benchmarks/bench_tracks.py [flip_rate] [unknown_rate]
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_filter import _SEGMENTS, make_hand
+from hastayanam.gestures import GestureClassifier
+from hastayanam.tracking import FrameResult, HandObservation
+from hastayanam.tracks import TrackAssociator
+from hastayanam.utils import set_clock
+
+FPS = 30.0
+HANDS = (("Right", "fist", 0.35, 0.008), ("Left", "open_palm", 0.65, 0.02))  # (true label, pose, x, rule margin)
+
+
+def make_frames(seconds: float, flip_rate: float, unknown_rate: float, rng):
+	"""Per frame: [(reported label, pts)] for both hands, in the true order."""
+	frames = []
+	flipped = [0, 0]  # Frames left in a flip burst, per hand
+	for k in range(int(seconds * FPS)):
+		t = k / FPS
+		hands = []
+		for i, (label, pose, x, margin) in enumerate(HANDS):
+			wrist = (x + 0.04 * np.sin(0.8 * t + i), 0.7 + 0.02 * np.cos(0.6 * t))
+			pts = make_hand(_SEGMENTS[pose], margin=margin, wrist=wrist) + rng.normal(0.0, 0.003, size=(21, 3)).astype(np.float32)
+			if flipped[i] == 0 and rng.random() < flip_rate:
+				flipped[i] = int(rng.integers(1, 4))
+			if flipped[i]:
+				flipped[i] -= 1
+				label = "Left" if label == "Right" else "Right"
+			elif rng.random() < unknown_rate:
+				label = "Unknown"
+			hands.append((label, pts))
+		frames.append((t, hands))
+	return frames
+
+
+def by_label(frames, clock):
+	classifiers = {"Right": GestureClassifier(), "Left": GestureClassifier()}
+	out = [[], []]
+	for t, hands in frames:
+		clock[0] = t
+		for i, (label, pts) in enumerate(hands):
+			clf = classifiers.get(label)
+			out[i].append(clf.infer(pts, (1280, 720)).name if clf is not None else "unknown")
+	return out
+
+
+def by_track(frames, clock):
+	tracks = TrackAssociator()
+	classifiers = {}
+	out = [[], []]
+	for t, hands in frames:
+		clock[0] = t
+		res = tracks.apply(FrameResult(None, 1280, 720, [HandObservation(pts=pts, label=label) for label, pts in hands]), t)
+		for tid in tracks.evicted:
+			classifiers.pop(tid, None)
+		for i, hand in enumerate(res.hands):
+			clf = classifiers.setdefault(hand.track_id, GestureClassifier())
+			out[i].append(clf.infer(hand.pts, (1280, 720)).name)
+	return out, tracks
+
+
+def score(names, want):
+	hit = np.array([n == want for n in names])
+	dropouts = int(np.sum(hit[:-1] & ~hit[1:]))
+	return hit.mean() * 100, dropouts
+
+
+def association_cost(n: int, rng):
+	tracks = TrackAssociator()
+	xs = np.linspace(0.1, 0.9, n)
+	base = [make_hand(_SEGMENTS["open_palm"], margin=0.01, wrist=(x, 0.7)) for x in xs]
+	frames = [
+		FrameResult(None, 1280, 720, [HandObservation(pts=p + rng.normal(0.0, 0.003, size=p.shape).astype(np.float32), label="Right" if j % 2 else "Left") for j, p in enumerate(base)])
+		for _ in range(64)
+	]
+	k = [0]
+
+	def step():
+		k[0] += 1
+		tracks.apply(frames[k[0] % len(frames)], k[0] / FPS)
+
+	return min(timeit.repeat(step, number=500, repeat=3)) / 500
+
+
+def main():
+	flip_rate = float(sys.argv[1]) if len(sys.argv) > 1 else 0.03
+	unknown_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+	rng = np.random.default_rng(0)
+	frames = make_frames(60.0, flip_rate, unknown_rate, rng)
+	print(f"{len(frames)} frames, per hand per frame: flip burst {flip_rate:.0%}, unknown {unknown_rate:.0%}")
+	clock = [0.0]
+	set_clock(lambda: clock[0])
+	try:
+		old = by_label(frames, clock)
+		new, tracks = by_track(frames, clock)
+	finally:
+		set_clock(None)
+	for name, out in (("by label", old), ("by track", new)):
+		parts = []
+		for i, (label, pose, _, _) in enumerate(HANDS):
+			pct, drops = score(out[i], pose)
+			parts.append(f"{label} {pose} {pct:5.1f}% of frames, {drops:3d} drop-outs")
+		print(f"{name:>9}: " + "; ".join(parts))
+	print(f"{'':>9}  {tracks.created} tracks created, {tracks.relabeled} reported labels overridden by the track's majority")
+	for n in (2, 4, 8):
+		print(f"association, {n} hands: {association_cost(n, rng) * 1e6:5.1f} us/frame")
+
+
+if __name__ == "__main__":
+	main()
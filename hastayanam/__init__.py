@@ -1,10 +1,32 @@
 __all__ = [
 	"config",
 	"utils",
+	"lazy",
+	"capture",
 	"tracking",
+	"tasks_tracking",
+	"scheduler",
+	"inference_pool",
+	"tracks",
+	"filtering",
 	"gestures",
+	"learned",
+	"sequences",
 	"modes",
 	"overlay",
+	"controller",
+	"bindings",
+	"recording",
+	"replay",
+	"ingest",
+	"dataset",
+	"tuning",
+	"dispatcher",
+	"input_backends",
+	"metrics",
+	"pipeline",
+	"frames",
+	"service",
 	"actions_system",
 	"actions_media",
 	"actions_browser",
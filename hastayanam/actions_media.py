@@ -1,26 +1,26 @@
-import pyautogui as pag
+from .input_backends import get_backend
 
 
 def play_pause():
-	pag.press('space')
+	get_backend().press('space')
 
 
 def next_slide():
-	pag.press('right')
+	get_backend().press('right')
 
 
 def prev_slide():
-	pag.press('left')
+	get_backend().press('left')
 
 
-def volume_up():
-	pag.press('volumeup')
+def volume_up(steps: int = 1):
+	get_backend().press('volumeup', presses=steps)
 
 
-def volume_down():
-	pag.press('volumedown')
+def volume_down(steps: int = 1):
+	get_backend().press('volumedown', presses=steps)
 
 
 def start_presentation():
 	# For PowerPoint, F5 starts; fallback to Enter/Space
-	pag.press('f5')
+	get_backend().press('f5')
@@ -1,42 +1,38 @@
-import subprocess
-import ctypes
-import pyautogui as pag
+from .input_backends import get_backend
 
 
 def show_desktop():
-	pag.hotkey('winleft', 'd')
+	get_backend().hotkey('winleft', 'd')
 
 
 def volume_up(steps: int = 2):
-	for _ in range(steps):
-		pag.press('volumeup')
+	get_backend().press('volumeup', presses=steps)
 
 
 def volume_down(steps: int = 2):
-	for _ in range(steps):
-		pag.press('volumedown')
+	get_backend().press('volumedown', presses=steps)
 
 
 def next_window():
-	pag.hotkey('alt', 'tab')
+	get_backend().hotkey('alt', 'tab')
 
 
 def prev_window():
-	pag.hotkey('alt', 'shift', 'tab')
+	get_backend().hotkey('alt', 'shift', 'tab')
 
 
 def lock_screen():
-	ctypes.windll.user32.LockWorkStation()
+	get_backend().lock_screen()
 
 
 def confirm_enter():
-	pag.press('enter')
+	get_backend().press('enter')
 
 
 def sleep_computer():
 	# Hibernate (sleep) – requires hibernation enabled
-	subprocess.run(["shutdown", "/h"], shell=True)
+	get_backend().hibernate()
 
 
 def shutdown_now():
-	subprocess.run(["shutdown", "/s", "/t", "0"], shell=True)
+	get_backend().shutdown()
@@ -0,0 +1,208 @@
+"""Gesture -> action bindings as data, compiled once into a dict lookup with prebound callables.
+
+A bindings file is JSON, a list of entries (or {"bindings": [...], "sequences": [...]}):
+	{"mode": "system", "gesture": "fist", "hold": true, "action": "system.sleep_computer",
+	 "label": "Sleep", "cooldown": 1.5}
+	{"mode": "media", "gesture": "thumbs_up", "action": "media.volume_up", "args": {"steps": 2},
+	 "label": "Volume Up", "cooldown": 0.25}
+hold is true, false, or omitted for either; an exact hold entry wins over an omitted one.
+action names a function in actions_system / actions_media / actions_browser as
+system.<fn>, media.<fn> or browser.<fn>. gesture may also name a sequence (see sequences.py),
+which fires once when the sequence completes; hold doesn't apply to those. A file without a
+"sequences" key gets DEFAULT_SEQUENCES.
+
+Write the built-in table out to start from: python -m hastayanam.bindings --dump bindings.json
+"""
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import argparse
+import json
+import os
+from .config import BINDINGS
+from .modes import Mode
+from .sequences import DEFAULT_SEQUENCES, Sequence, compile_sequences
+from .utils import now as current_time
+
+from . import actions_system as sys_actions
+from . import actions_media as media_actions
+from . import actions_browser as browser_actions
+
+ACTION_MODULES = {"system": sys_actions, "media": media_actions, "browser": browser_actions}
+
+DEFAULT_BINDINGS: List[Dict[str, Any]] = [
+	{"mode": "system", "gesture": "open_palm", "action": "system.show_desktop", "label": "Show Desktop", "cooldown": 1.0},
+	{"mode": "system", "gesture": "point_up", "action": "system.volume_up", "args": {"steps": 1}, "label": "Volume Up", "cooldown": 0.25},
+	{"mode": "system", "gesture": "point_down", "action": "system.volume_down", "args": {"steps": 1}, "label": "Volume Down", "cooldown": 0.25},
+	{"mode": "system", "gesture": "swipe_right", "action": "system.next_window", "label": "Next Window", "cooldown": 0.9},
+	{"mode": "system", "gesture": "swipe_left", "action": "system.prev_window", "label": "Previous Window", "cooldown": 0.9},
+	{"mode": "system", "gesture": "fist", "hold": False, "action": "system.lock_screen", "label": "Lock Screen", "cooldown": 1.5},
+	{"mode": "system", "gesture": "fist", "hold": True, "action": "system.sleep_computer", "label": "Sleep", "cooldown": 1.5},
+	{"mode": "system", "gesture": "thumbs_up", "action": "system.confirm_enter", "label": "Confirm / Enter", "cooldown": 0.9},
+	{"mode": "media", "gesture": "swipe_right", "action": "media.next_slide", "label": "Next Slide/Video/Track", "cooldown": 0.8},
+	{"mode": "media", "gesture": "swipe_left", "action": "media.prev_slide", "label": "Previous Slide/Video/Track", "cooldown": 0.8},
+	{"mode": "media", "gesture": "open_palm", "action": "media.start_presentation", "label": "Start/Resume", "cooldown": 1.0},
+	{"mode": "media", "gesture": "fist", "action": "media.play_pause", "label": "Pause", "cooldown": 0.9},
+	{"mode": "media", "gesture": "two_fingers", "action": "media.play_pause", "label": "Play/Pause", "cooldown": 0.9},
+	{"mode": "media", "gesture": "thumbs_up", "action": "media.volume_up", "args": {"steps": 1}, "label": "Volume Up", "cooldown": 0.25},
+	{"mode": "media", "gesture": "thumbs_down", "action": "media.volume_down", "args": {"steps": 1}, "label": "Volume Down", "cooldown": 0.25},
+	{"mode": "browser", "gesture": "swipe_right", "action": "browser.next_tab", "label": "Next Tab", "cooldown": 0.8},
+	{"mode": "browser", "gesture": "swipe_left", "action": "browser.prev_tab", "label": "Previous Tab", "cooldown": 0.8},
+	{"mode": "browser", "gesture": "open_palm", "hold": False, "action": "browser.new_tab", "label": "New Tab", "cooldown": 1.0},
+	{"mode": "browser", "gesture": "open_palm", "hold": True, "action": "browser.open_incognito", "label": "Incognito Window", "cooldown": 1.5},
+	{"mode": "browser", "gesture": "fist", "action": "browser.close_tab", "label": "Close Tab", "cooldown": 0.9},
+	{"mode": "browser", "gesture": "thumbs_up", "action": "browser.reload_page", "label": "Reload Page", "cooldown": 1.0},
+	{"mode": "browser", "gesture": "thumbs_down", "action": "browser.go_back", "label": "Go Back", "cooldown": 0.8},
+	{"mode": "browser", "gesture": "two_fingers", "action": "browser.go_forward", "label": "Go Forward", "cooldown": 0.9},
+]
+
+_ENTRY_KEYS = {"mode", "gesture", "hold", "action", "args", "label", "cooldown"}
+
+
+@dataclass(frozen=True)
+class Binding:
+	label: str
+	fn: Callable[[], Any]  # Prebound once at compile time, args included
+	cooldown: float
+
+
+def _resolve_action(name: str, args: Dict[str, Any]) -> Callable[[], Any]:
+	module_name, _, fn_name = name.partition(".")
+	module = ACTION_MODULES.get(module_name)
+	fn = getattr(module, fn_name, None) if module is not None and not fn_name.startswith("_") else None
+	if not callable(fn):
+		raise ValueError(f"unknown action: {name}")
+	return partial(fn, **args) if args else fn
+
+
+def compile_bindings(entries: List[Dict[str, Any]]) -> Dict[Tuple[Mode, str, bool], Binding]:
+	"""{(mode, gesture, is_hold): Binding}. Raises ValueError on the first bad entry."""
+	table: Dict[Tuple[Mode, str, bool], Binding] = {}
+	exact = set()
+	for i, entry in enumerate(entries):
+		unknown = set(entry) - _ENTRY_KEYS
+		if unknown:
+			raise ValueError(f"binding {i}: unknown keys {sorted(unknown)}")
+		try:
+			mode = Mode[str(entry["mode"]).upper()]
+			gesture = str(entry["gesture"])
+			binding = Binding(
+				label=str(entry.get("label", entry["action"])),
+				fn=_resolve_action(str(entry["action"]), dict(entry.get("args") or {})),
+				cooldown=float(entry.get("cooldown", 0.9)),
+			)
+		except KeyError as e:
+			raise ValueError(f"binding {i}: missing or unknown {e}") from None
+		except (TypeError, ValueError) as e:
+			raise ValueError(f"binding {i}: {e}") from None
+		hold = entry.get("hold")
+		if hold is not None and not isinstance(hold, bool):
+			# A quoted "false" is truthy; don't quietly turn it into a hold binding
+			raise ValueError(f"binding {i} ({entry.get('mode')}/{entry.get('gesture')}): hold must be true, false or omitted, got {hold!r}")
+		for is_hold in ((False, True) if hold is None else (hold,)):
+			key = (mode, gesture, is_hold)
+			if hold is None and key in exact:
+				continue
+			if hold is not None:
+				exact.add(key)
+			table[key] = binding
+	return table
+
+
+def load_file(path: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+	"""(binding entries, sequence entries); DEFAULT_SEQUENCES if the file declares none."""
+	with open(path, encoding="utf-8") as fh:
+		data = json.load(fh)
+	entries = data.get("bindings") if isinstance(data, dict) else data
+	if not isinstance(entries, list):
+		raise ValueError(f"{path}: expected a list of bindings")
+	sequences = data.get("sequences", DEFAULT_SEQUENCES) if isinstance(data, dict) else DEFAULT_SEQUENCES
+	if not isinstance(sequences, list):
+		raise ValueError(f"{path}: expected a list of sequences")
+	return entries, sequences
+
+
+class BindingTable:
+	"""The compiled lookup plus optional hot reload from a JSON file.
+
+	A file that fails to load or compile leaves the previous table (and sequences) in place;
+	the reason is kept in error. version goes up on every reload that takes.
+	"""
+
+	def __init__(self, path: str = BINDINGS.path, reload_interval_s: float = BINDINGS.reload_interval_s):
+		self.path = path
+		self.reload_interval_s = reload_interval_s
+		self.error = ""
+		self._mtime: Optional[float] = None
+		self._next_check = 0.0
+		self.version = 0
+		entries, sequences = load_file(path) if path else (DEFAULT_BINDINGS, DEFAULT_SEQUENCES)
+		self._table = compile_bindings(entries)
+		self.sequences: List[Sequence] = compile_sequences(sequences)
+		if path:
+			self._mtime = os.path.getmtime(path)
+
+	def lookup(self, mode: Mode, gesture: str, is_hold: bool) -> Optional[Binding]:
+		return self._table.get((mode, gesture, is_hold))
+
+	def reload(self) -> bool:
+		"""Recompile from the file now. Returns False (and sets error) if it didn't take."""
+		if not self.path:
+			return False
+		try:
+			mtime = os.path.getmtime(self.path)
+			entries, sequences = load_file(self.path)
+			table, compiled = compile_bindings(entries), compile_sequences(sequences)
+		except (OSError, ValueError) as e:
+			self.error = str(e)
+			return False
+		self._table, self.sequences = table, compiled
+		self._mtime = mtime
+		self.version += 1
+		self.error = ""
+		return True
+
+	def maybe_reload(self) -> bool:
+		"""reload() if the file changed; checks the mtime at most every reload_interval_s."""
+		if not self.path or self.reload_interval_s <= 0:
+			return False
+		t = current_time()
+		if t < self._next_check:
+			return False
+		self._next_check = t + self.reload_interval_s
+		try:
+			mtime = os.path.getmtime(self.path)
+		except OSError as e:
+			self.error = str(e)
+			return False
+		return mtime != self._mtime and self.reload()
+
+	def __len__(self) -> int:
+		return len(self._table)
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Check or export gesture bindings")
+	parser.add_argument("path", nargs="?", help="Bindings file to validate")
+	parser.add_argument("--dump", metavar="PATH", help="Write the built-in bindings to PATH")
+	args = parser.parse_args()
+
+	if args.dump:
+		with open(args.dump, "w", encoding="utf-8") as fh:
+			json.dump({"bindings": DEFAULT_BINDINGS, "sequences": DEFAULT_SEQUENCES}, fh, indent=1)
+	if args.path:
+		entries, sequences = load_file(args.path)
+		table = compile_bindings(entries)
+		for (mode, gesture, is_hold), binding in sorted(table.items(), key=lambda kv: (kv[0][0].value, kv[0][1], kv[0][2])):
+			print(f"{mode.name.lower():>8} {gesture:>12} {'hold' if is_hold else '    '}  {binding.label} ({binding.cooldown:.2f}s)")
+		for seq in compile_sequences(sequences):
+			steps = " -> ".join(
+				step.gesture + (f"@{step.hand}" if step.hand != "any" else "") + (f" hold {step.hold_s:g}s" if step.hold_s else "")
+				+ (f" within {step.within_s:g}s" if step.within_s else "")
+				for step in seq.steps
+			)
+			print(f"sequence {seq.name}: {steps}" + (f", cooldown {seq.cooldown_s:g}s" if seq.cooldown_s else "") + (", repeats" if seq.repeat else ""))
+
+
+if __name__ == "__main__":
+	main()
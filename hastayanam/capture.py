@@ -0,0 +1,334 @@
+"""Frame sources: cameras with negotiated settings, video files and a synthetic camera.
+
+open_capture() does more than ask a camera for a size. It picks the capture API (DirectShow on
+Windows, V4L2 on Linux, per CAPTURE.backend) and requests MJPG, the frame rate and a one-frame
+driver buffer, in the order drivers honor them. Then it reads back what was granted and checks
+the shape of a first frame. Without MJPG, many USB cameras fall back to uncompressed YUY2, which
+can't carry 720p at 30 FPS over USB 2. A camera that accepts MJPG but then delivers nothing is
+reopened without it.
+
+The returned Capture reads like cv2.VideoCapture (read(image=...), get, set, release), so the
+frame ring and the pipeline use it unchanged. It adds:
+- latest_frame: before each read, grab() past frames the driver had queued, so the frame is
+  the newest one rather than one waiting in a buffer that couldn't be shrunk
+- frame_time: when the frame was captured, on the perf_counter clock. This is the driver's
+  timestamp where V4L2 provides one, the due time for files and synthetic frames, and
+  otherwise the moment the frame was read.
+- negotiated / info(): requested vs granted settings, and notes on anything that differed
+
+Sources: a camera index ("0"), a video file path, or "synthetic". Files are delivered at their
+own frame rate (CAPTURE.file_realtime), dropping frames the consumer is too slow for. Synthetic
+frames need neither camera nor file.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import os
+import sys
+import time
+import numpy as np
+from .config import CAPTURE, VIDEO
+from .lazy import lazy_import
+
+cv2 = lazy_import("cv2")
+
+_BACKENDS = {"v4l2": "CAP_V4L2", "msmf": "CAP_MSMF", "dshow": "CAP_DSHOW", "any": "CAP_ANY"}
+_MAX_DRAIN = 8  # Queued frames skipped per read at most; deeper driver queues are unusual
+
+
+def _auto_backend() -> str:
+	if sys.platform == "win32":
+		return "dshow"  # Opens in a fraction of MSMF's time and honors MJPG on most USB cameras
+	if sys.platform.startswith("linux"):
+		return "v4l2"
+	return "any"
+
+
+def _fourcc_str(value: float) -> str:
+	code = int(value)
+	return "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)).strip("\x00 ") if code > 0 else ""
+
+
+class SyntheticCamera:
+	"""Camera stand-in with cv2.VideoCapture's read/grab/retrieve/get/set.
+
+	Frame k is exposed at start + k / fps. Like a driver, it queues up to `queue` frames and
+	drops older ones, and grab() waits for the next frame when none is queued. Like many
+	drivers, it ignores requests to change the queue size. Frames are a
+	gray level and a white square that both move with k.
+	"""
+
+	def __init__(self, width: int = VIDEO.width, height: int = VIDEO.height, fps: float = CAPTURE.fps, queue: int = CAPTURE.synthetic_queue):
+		self.width = width
+		self.height = height
+		self.fps = fps
+		self.queue = max(queue, 1)
+		self.dropped = 0
+		self._start = time.perf_counter()
+		self._next = 0  # Oldest frame not grabbed yet
+		self._grabbed = -1
+		self._open = True
+
+	def isOpened(self) -> bool:
+		return self._open
+
+	def exposure_time(self) -> float:
+		return self._start + self._grabbed / self.fps
+
+	def grab(self) -> bool:
+		if not self._open:
+			return False
+		now = time.perf_counter()
+		newest = int((now - self._start) * self.fps)
+		oldest = newest - self.queue + 1
+		if self._next < oldest:
+			self.dropped += oldest - self._next
+			self._next = oldest
+		if self._next > newest:
+			time.sleep(self._start + self._next / self.fps - now)
+		self._grabbed = self._next
+		self._next += 1
+		return True
+
+	def retrieve(self, image: Optional[np.ndarray] = None, flag: int = 0) -> Tuple[bool, Optional[np.ndarray]]:
+		if self._grabbed < 0:
+			return False, None
+		if image is None or image.shape != (self.height, self.width, 3):
+			image = np.empty((self.height, self.width, 3), dtype=np.uint8)
+		k = self._grabbed
+		image[...] = 32 + k % 64
+		side = min(self.width, self.height) // 6
+		x = (k * 8) % max(self.width - side, 1)
+		y = (self.height - side) // 2
+		image[y:y + side, x:x + side] = 255
+		return True, image
+
+	def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+		return self.retrieve(image) if self.grab() else (False, None)
+
+	def get(self, prop: int) -> float:
+		values = {
+			cv2.CAP_PROP_FRAME_WIDTH: self.width, cv2.CAP_PROP_FRAME_HEIGHT: self.height, cv2.CAP_PROP_FPS: self.fps,
+			cv2.CAP_PROP_BUFFERSIZE: self.queue, cv2.CAP_PROP_POS_FRAMES: self._grabbed + 1,
+		}
+		return float(values.get(prop, 0.0))
+
+	def set(self, prop: int, value: float) -> bool:
+		if prop == cv2.CAP_PROP_FRAME_WIDTH:
+			self.width = int(value)
+		elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+			self.height = int(value)
+		else:
+			return False
+		return True
+
+	def release(self):
+		self._open = False
+
+
+class Capture:
+	"""A negotiated source; reads like cv2.VideoCapture and stamps each frame with frame_time."""
+
+	def __init__(self, cap, kind: str, negotiated: Dict[str, Any], latest_frame: bool = False, fps: float = 0.0, realtime: bool = False):
+		self.cap = cap
+		self.kind = kind  # "camera", "file" or "synthetic"
+		self.negotiated = negotiated
+		self.latest_frame = latest_frame
+		self.frame_time = 0.0  # Capture time of the last frame read, perf_counter clock
+		self.frames = 0
+		self.drained = 0  # Frames skipped to reach the newest one (queued, or late in a file)
+		self._fps = fps
+		self._realtime = realtime and fps > 0
+		self._start: Optional[float] = None
+		self._index = 0  # Next file frame
+		self._v4l2 = negotiated.get("backend") == "v4l2"
+		# A grab() faster than this took a frame the driver had queued rather than waiting for one
+		self._queued_s = max(0.25 / fps, 0.002) if fps > 0 else 0.002
+
+	def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+		if self.kind == "file" and self._realtime:
+			ok = self._grab_file()
+		elif self.latest_frame:
+			ok = self._grab_newest()
+		else:
+			ok = self.cap.grab()
+			if ok:
+				self._stamp()
+		if not ok:
+			return False, None
+		ok, frame = self.cap.retrieve(image) if image is not None else self.cap.retrieve()
+		if ok:
+			self.frames += 1
+		return ok, frame
+
+	def _grab_newest(self) -> bool:
+		for drained in range(_MAX_DRAIN + 1):
+			t0 = time.perf_counter()
+			if not self.cap.grab():
+				return False
+			# Waited for the sensor: this is the newest frame
+			if time.perf_counter() - t0 >= self._queued_s:
+				break
+		self.drained += drained
+		self._stamp()
+		return True
+
+	def _grab_file(self) -> bool:
+		now = time.perf_counter()
+		if self._start is None:
+			self._start = now
+		due = self._start + self._index / self._fps
+		if now < due:
+			time.sleep(due - now)
+		else:
+			# Late: frames whose successor is already due are skipped, as a camera would overwrite them
+			behind = int((now - self._start) * self._fps) - self._index
+			for _ in range(behind):
+				if not self.cap.grab():
+					return False
+				self._index += 1
+				self.drained += 1
+		if not self.cap.grab():
+			return False
+		self.frame_time = self._start + self._index / self._fps
+		self._index += 1
+		return True
+
+	def _stamp(self):
+		now = time.perf_counter()
+		if self.kind == "synthetic":
+			self.frame_time = self.cap.exposure_time()
+			return
+		if self._v4l2:
+			# V4L2 buffer timestamps are CLOCK_MONOTONIC milliseconds; others use their own epochs
+			age = time.monotonic() - self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+			if 0.0 <= age < 1.0:
+				self.frame_time = now - age
+				return
+		self.frame_time = now
+
+	def get(self, prop: int) -> float:
+		# Sizes as verified on a real frame, in case the driver reports something else
+		if self.kind == "camera" and prop in (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT):
+			return float(self.negotiated["granted"]["width" if prop == cv2.CAP_PROP_FRAME_WIDTH else "height"])
+		return self.cap.get(prop)
+
+	def set(self, prop: int, value: float) -> bool:
+		return self.cap.set(prop, value)
+
+	def isOpened(self) -> bool:
+		return self.cap.isOpened()
+
+	def release(self):
+		self.cap.release()
+
+	def info(self) -> Dict[str, Any]:
+		out = {**self.negotiated, "latest_frame": self.latest_frame, "frames": self.frames, "drained": self.drained}
+		if self.kind == "synthetic":
+			out["dropped_in_queue"] = self.cap.dropped
+		return out
+
+	def describe(self) -> str:
+		g = self.negotiated.get("granted", {})
+		text = f"{self.kind} {self.negotiated.get('source')}"
+		if self.kind == "camera":
+			text += f" via {self.negotiated.get('backend')}: {g.get('fourcc') or '?'} {g.get('width')}x{g.get('height')} @ {g.get('fps'):g} fps, buffer {g.get('buffer_size')}"
+		else:
+			text += f": {g.get('width')}x{g.get('height')} @ {g.get('fps'):g} fps"
+		text += ", newest-frame reads" if self.latest_frame else ""
+		notes = self.negotiated.get("notes") or []
+		return text + "".join(f"\n  note: {note}" for note in notes)
+
+
+def _granted(cap) -> Dict[str, Any]:
+	return {
+		"fourcc": _fourcc_str(cap.get(cv2.CAP_PROP_FOURCC)),
+		"width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+		"height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+		"fps": round(float(cap.get(cv2.CAP_PROP_FPS)), 2),
+		"buffer_size": int(cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+	}
+
+
+def _open_camera(index: int, backend: str, requested: Dict[str, Any]):
+	cap = cv2.VideoCapture(index, getattr(cv2, _BACKENDS[backend]))
+	if cap.isOpened():
+		# Format first, then size, then rate: V4L2 and DirectShow reset the others on a format change
+		if requested["fourcc"]:
+			cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*requested["fourcc"]))
+		cap.set(cv2.CAP_PROP_FRAME_WIDTH, requested["width"])
+		cap.set(cv2.CAP_PROP_FRAME_HEIGHT, requested["height"])
+		cap.set(cv2.CAP_PROP_FPS, requested["fps"])
+		cap.set(cv2.CAP_PROP_BUFFERSIZE, requested["buffer_size"])
+	return cap
+
+
+def _differences(requested: Dict[str, Any], granted: Dict[str, Any]) -> List[str]:
+	notes = []
+	for key in ("fourcc", "width", "height", "fps", "buffer_size"):
+		want, got = requested[key], granted[key]
+		if key == "fourcc" and not want:
+			continue
+		if (abs(got - want) > 0.5) if key == "fps" else (got != want):
+			notes.append(f"asked for {key} {want}, got {got}")
+	return notes
+
+
+def open_capture(
+	source: str = CAPTURE.source,
+	width: int = VIDEO.width,
+	height: int = VIDEO.height,
+	fps: float = CAPTURE.fps,
+	backend: str = CAPTURE.backend,
+	fourcc: str = CAPTURE.fourcc,
+	buffer_size: int = CAPTURE.buffer_size,
+	latest_frame: str = CAPTURE.latest_frame,
+) -> Capture:
+	"""Open a camera index, video file or "synthetic" (see module docstring). Raises OSError if
+	no frames can be had, and FileNotFoundError for a missing file."""
+	source = str(source) if str(source) != "" else str(VIDEO.camera_index)
+	requested = {"fourcc": fourcc, "width": width, "height": height, "fps": fps, "buffer_size": buffer_size}
+	if source == "synthetic":
+		# Behaves like a camera whose driver ignores the buffer size request
+		cam = SyntheticCamera(width, height, fps)
+		granted = {"fourcc": "", "width": width, "height": height, "fps": fps, "buffer_size": cam.queue}
+		latest = latest_frame == "on" or (latest_frame == "auto" and cam.queue != buffer_size)
+		return Capture(cam, "synthetic", {"source": source, "requested": requested, "granted": granted, "notes": []}, latest, fps)
+
+	if not source.isdigit():
+		if not os.path.exists(source):
+			raise FileNotFoundError(f"video source not found: {source}")
+		cap = cv2.VideoCapture(source)
+		if not cap.isOpened():
+			raise OSError(f"cannot decode video {source}")
+		granted = _granted(cap)
+		return Capture(cap, "file", {"source": source, "granted": granted, "notes": []}, False, granted["fps"] or fps, CAPTURE.file_realtime)
+
+	name = _auto_backend() if backend == "auto" else backend
+	if name not in _BACKENDS:
+		raise ValueError(f"unknown capture backend {backend!r}; expected auto or one of {', '.join(_BACKENDS)}")
+	notes: List[str] = []
+	cap = _open_camera(int(source), name, requested)
+	if not cap.isOpened() and name != "any":
+		notes.append(f"{name} could not open camera {source}; used the default API")
+		cap.release()
+		name = "any"
+		cap = _open_camera(int(source), name, requested)
+	if not cap.isOpened():
+		raise OSError(f"cannot open camera {source}")
+	ok, frame = cap.read()
+	if not ok and fourcc:
+		# Some drivers accept MJPG and then never deliver; the default format beats no frames
+		notes.append(f"no frames in {fourcc}; reopened in the driver's default format")
+		cap.release()
+		cap = _open_camera(int(source), name, {**requested, "fourcc": ""})
+		ok, frame = cap.read()
+	if not ok:
+		cap.release()
+		raise OSError(f"camera {source} opened but delivered no frame")
+	granted = _granted(cap)
+	notes += _differences(requested, granted)
+	if (frame.shape[1], frame.shape[0]) != (granted["width"], granted["height"]):
+		notes.append(f"driver reports {granted['width']}x{granted['height']} but delivers {frame.shape[1]}x{frame.shape[0]}")
+		granted["width"], granted["height"] = frame.shape[1], frame.shape[0]
+	latest = latest_frame == "on" or (latest_frame == "auto" and granted["buffer_size"] != buffer_size)
+	negotiated = {"source": source, "backend": name, "requested": requested, "granted": granted, "notes": notes}
+	return Capture(cap, "camera", negotiated, latest, granted["fps"] or fps)
@@ -9,7 +9,10 @@ class Thresholds:
 	thumbs_down_angle_deg: float = 35.0
 	palm_open_distance: float = 0.18
 	finger_extended_cos_threshold: float = 0.7
-	swipe_min_displacement_px: int = 160
+	swipe_min_displacement_px: int = 160  # Wrist travel within swipe_window_s, along the swipe axis
+	swipe_window_s: float = 0.3  # Trajectory window the swipe detector looks at (frame-rate independent)
+	swipe_min_speed_px_s: float = 600.0  # Current wrist speed along the axis needed to fire
+	swipe_refractory_s: float = 0.5  # Ignore the opposite direction this long after a swipe (the return stroke)
 	hold_min_duration_s: float = 2.0
 	gesture_cooldown_s: float = 0.9
 	confidence_min: float = 0.85
@@ -27,6 +30,110 @@ class VideoConfig:
 	swap_handedness: bool = True  # Flip Left/Right labels for mirrored webcams
 
 
+@dataclass
+class CaptureConfig:
+	source: str = ""  # Empty: camera VIDEO.camera_index; a digit: that camera; a path: video file; "synthetic": generated frames
+	backend: str = "auto"  # Camera API: "auto" (DirectShow on Windows, V4L2 on Linux), "v4l2", "msmf", "dshow" or "any"
+	fourcc: str = "MJPG"  # Compressed stream so 720p runs at full rate over USB; empty keeps the driver default (often YUY2)
+	fps: float = 30.0  # Requested camera rate; also the rate of synthetic sources
+	buffer_size: int = 1  # Driver-side frame queue; 1 keeps it from serving stale frames
+	latest_frame: str = "auto"  # Drain queued frames with grab() before each read: "on", "off", or "auto" (when buffer_size wasn't granted)
+	file_realtime: bool = True  # Deliver video files at their own frame rate, dropping late frames like a camera would
+	synthetic_queue: int = 4  # Frames a synthetic source queues up like a driver, to show staleness without a camera
+
+
+@dataclass
+class TrackingConfig:
+	roi_enabled: bool = False  # Crop inference to the area around the previous frame's hands
+	roi_padding: float = 0.35  # Extra margin around the hands' box, as a fraction of its size
+	roi_refresh_frames: int = 30  # Force a full-frame detection this often to pick up new hands
+	roi_min_side_px: int = 256  # Upscale smaller crops so the landmark model keeps enough detail
+	backend: str = "solutions"  # "solutions" (legacy mp.solutions.hands, synchronous) or "tasks" (HandLandmarker, LIVE_STREAM)
+	tasks_model_path: str = "hand_landmarker.task"  # Model bundle for the tasks backend
+	tasks_max_in_flight: int = 2  # Unanswered frames at the tasks backend (one running, one waiting); further frames are skipped at capture
+	max_num_hands: int = 2  # Hands the model looks for; raise for several people in front of one camera
+	track_max_distance: float = 1.5  # Farthest a hand can move between frames and keep its track, in palm lengths
+	track_ttl_s: float = 0.5  # A track (and its gesture state) unseen this long is evicted
+	track_label_votes: int = 15  # A track's handedness is the majority over this many recent frames
+
+
+@dataclass
+class SchedulerConfig:
+	adaptive_enabled: bool = True  # Skip inference on idle/static frames
+	idle_detect_hz: float = 4.0  # Detection rate while no hands are visible
+	motion_threshold: float = 4.0  # Mean abs gray-level difference (0-255) on the downsampled frame
+	max_static_skips: int = 3  # Re-run inference at least every N+1 frames while a hand is visible
+	probe_size: tuple = (32, 18)  # Downsampled (w, h) used for the motion test
+
+
+@dataclass
+class MetricsConfig:
+	enabled: bool = True  # Per-stage timing; near-free, but can be switched off entirely
+	window: int = 600  # Samples kept per stage for p50/p95/p99
+	hud_panel: bool = False  # Start with the timing panel visible (toggle with 'm')
+	dump_path: str = ""  # e.g. "metrics.json" or "metrics.csv"; empty disables the periodic dump
+	dump_interval_s: float = 5.0
+
+
+@dataclass
+class ServiceConfig:
+	headless: bool = False  # No preview window, landmark drawing or HUD
+	control_host: str = "127.0.0.1"  # Local only; the channel is unauthenticated
+	control_port: int = 0  # 0 disables the control channel
+	status_path: str = ""  # JSON status file rewritten every status_interval_s; empty disables
+	status_interval_s: float = 1.0
+
+
+@dataclass
+class PoolConfig:
+	workers: int = 1  # >1 runs tracking in that many processes (app.py --workers)
+	slots_per_worker: int = 2  # Shared-memory frames in flight per worker; more are dropped
+	stream_affinity: bool = False  # Pin each camera to one worker (keeps MediaPipe tracking coherent)
+
+
+@dataclass
+class IngestConfig:
+	workers: int = 0  # Processes for python -m hastayanam.ingest; 0 uses every core
+	extensions: str = ".mp4,.avi,.mov,.mkv,.webm,.m4v"  # Video files picked up from an input directory
+	decode_threads: int = 1  # OpenCV threads per worker process; the pool already keeps every core busy
+	flush_frames: int = 300  # Recordings are flushed this often, so an interrupted run loses at most this much
+	progress_interval_s: float = 5.0  # Between progress lines
+
+
+@dataclass
+class ClassifierConfig:
+	backend: str = "rules"  # Static poses: "rules" (hand-written) or "mlp" (trained, see learned.py)
+	model_path: str = ""  # .npz from python -m hastayanam.learned train; required for "mlp"
+
+
+@dataclass
+class FilterConfig:
+	enabled: bool = True  # One Euro smoothing of landmarks before classification
+	min_cutoff: float = 1.5  # Hz at rest; lower = steadier but laggier
+	beta: float = 10.0  # Cutoff increase per (normalized unit / s) of speed; higher = less lag when moving
+	d_cutoff: float = 1.0  # Hz, for the velocity estimate
+	max_predict_s: float = 0.1  # How far to extrapolate over skipped frames / detection dropouts
+
+
+@dataclass
+class FrameConfig:
+	ring_slots: int = 6  # Preallocated capture buffers; covers capture, both slots, inference and render
+	shared: bool = False  # Put the ring in shared memory (the multi-process pool always does)
+
+
+@dataclass
+class BindingsConfig:
+	path: str = ""  # JSON gesture->action bindings (see bindings.py); empty uses the built-in table
+	reload_interval_s: float = 1.0  # How often to check the file for edits; 0 disables hot reload
+
+
+@dataclass
+class ActionConfig:
+	backend: str = "auto"  # "auto" (win32 on Windows, linux on Linux, pyautogui elsewhere), "win32", "linux", "pyautogui" or "recording"
+	linux_device: str = "xorg"  # pynput device for the linux backend: "xorg" (XTEST) or "uinput" (Wayland/console, needs /dev/uinput access)
+	pyautogui_pause_s: float = 0.1  # pyautogui's sleep after every call (its own default); the other backends never sleep
+
+
 @dataclass
 class OverlayConfig:
 	font_scale: float = 0.7
@@ -34,8 +141,21 @@ class OverlayConfig:
 	padding: int = 10
 	row_gap: int = 28
 	bg_alpha: float = 0.35
+	hud_layout: str = "full"  # "full" | "compact" | "off"; cycle with 'h'
 
 
 THRESHOLDS = Thresholds()
 VIDEO = VideoConfig()
+CAPTURE = CaptureConfig()
+TRACKING = TrackingConfig()
+SCHEDULER = SchedulerConfig()
+METRICS = MetricsConfig()
+SERVICE = ServiceConfig()
+POOL = PoolConfig()
+INGEST = IngestConfig()
+FRAMES = FrameConfig()
+FILTER = FilterConfig()
+CLASSIFIER = ClassifierConfig()
+BINDINGS = BindingsConfig()
+ACTIONS = ActionConfig()
 OVERLAY = OverlayConfig()
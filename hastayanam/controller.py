@@ -0,0 +1,176 @@
+from typing import Any, Dict, List, Optional, Tuple
+import threading
+import numpy as np
+
+from .bindings import BindingTable
+from .config import FILTER, THRESHOLDS
+from .filtering import LandmarkFilter
+from .gestures import GestureClassifier
+from .learned import load_backend
+from .modes import ModeManager, Mode
+from .metrics import PROFILER
+from .sequences import HANDS, NO_HAND, SequenceEngine
+from .tracks import TrackAssociator
+from .utils import CooldownManager, now as current_time
+
+
+class GestureController:
+	"""Per-frame gesture logic: classification, sequences (holds, combos, the mode switch) and action dispatch."""
+
+	def __init__(self, dispatcher, bindings: Optional[BindingTable] = None, backend=None):
+		"""backend: static-pose classifier (gestures.RuleBackend, learned.MlpBackend); defaults to CLASSIFIER."""
+		self.dispatcher = dispatcher  # Anything with submit(label, fn) and poll(), e.g. ActionDispatcher
+		self.bindings = bindings or BindingTable()
+		self.tracks = TrackAssociator()  # Persistent per-hand identity, so handedness flips don't mix up state
+		self.filter = LandmarkFilter() if FILTER.enabled else None  # Smooths landmarks before classification
+		self.backend = backend or load_backend()
+		self.classifiers: Dict[int, GestureClassifier] = {}  # One per live track
+		self._spare: List[GestureClassifier] = []  # Released by evicted tracks, reset for the next one
+		self.modes = ModeManager()  # Global mode: System ↔ Media ↔ Browser
+		self.sequences = SequenceEngine(self.bindings.sequences)  # Includes mode_cycle, the pinch-hold mode switch
+		self._bindings_version = self.bindings.version
+		self.cooldown = CooldownManager(default_seconds=THRESHOLDS.gesture_cooldown_s)
+		self.last_executed_action = ""
+		self._pending_mode: Optional[str] = None
+		self._reload_requested = False
+		self._requests_lock = threading.Lock()  # request_mode/request_reload come from the control server's thread
+
+	def request_mode(self, name: str):
+		"""Switch mode ('system', 'media', 'browser' or 'next') at the start of the next step.
+
+		Safe to call from other threads; the switch itself happens on the thread running step().
+		"""
+		if name != "next" and name.upper() not in Mode.__members__:
+			raise ValueError(f"unknown mode: {name}")
+		with self._requests_lock:
+			self._pending_mode = name
+
+	def request_reload(self):
+		"""Re-read the bindings file at the start of the next step, even if its mtime is unchanged."""
+		with self._requests_lock:
+			self._reload_requested = True
+
+	def step(self, frame_res) -> Dict[str, Any]:
+		w, h = frame_res.width, frame_res.height
+		# Take both requests at once, so one made meanwhile waits for the next step instead of being cleared
+		with self._requests_lock:
+			reload, self._reload_requested = self._reload_requested, False
+			pending, self._pending_mode = self._pending_mode, None
+		if reload:
+			self.bindings.reload()
+		else:
+			self.bindings.maybe_reload()
+		if self.bindings.version != self._bindings_version:
+			self._bindings_version = self.bindings.version
+			self.sequences = SequenceEngine(self.bindings.sequences)
+		if pending == "next":
+			self.modes.cycle()
+		elif pending is not None:
+			self.modes.set(Mode[pending.upper()])
+
+		frame_res = self.tracks.apply(frame_res)
+		for track_id in self.tracks.evicted:
+			classifier = self.classifiers.pop(track_id, None)
+			if classifier is not None:
+				self._spare.append(classifier)
+		if self.filter is not None:
+			with PROFILER.stage("filter"):
+				frame_res = self.filter.apply(frame_res)
+
+		per_hand_info = []
+		# (name, confidence, is_hold, onset_time)
+		right_gesture = ("unknown", 0.0, False, 0.0)
+		left_gesture = ("unknown", 0.0, False, 0.0)
+		# Per-hand labels for the sequence engine; a hand still settling is left out so it keeps its last label
+		labels = {hand: NO_HAND for hand in HANDS}
+		# Several hands per side (more than one person): the oldest observed track of each side
+		# drives sequences and bindings; the others are classified and shown
+		primary: Dict[str, Tuple[Tuple[bool, int], Any]] = {}
+
+		with PROFILER.stage("classify"):
+			# Static poses for every hand in one batched call
+			statics = self.backend.classify(np.stack([hand.pts for hand in frame_res.hands])) if frame_res.hands else []
+			for hand, static in zip(frame_res.hands, statics):
+				res = self._classifier(hand.track_id).infer(hand.pts, (w, h), static)
+				per_hand_info.append({"label": hand.label, "track": hand.track_id, "gesture": res.name, "conf": res.confidence})
+				rank = (hand.predicted, hand.track_id)
+				if hand.label in HANDS and (hand.label not in primary or rank < primary[hand.label][0]):
+					primary[hand.label] = (rank, res)
+			for side, (_, res) in primary.items():
+				gesture = (res.name, res.confidence, False, res.onset_time)
+				if side == "Right":
+					right_gesture = gesture
+				else:
+					left_gesture = gesture
+				if res.stable:
+					labels[side] = res.name
+				else:
+					del labels[side]
+
+		with PROFILER.stage("sequences"):
+			t = current_time()
+			matches = self.sequences.update(labels, t)
+		# A hold is the hand's label unchanged for hold_min_duration_s, as timed by the engine
+		right_gesture = (*right_gesture[:2], self.sequences.held_for("Right", t) >= THRESHOLDS.hold_min_duration_s, right_gesture[3])
+		left_gesture = (*left_gesture[:2], self.sequences.held_for("Left", t) >= THRESHOLDS.hold_min_duration_s, left_gesture[3])
+		# Global mode switch: the mode_cycle sequence (pinch held on either hand)
+		for match in matches:
+			if match.name == "mode_cycle":
+				self.modes.cycle()
+		mode = self.modes.get()
+		progress = self.sequences.progress("mode_cycle", t)
+
+		# Determine the active gesture for this frame (prioritize Right if both present)
+		active_gesture = right_gesture if right_gesture[1] >= left_gesture[1] else left_gesture
+
+		# Map only within the active global mode
+		binding = None
+		if active_gesture[1] >= THRESHOLDS.confidence_min:
+			binding = self.bindings.lookup(mode, active_gesture[0], active_gesture[2])
+
+		cooldown_hint = ""
+		if binding is not None:
+			cooldown_hint = self._dispatch(mode, active_gesture[0], binding, active_gesture[3])
+		# Completed sequences bound in this mode fire once each
+		for match in matches:
+			seq_binding = self.bindings.lookup(mode, match.name, False)
+			if seq_binding is not None:
+				cooldown_hint = self._dispatch(mode, match.name, seq_binding, match.onset) or cooldown_hint
+
+		for outcome in self.dispatcher.poll():
+			self.last_executed_action = outcome.label if outcome.ok else f"Failed: {outcome.label}"
+			PROFILER.record("action", outcome.duration_s)
+			if outcome.onset:
+				PROFILER.record("gesture_to_action", outcome.t_done - outcome.onset)
+
+		return {
+			"mode": mode.name.title(),
+			"gesture": f"R:{right_gesture[0]} L:{left_gesture[0]}",
+			"action": self.last_executed_action,
+			"confidence": max(right_gesture[1], left_gesture[1]),
+			"mode_progress": progress,
+			"cooldown_hint": cooldown_hint,
+			"per_hand": per_hand_info,
+		}
+
+	def _classifier(self, track_id: int) -> GestureClassifier:
+		classifier = self.classifiers.get(track_id)
+		if classifier is None:
+			if self._spare:
+				classifier = self._spare.pop()
+				classifier.state.reset()
+			else:
+				classifier = GestureClassifier(self.backend)
+			self.classifiers[track_id] = classifier
+		return classifier
+
+	def _dispatch(self, mode: Mode, name: str, binding, onset: float) -> str:
+		"""Submit the binding unless it's cooling down; returns the cooldown hint, if any."""
+		g = f"{mode.name}:{name}"
+		if not self.cooldown.ready(g):
+			return f"Cooling down: {g}"
+		# Runs on the dispatcher thread; the outcome shows up in a later frame
+		with PROFILER.stage("dispatch"):
+			self.dispatcher.submit(binding.label, binding.fn, onset=onset)
+		self.cooldown.trigger(g, seconds=binding.cooldown)
+		return ""
@@ -0,0 +1,155 @@
+"""Memory-mapped, columnar landmark store for large gesture corpora.
+
+One row per detected hand. A store directory holds one .npy file per column plus an index:
+	pts.npy        (N, 21, 3) float32
+	timestamp.npy  (N,) float64
+	frame.npy      (N,) int32, frame number within its session (hands of one frame share it)
+	label.npy      (N,) uint8, code into recording.LABELS
+	sessions.json  [{"name", "start", "stop"}]; each session's rows are contiguous and time-ordered,
+	               and its name is the recording's path relative to the recordings' common directory
+
+Usage: python -m hastayanam.dataset OUT_DIR session.hlm [more.hlm ...]
+"""
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import argparse
+import json
+import os
+import numpy as np
+from numpy.lib.format import open_memmap
+from .gestures import STATIC_LABELS, classify_features, hand_features
+from .recording import HAND_BYTES, LABELS, iter_frames, read_header
+
+Rows = Union[slice, np.ndarray]
+
+
+def _read(path: str) -> bytes:
+	with open(path, "rb") as fh:
+		data = fh.read()
+	if read_header(data) is None:
+		raise ValueError(f"{path}: not a landmark recording")
+	return data
+
+
+def session_names(recordings: Sequence[str]) -> List[str]:
+	"""Each recording's path relative to the recordings' common directory, without extension,
+	so same-named files from different folders (e.g. ingest's mirrored tree) stay apart."""
+	if not recordings:
+		return []
+	root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in recordings])
+	names = [os.path.splitext(os.path.relpath(os.path.abspath(p), root))[0].replace(os.sep, "/") for p in recordings]
+	seen = set()
+	for path, name in zip(recordings, names):
+		if name in seen:
+			raise ValueError(f"{path}: session {name!r} given twice")
+		seen.add(name)
+	return names
+
+
+def build_store(out_dir: str, recordings: Sequence[str]) -> "LandmarkStore":
+	"""Convert .hlm recordings into a store. Two passes: count rows, then fill preallocated memmaps."""
+	names = session_names(recordings)
+	os.makedirs(out_dir, exist_ok=True)
+	counts = []
+	for path in recordings:
+		data = _read(path)
+		counts.append(sum(n for _, n, _ in iter_frames(data)))
+	total = sum(counts)
+
+	pts = open_memmap(os.path.join(out_dir, "pts.npy"), mode="w+", dtype=np.float32, shape=(total, 21, 3))
+	ts = open_memmap(os.path.join(out_dir, "timestamp.npy"), mode="w+", dtype=np.float64, shape=(total,))
+	frame = open_memmap(os.path.join(out_dir, "frame.npy"), mode="w+", dtype=np.int32, shape=(total,))
+	label = open_memmap(os.path.join(out_dir, "label.npy"), mode="w+", dtype=np.uint8, shape=(total,))
+
+	sessions = []
+	row = 0
+	for path, name in zip(recordings, names):
+		# Re-read per file so only one recording is held in memory at a time
+		data = _read(path)
+		start = row
+		for frame_no, (t, n, off) in enumerate(iter_frames(data)):
+			for _ in range(n):
+				label[row] = data[off]
+				pts[row] = np.frombuffer(data, dtype="<f4", count=63, offset=off + 1).reshape(21, 3)
+				ts[row] = t
+				frame[row] = frame_no
+				off += HAND_BYTES
+				row += 1
+		sessions.append({"name": name, "start": start, "stop": row})
+
+	for arr in (pts, ts, frame, label):
+		arr.flush()
+	with open(os.path.join(out_dir, "sessions.json"), "w", encoding="utf-8") as fh:
+		json.dump(sessions, fh, indent=1)
+	del pts, ts, frame, label
+	return LandmarkStore(out_dir)
+
+
+class LandmarkStore:
+	def __init__(self, path: str):
+		self.path = path
+		self.pts: np.ndarray = np.load(os.path.join(path, "pts.npy"), mmap_mode="r")
+		self.timestamp: np.ndarray = np.load(os.path.join(path, "timestamp.npy"), mmap_mode="r")
+		self.frame: np.ndarray = np.load(os.path.join(path, "frame.npy"), mmap_mode="r")
+		self.label: np.ndarray = np.load(os.path.join(path, "label.npy"), mmap_mode="r")
+		with open(os.path.join(path, "sessions.json"), encoding="utf-8") as fh:
+			self.sessions: Dict[str, slice] = {s["name"]: slice(s["start"], s["stop"]) for s in json.load(fh)}
+		self._label_rows: Dict[str, np.ndarray] = {}
+
+	def __len__(self) -> int:
+		return len(self.timestamp)
+
+	def label_rows(self, label: str) -> np.ndarray:
+		"""Row numbers for one hand label, built on first use and cached."""
+		if label not in self._label_rows:
+			self._label_rows[label] = np.flatnonzero(self.label == LABELS.index(label))
+		return self._label_rows[label]
+
+	def select(self, session: Optional[str] = None, t0: Optional[float] = None, t1: Optional[float] = None, label: Optional[str] = None) -> Rows:
+		"""Rows matching the filters. A slice (zero-copy views) unless a label filter forces an index array."""
+		rows = self.sessions[session] if session is not None else slice(0, len(self))
+		if t0 is not None or t1 is not None:
+			if session is None:
+				raise ValueError("time range needs a session; timestamps are only ordered within one")
+			ts = self.timestamp[rows]
+			lo = rows.start + (int(np.searchsorted(ts, t0, side="left")) if t0 is not None else 0)
+			hi = rows.start + (int(np.searchsorted(ts, t1, side="right")) if t1 is not None else len(ts))
+			rows = slice(lo, hi)
+		if label is not None:
+			picked = self.label_rows(label)
+			lo, hi = np.searchsorted(picked, [rows.start, rows.stop])
+			return picked[lo:hi]
+		return rows
+
+	def iter_batches(self, rows: Optional[Rows] = None, batch_size: int = 65536) -> Iterator[Tuple[Rows, np.ndarray]]:
+		"""(rows, pts) chunks; pts is a view into the memmap for slice selections."""
+		rows = slice(0, len(self)) if rows is None else rows
+		if isinstance(rows, slice):
+			for lo in range(rows.start, rows.stop, batch_size):
+				chunk = slice(lo, min(lo + batch_size, rows.stop))
+				yield chunk, self.pts[chunk]
+		else:
+			for lo in range(0, len(rows), batch_size):
+				chunk = rows[lo:lo + batch_size]
+				yield chunk, self.pts[chunk]
+
+	def classify(self, rows: Optional[Rows] = None, batch_size: int = 65536) -> np.ndarray:
+		"""Static rule label index (into gestures.STATIC_LABELS) per row, computed batch by batch."""
+		parts = [classify_features(hand_features(pts)) for _, pts in self.iter_batches(rows, batch_size)]
+		return np.concatenate(parts) if parts else np.zeros(0, dtype=np.intp)
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Build a memory-mapped landmark store from .hlm recordings")
+	parser.add_argument("out_dir")
+	parser.add_argument("recordings", nargs="+")
+	args = parser.parse_args()
+
+	store = build_store(args.out_dir, args.recordings)
+	counts = np.bincount(store.classify(), minlength=len(STATIC_LABELS))
+	print(f"{len(store)} hands in {len(store.sessions)} sessions -> {args.out_dir}")
+	for name, count in zip(STATIC_LABELS.tolist(), counts.tolist()):
+		print(f"{name:>12}: {count}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,136 @@
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+import threading
+import time
+import numpy as np
+from .metrics import RollingWindow
+from .utils import now
+
+
+@dataclass
+class ActionRequest:
+	label: str
+	fn: Callable
+	t_submit: float
+	onset: float = 0.0  # utils.now() time the triggering gesture started
+
+
+@dataclass
+class ActionOutcome:
+	label: str
+	ok: bool
+	duration_s: float  # Time spent inside the action itself
+	latency_s: float  # Submit-to-completion, including queueing
+	error: str = ""
+	onset: float = 0.0
+	t_done: float = 0.0  # utils.now() at completion; t_done - onset is gesture-to-action time
+
+
+def _steps_of(fn) -> Optional[int]:
+	# Step-able actions are submitted as partial(fn, steps=n) so they can be merged
+	if isinstance(fn, partial) and "steps" in fn.keywords:
+		return fn.keywords["steps"]
+	return None
+
+
+def _same_action(a: Callable, b: Callable) -> bool:
+	if isinstance(a, partial) and isinstance(b, partial):
+		return a.func is b.func and a.args == b.args and a.keywords == b.keywords
+	return a is b
+
+
+class ActionDispatcher:
+	"""Runs actions on a worker thread so the camera loop never blocks on pyautogui or subprocess calls.
+
+	Repeated submissions still waiting in the queue are coalesced: identical actions are
+	collapsed and partial(fn, steps=n) requests for the same fn have their steps summed.
+	"""
+
+	def __init__(self, maxsize: int = 8):
+		self.maxsize = maxsize
+		self.dropped = 0
+		self._queue: Deque[ActionRequest] = deque()
+		self._outcomes: Deque[ActionOutcome] = deque(maxlen=32)
+		self._timings: Dict[str, Tuple[RollingWindow, RollingWindow]] = {}  # label -> (duration ms, latency ms)
+		self._cond = threading.Condition()
+		self._running = True
+		self._worker = threading.Thread(target=self._run, name="actions", daemon=True)
+		self._worker.start()
+
+	def submit(self, label: str, fn: Callable, onset: float = 0.0):
+		with self._cond:
+			if self._coalesce(label, fn):
+				return
+			if len(self._queue) >= self.maxsize:
+				self._queue.popleft()
+				self.dropped += 1
+			self._queue.append(ActionRequest(label=label, fn=fn, t_submit=time.perf_counter(), onset=onset))
+			self._cond.notify()
+
+	def _coalesce(self, label: str, fn: Callable) -> bool:
+		steps = _steps_of(fn)
+		for i, req in enumerate(self._queue):
+			if req.label != label:
+				continue
+			if steps is not None:
+				queued = _steps_of(req.fn)
+				if queued is not None and req.fn.func is fn.func:
+					self._queue[i] = ActionRequest(label=label, fn=partial(fn.func, *fn.args, **{**fn.keywords, "steps": queued + steps}), t_submit=req.t_submit, onset=req.onset)
+					return True
+			elif _same_action(req.fn, fn):
+				return True
+		return False
+
+	def poll(self) -> List[ActionOutcome]:
+		"""Outcomes completed since the last call, oldest first. Never blocks."""
+		with self._cond:
+			out = list(self._outcomes)
+			self._outcomes.clear()
+		return out
+
+	def action_stats(self) -> Dict[str, Dict[str, float]]:
+		"""Per action label: count, and p50/p95 ms of time inside the action (duration) and of
+		submit-to-completion (latency, which adds queueing behind earlier actions)."""
+		with self._cond:
+			items = [(label, d.values().copy(), l.values().copy(), d.count) for label, (d, l) in self._timings.items()]
+		out = {}
+		for label, durations, latencies, count in items:
+			d50, d95 = np.percentile(durations, [50, 95])
+			l50, l95 = np.percentile(latencies, [50, 95])
+			out[label] = {"count": count, "duration_p50_ms": float(d50), "duration_p95_ms": float(d95), "latency_p50_ms": float(l50), "latency_p95_ms": float(l95)}
+		return out
+
+	def pending(self) -> int:
+		with self._cond:
+			return len(self._queue)
+
+	def close(self, timeout: float = 1.0):
+		with self._cond:
+			self._running = False
+			self._cond.notify()
+		self._worker.join(timeout=timeout)
+
+	def _run(self):
+		while True:
+			with self._cond:
+				while self._running and not self._queue:
+					self._cond.wait()
+				if not self._running:
+					return
+				req = self._queue.popleft()
+			t0 = time.perf_counter()
+			try:
+				req.fn()
+				ok, err = True, ""
+			except Exception as e:
+				ok, err = False, str(e)
+			t1 = time.perf_counter()
+			with self._cond:
+				windows = self._timings.get(req.label)
+				if windows is None:
+					windows = self._timings[req.label] = (RollingWindow(64), RollingWindow(64))
+				windows[0].add((t1 - t0) * 1000.0)
+				windows[1].add((t1 - req.t_submit) * 1000.0)
+				self._outcomes.append(ActionOutcome(label=req.label, ok=ok, duration_s=t1 - t0, latency_s=t1 - req.t_submit, error=err, onset=req.onset, t_done=now()))
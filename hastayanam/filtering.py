@@ -0,0 +1,118 @@
+"""Landmark smoothing between tracking and classification.
+
+Each hand gets a One Euro filter (Casiez et al., CHI 2012) over all 21x3 coordinates at once:
+a low-pass whose cutoff rises with speed, so a resting hand stops jittering while a fast one
+barely lags. The same state gives a constant-velocity prediction, used for frames the scheduler
+skipped and for short detection dropouts.
+"""
+from dataclasses import replace
+from typing import Dict, List, Optional, Union
+import math
+import numpy as np
+from .config import FILTER
+from .tracking import FrameResult, HandObservation
+from .utils import now as current_time
+
+
+def _alpha(cutoff, dt: float):
+	# Smoothing factor of a first-order low-pass at `cutoff` Hz for a step of dt seconds
+	tau = 1.0 / (2.0 * math.pi * cutoff)
+	return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+	def __init__(self, min_cutoff: float = FILTER.min_cutoff, beta: float = FILTER.beta, d_cutoff: float = FILTER.d_cutoff):
+		self.min_cutoff = min_cutoff
+		self.beta = beta
+		self.d_cutoff = d_cutoff
+		self.x: Optional[np.ndarray] = None  # Last filtered value
+		self.dx: Optional[np.ndarray] = None  # Its filtered velocity, units per second
+		self.t = 0.0
+
+	def reset(self):
+		self.x = self.dx = None
+
+	def __call__(self, x: np.ndarray, t: float) -> np.ndarray:
+		"""Filtered copy of x (any shape, e.g. (21, 3)) observed at time t."""
+		x = np.asarray(x, dtype=np.float32)
+		if self.x is None or self.x.shape != x.shape:
+			self.x, self.dx, self.t = x.copy(), np.zeros_like(x), t
+			return x.copy()
+		dt = t - self.t
+		if dt <= 0.0:
+			return self.x.copy()
+		dx = (x - self.x) / dt
+		self.dx += _alpha(self.d_cutoff, dt) * (dx - self.dx)
+		a = _alpha(self.min_cutoff + self.beta * np.abs(self.dx), dt)
+		self.x += a * (x - self.x)
+		self.t = t
+		return self.x.copy()
+
+	def predict(self, t: float, max_ahead_s: float = FILTER.max_predict_s) -> Optional[np.ndarray]:
+		"""Constant-velocity extrapolation to t, at most max_ahead_s past the last sample."""
+		if self.x is None:
+			return None
+		return self.x + self.dx * min(max(t - self.t, 0.0), max_ahead_s)
+
+
+class LandmarkFilter:
+	"""One OneEuroFilter per hand (per track_id once tracks.TrackAssociator has run, else per
+	label), applied to a whole FrameResult.
+
+	- New detections are filtered.
+	- Frames repeated by a scheduler (reused=True) get predicted landmarks instead of the stale ones.
+	- A hand that vanishes is kept, predicted, for up to max_predict_s; after that its state is dropped.
+	"""
+
+	def __init__(self, max_predict_s: float = FILTER.max_predict_s, **params):
+		self.max_predict_s = max_predict_s
+		self.params = params  # min_cutoff / beta / d_cutoff for new OneEuroFilters
+		self._filters: Dict[Union[int, str], OneEuroFilter] = {}
+		self._hands: Dict[Union[int, str], HandObservation] = {}  # Last observation per key, for coasting
+		self.predicted = 0
+
+	def apply(self, frame_res: FrameResult, t: Optional[float] = None) -> FrameResult:
+		t = current_time() if t is None else t
+		hands: List[HandObservation] = []
+		seen = set()
+		for hand in frame_res.hands:
+			key = hand.track_id if hand.track_id >= 0 else hand.label
+			filt = self._filters.get(key)
+			if key in seen:
+				hands.append(hand)  # Two hands with one label: only the first has history
+				continue
+			seen.add(key)
+			self._hands[key] = hand
+			if filt is None:
+				filt = self._filters[key] = OneEuroFilter(**self.params)
+			if frame_res.reused and filt.x is not None:
+				hands.append(replace(hand, pts=filt.predict(t, self.max_predict_s), predicted=True))
+				self.predicted += 1
+			else:
+				hands.append(replace(hand, pts=filt(hand.pts, t)))
+		for key in list(self._filters):
+			if key in seen:
+				continue
+			filt = self._filters[key]
+			if filt.x is None or t - filt.t > self.max_predict_s:
+				del self._filters[key]
+				del self._hands[key]
+				continue
+			# Detection dropout: coast on the last motion rather than losing the hand for a frame
+			last = self._hands[key]
+			hands.append(HandObservation(pts=filt.predict(t, self.max_predict_s), label=last.label, predicted=True, track_id=last.track_id))
+			self.predicted += 1
+		return replace(frame_res, hands=hands)
+
+	def reset(self):
+		self._filters.clear()
+		self._hands.clear()
+
+
+def filter_sequence(pts: np.ndarray, t: np.ndarray, **params) -> np.ndarray:
+	"""Run one OneEuroFilter over a (K, 21, 3) track sampled at times t, e.g. a recorded hand."""
+	filt = OneEuroFilter(**params)
+	out = np.empty_like(pts, dtype=np.float32)
+	for k in range(len(pts)):
+		out[k] = filt(pts[k], float(t[k]))
+	return out
@@ -0,0 +1,116 @@
+"""Preallocated frame buffers that capture decodes into and every later stage views.
+
+A FrameRing owns `slots` HxWx3 uint8 buffers, optionally in multiprocessing.shared_memory so
+worker processes can map the same frames. Slots are reference counted: capture acquire()s a
+free one, cap.read(image=...) writes straight into it, and it goes back to the ring when the
+last holder releases it (the render loop, a LatestSlot dropping it, or a pool worker finishing).
+"""
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+import threading
+import numpy as np
+from .config import FRAMES
+from .lazy import lazy_import
+
+cv2 = lazy_import("cv2")
+
+
+class FrameLease:
+	"""One reference to a ring slot; frame is a view, never a copy."""
+	__slots__ = ("ring", "index", "frame")
+
+	def __init__(self, ring: "FrameRing", index: int):
+		self.ring = ring
+		self.index = index
+		self.frame = ring.buffers[index]
+
+	def retain(self) -> "FrameLease":
+		self.ring.retain(self.index)
+		return self
+
+	def release(self):
+		self.ring.release(self.index)
+
+
+class FrameRing:
+	def __init__(self, shape: Tuple[int, int, int], slots: int = FRAMES.ring_slots, shared: bool = FRAMES.shared, name: Optional[str] = None):
+		"""name: attach to a ring another process created with shared=True (no reference counting there)."""
+		self.shape = tuple(shape)
+		self.slots = slots
+		self._owner = name is None
+		self._shm: Optional[shared_memory.SharedMemory] = None
+		if shared or name is not None:
+			if name is None:
+				self._shm = shared_memory.SharedMemory(create=True, size=int(np.prod(self.shape)) * slots)
+			else:
+				self._shm = shared_memory.SharedMemory(name=name)
+			self.buffers = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self._shm.buf)
+		else:
+			self.buffers = np.zeros((slots,) + self.shape, dtype=np.uint8)
+		self._refs: List[int] = [0] * slots
+		self._next = 0
+		self._lock = threading.Lock()
+		self.misses = 0  # acquire() calls that found every slot held
+
+	@property
+	def name(self) -> Optional[str]:
+		return self._shm.name if self._shm is not None else None
+
+	def acquire(self) -> Optional[FrameLease]:
+		"""Next free slot with one reference held, or None when every slot is in use."""
+		with self._lock:
+			for k in range(self.slots):
+				i = (self._next + k) % self.slots
+				if self._refs[i] == 0:
+					self._refs[i] = 1
+					self._next = (i + 1) % self.slots
+					return FrameLease(self, i)
+			self.misses += 1
+			return None
+
+	def retain(self, index: int):
+		with self._lock:
+			if self._refs[index] <= 0:
+				raise ValueError(f"slot {index} is not held")
+			self._refs[index] += 1
+
+	def release(self, index: int):
+		with self._lock:
+			if self._refs[index] <= 0:
+				raise ValueError(f"slot {index} released more often than acquired")
+			self._refs[index] -= 1
+
+	def free(self) -> int:
+		with self._lock:
+			return self._refs.count(0)
+
+	def close(self):
+		if self._shm is None:
+			return
+		del self.buffers
+		self._shm.close()
+		if self._owner:
+			self._shm.unlink()
+		self._shm = None
+
+
+def frame_shape(cap) -> Tuple[int, int, int]:
+	"""(h, w, 3) the capture reports it will deliver."""
+	return int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), 3
+
+
+def read_into(cap, ring: FrameRing) -> Tuple[bool, Optional[np.ndarray], Optional[FrameLease]]:
+	"""cap.read() straight into a ring slot. Falls back to a fresh array when the ring is full
+	or the capture delivers a different size than the slots (it then reallocates).
+	"""
+	lease = ring.acquire()
+	if lease is None:
+		ok, frame = cap.read()
+		return ok, frame, None
+	ok, frame = cap.read(image=lease.frame)
+	if not ok or frame is not lease.frame:
+		lease.release()
+		if frame is not None and frame is not lease.frame:
+			ring.misses += 1
+		return ok, frame, None
+	return ok, frame, lease
@@ -1,9 +1,8 @@
 from dataclasses import dataclass
-from typing import Optional, Tuple
-import time
+from typing import List, Optional, Tuple
 import numpy as np
 from .config import THRESHOLDS
-from .utils import distance, RingBuffer
+from .utils import RingBuffer, TrajectoryBuffer, now as current_time
 
 
 # MediaPipe Hands indices for convenience
@@ -24,32 +23,42 @@ THUMB_IP = 3
 class GestureResult:
 	name: str
 	confidence: float
-	is_hold: bool = False
-	hold_seconds: float = 0.0
+	onset_time: float = 0.0  # When the underlying pose/movement started, before stability gating
+	stable: bool = True  # False while the stability window disagrees; name is then "unknown"
 
 
 class TemporalState:
 	def __init__(self):
-		self.last_gesture: Optional[str] = None
-		self.last_change_time: float = time.time()
+		self.raw_label: Optional[str] = None
+		self.raw_since: float = 0.0
 		self.cooldown_until: float = 0.0
-		self.wrist_history = RingBuffer(size=8)
+		self.wrist_history = TrajectoryBuffer()
 		self.stability_buffer = RingBuffer(size=THRESHOLDS.stability_frames)
+		self.last_swipe: Optional[str] = None
+		self.last_swipe_time: float = 0.0
+
+	def reset(self):
+		"""Back to a fresh state, keeping the buffers (for reuse by another hand)."""
+		self.raw_label = None
+		self.raw_since = self.cooldown_until = self.last_swipe_time = 0.0
+		self.wrist_history.clear()
+		self.stability_buffer.clear()
+		self.last_swipe = None
 
 	def update_wrist(self, wrist_xy: Tuple[float, float]):
-		self.wrist_history.append((time.time(), wrist_xy))
+		self.wrist_history.append(current_time(), wrist_xy)
 
-	def check_swipe(self, width_px: int) -> Optional[str]:
-		hist = self.wrist_history.items()
-		if len(hist) < 2:
+	def check_swipe(self, width_px: int, height_px: int) -> Optional[Tuple[str, float, float]]:
+		"""(name, confidence, onset_time) while the wrist is mid-swipe, else None."""
+		t, xy = self.wrist_history.window(THRESHOLDS.swipe_window_s)
+		swipe = detect_swipe(t, xy * (width_px, height_px))
+		if swipe is None:
 			return None
-		# Compare earliest vs latest
-		t0, p0 = hist[0]
-		_, p1 = hist[-1]
-		dx = (p1[0] - p0[0]) * width_px
-		if abs(dx) >= THRESHOLDS.swipe_min_displacement_px:
-			return "swipe_right" if dx > 0 else "swipe_left"
-		return None
+		name = swipe[0]
+		if self.last_swipe == _OPPOSITE[name] and t[-1] - self.last_swipe_time < THRESHOLDS.swipe_refractory_s:
+			return None
+		self.last_swipe, self.last_swipe_time = name, t[-1]
+		return swipe
 
 	def stable_label(self, label: str) -> Optional[str]:
 		self.stability_buffer.append(label)
@@ -61,82 +70,181 @@ class TemporalState:
 		return None
 
 
-def _is_finger_extended(tip, pip, wrist) -> bool:
-	# Finger extended if tip is further from wrist than pip in Euclidean distance
-	return distance(tip, wrist) - distance(pip, wrist) > 0.02
+_OPPOSITE = {"swipe_right": "swipe_left", "swipe_left": "swipe_right", "swipe_up": "swipe_down", "swipe_down": "swipe_up"}
+SWIPE_CONFIDENCE = 0.95  # For a straight, one-way stroke; diagonal or back-and-forth motion lowers it
+VELOCITY_SPAN_S = 0.066  # Velocity is measured over this much time (two frames at 30 FPS), never per sample
 
 
-def _count_extended(pts: np.ndarray) -> int:
-	w = pts[WRIST]
-	ext = 0
-	if _is_finger_extended(pts[THUMB_TIP], pts[THUMB_IP], w):
-		ext += 1
-	if _is_finger_extended(pts[INDEX_TIP], pts[INDEX_PIP], w):
-		ext += 1
-	if _is_finger_extended(pts[MIDDLE_TIP], pts[MIDDLE_PIP], w):
-		ext += 1
-	if _is_finger_extended(pts[RING_TIP], pts[RING_PIP], w):
-		ext += 1
-	if _is_finger_extended(pts[PINKY_TIP], pts[PINKY_PIP], w):
-		ext += 1
-	return ext
+def _since(t: np.ndarray, end: int, span: float) -> int:
+	# Newest sample at least `span` seconds before sample `end` (or the oldest one)
+	return max(int(np.searchsorted(t, t[end] - span, side="right")) - 1, 0)
 
 
-def classify_static(pts: np.ndarray) -> Tuple[str, float]:
-	w = pts[WRIST]
-	thumb_ext = _is_finger_extended(pts[THUMB_TIP], pts[THUMB_IP], w)
-	index_ext = _is_finger_extended(pts[INDEX_TIP], pts[INDEX_PIP], w)
-	middle_ext = _is_finger_extended(pts[MIDDLE_TIP], pts[MIDDLE_PIP], w)
-	ring_ext = _is_finger_extended(pts[RING_TIP], pts[RING_PIP], w)
-	pinky_ext = _is_finger_extended(pts[PINKY_TIP], pts[PINKY_PIP], w)
+def detect_swipe(t: np.ndarray, xy_px: np.ndarray) -> Optional[Tuple[str, float, float]]:
+	"""Swipe from a wrist trajectory in pixels (oldest first) covering at most swipe_window_s.
+
+	Fires as soon as the wrist, still moving at swipe_min_speed_px_s along the dominant axis, has
+	covered swipe_min_displacement_px -- or half that for a flick that is still accelerating past
+	twice the minimum speed.
+	"""
+	if len(t) < 3:
+		return None
+	disp = xy_px[-1] - xy_px[0]
+	axis = 0 if abs(disp[0]) >= abs(disp[1]) else 1
+	d = disp[axis]
+	x = xy_px[:, axis]
+	last = len(t) - 1
+	k = _since(t, last, VELOCITY_SPAN_S)
+	if t[last] - t[k] <= 0.0:
+		return None
+	v = (x[last] - x[k]) / (t[last] - t[k])
+	if v * d <= 0.0 or abs(v) < THRESHOLDS.swipe_min_speed_px_s:
+		return None
+	if abs(d) < THRESHOLDS.swipe_min_displacement_px:
+		j = _since(t, k, VELOCITY_SPAN_S)
+		if t[k] - t[j] <= 0.0:
+			return None
+		v_before = (x[k] - x[j]) / (t[k] - t[j])
+		flick = abs(v) >= 2.0 * THRESHOLDS.swipe_min_speed_px_s and (v - v_before) * d >= 0.0
+		if not flick or abs(d) < 0.5 * THRESHOLDS.swipe_min_displacement_px:
+			return None
+	# Direction confidence: how much of the motion is along the axis, and how one-way it is
+	# (chord-based rather than path length, which jitter inflates more at higher frame rates)
+	dominance = abs(d) / float(np.hypot(*disp))
+	monotonic = abs(d) / max(float(x.max() - x.min()), 1e-6)
+	conf = SWIPE_CONFIDENCE * dominance * min(1.0, monotonic)
+	# Onset: start of the current run of samples already moving at half the minimum speed
+	seg_v = np.diff(x) / np.maximum(np.diff(t), 1e-6)
+	slow = np.flatnonzero(seg_v * np.sign(d) < 0.5 * THRESHOLDS.swipe_min_speed_px_s)
+	onset = float(t[slow[-1] + 1]) if len(slow) else float(t[0])
+	if axis == 0:
+		name = "swipe_right" if d > 0 else "swipe_left"
+	else:
+		name = "swipe_down" if d > 0 else "swipe_up"  # Image y grows downwards
+	return name, float(conf), onset
 
-	# Pinch: thumb tip close to index tip
-	pinch_dist = distance(pts[THUMB_TIP], pts[INDEX_TIP])
-	if pinch_dist <= THRESHOLDS.pinch_distance_threshold:
-		return "pinch", 0.95
 
-	extended = sum([thumb_ext, index_ext, middle_ext, ring_ext, pinky_ext])
+# Finger order for every (N, 5) feature array: thumb, index, middle, ring, pinky
+FINGER_TIPS = [THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP]
+FINGER_PIPS = [THUMB_IP, INDEX_PIP, MIDDLE_PIP, RING_PIP, PINKY_PIP]
+EXTENDED_MARGIN = 0.02
 
-	# Fist: none extended
-	if extended == 0:
-		return "fist", 0.95
+# All distances the rules need, as (from, to) landmark pairs: 5 tips, 5 PIPs, then the pinch
+_PAIR_FROM = np.array(FINGER_TIPS + FINGER_PIPS + [THUMB_TIP])
+_PAIR_TO = np.array([WRIST] * 10 + [INDEX_TIP])
+_FINGER_BITS = np.array([1, 2, 4, 8, 16])
+
+STATIC_LABELS = np.array(["pinch", "fist", "open_palm", "two_fingers", "thumbs_up", "thumbs_down", "point_up", "point_down", "unknown"])
+STATIC_CONFIDENCES = np.array([0.95, 0.95, 0.95, 0.9, 0.9, 0.9, 0.85, 0.85, 0.3])
 
-	# Open palm: all extended
+
+def _rule(thumb: bool, index: bool, middle: bool, ring: bool, pinky: bool, thumb_up: bool, index_up: bool) -> str:
+	# The non-pinch part of the rule chain, evaluated once per finger combination at import
+	extended = sum([thumb, index, middle, ring, pinky])
+	if extended == 0:
+		return "fist"
 	if extended == 5:
-		return "open_palm", 0.95
+		return "open_palm"
+	if index and middle and not ring and not pinky and not thumb:
+		return "two_fingers"
+	if thumb and not index and not middle and not ring and not pinky:
+		return "thumbs_up" if thumb_up else "thumbs_down"
+	if index and not middle and not ring and not pinky:
+		return "point_up" if index_up else "point_down"
+	return "unknown"
 
-	# Two fingers (index + middle)
-	if index_ext and middle_ext and not ring_ext and not pinky_ext and not thumb_ext:
-		return "two_fingers", 0.9
 
-	# Thumbs up / down based on thumb extended and its y relative to wrist
-	if thumb_ext and not index_ext and not middle_ext and not ring_ext and not pinky_ext:
-		if pts[THUMB_TIP][1] < w[1]:
-			return "thumbs_up", 0.9
-		else:
-			return "thumbs_down", 0.9
+def _build_rule_table() -> np.ndarray:
+	labels = STATIC_LABELS.tolist()
+	table = np.empty((32, 2, 2), dtype=np.intp)
+	for mask in range(32):
+		fingers = [bool(mask & bit) for bit in _FINGER_BITS.tolist()]
+		for tu in (0, 1):
+			for iu in (0, 1):
+				table[mask, tu, iu] = labels.index(_rule(*fingers, bool(tu), bool(iu)))
+	return table
+
+
+# (extended finger bitmask, thumb above wrist, index above wrist) -> label index
+_RULE_TABLE = _build_rule_table()
+_LABELS = STATIC_LABELS.tolist()
+_CONFS = STATIC_CONFIDENCES.tolist()
 
-	# Point up / down: only index extended
-	if index_ext and not middle_ext and not ring_ext and not pinky_ext:
-		if pts[INDEX_TIP][1] < w[1]:
-			return "point_up", 0.85
-		else:
-			return "point_down", 0.85
 
-	# Default unknown
-	return "unknown", 0.3
+@dataclass
+class HandFeatures:
+	extended: np.ndarray  # (N, 5) bool, finger tip further from wrist than its PIP/IP joint
+	pinch_dist: np.ndarray  # (N,) thumb tip to index tip
+	thumb_above_wrist: np.ndarray  # (N,) bool, image y grows downwards
+	index_above_wrist: np.ndarray  # (N,) bool
+
+
+def hand_features(pts: np.ndarray) -> HandFeatures:
+	"""Every distance and orientation test used by the rules, for (21,3) or stacked (N,21,3) landmarks."""
+	batch = np.asarray(pts)
+	if batch.ndim == 2:
+		batch = batch[None]
+	# One gather + one reduction for all 11 distances; margin test in float64 like utils.distance
+	d = batch[:, _PAIR_FROM, :] - batch[:, _PAIR_TO, :]
+	dist = np.sqrt(np.einsum("nij,nij->ni", d, d)).astype(np.float64)
+	y = batch[:, :, 1]
+	return HandFeatures(
+		extended=(dist[:, :5] - dist[:, 5:10]) > EXTENDED_MARGIN,
+		pinch_dist=dist[:, 10],
+		thumb_above_wrist=y[:, THUMB_TIP] < y[:, WRIST],
+		index_above_wrist=y[:, INDEX_TIP] < y[:, WRIST],
+	)
+
+
+def classify_features(f: HandFeatures) -> np.ndarray:
+	"""Index into STATIC_LABELS / STATIC_CONFIDENCES for each hand."""
+	mask = f.extended @ _FINGER_BITS
+	idx = _RULE_TABLE[mask, f.thumb_above_wrist.astype(np.intp), f.index_above_wrist.astype(np.intp)]
+	# Pinch wins over every finger combination
+	return np.where(f.pinch_dist <= THRESHOLDS.pinch_distance_threshold, 0, idx)
+
+
+def classify_batch(pts: np.ndarray) -> List[Tuple[str, float]]:
+	"""classify_static over a stacked (N,21,3) array (both hands, or a whole dataset) in one pass."""
+	idx = classify_features(hand_features(pts)).tolist()
+	return [(_LABELS[i], _CONFS[i]) for i in idx]
+
+
+def classify_static(pts: np.ndarray) -> Tuple[str, float]:
+	return classify_batch(pts)[0]
+
+
+class RuleBackend:
+	"""Static-pose backend interface: classify((N,21,3)) -> [(name, confidence)] per hand.
+
+	This one is the hand-written rule chain with fixed confidences, and the default.
+	See learned.py for the trained alternative.
+	"""
+	name = "rules"
+
+	def classify(self, pts: np.ndarray) -> List[Tuple[str, float]]:
+		return classify_batch(pts)
+
+
+RULES = RuleBackend()
 
 
 class GestureClassifier:
-	def __init__(self):
+	def __init__(self, backend=None):
 		self.state = TemporalState()
+		self.backend = backend or RULES  # Used when infer() isn't handed a precomputed static pose
 
-	def infer(self, pts: np.ndarray, frame_size: Tuple[int, int]) -> GestureResult:
+	def infer(self, pts: np.ndarray, frame_size: Tuple[int, int], static: Optional[Tuple[str, float]] = None) -> GestureResult:
+		"""static: precomputed (name, confidence), e.g. from one backend.classify call over all hands."""
 		width_px, height_px = frame_size
 		wrist_xy = (pts[WRIST][0], pts[WRIST][1])
 		self.state.update_wrist(wrist_xy)
 
-		name, conf = classify_static(pts)
+		name, conf = static if static is not None else self.backend.classify(pts[None])[0]
+		if name != self.state.raw_label:
+			self.state.raw_label = name
+			self.state.raw_since = current_time()
+		onset = self.state.raw_since
 
 		# Require stability
 		stable = self.state.stable_label(name)
@@ -144,24 +252,12 @@ class GestureClassifier:
 			name = stable
 		else:
 			# Not stable yet; emit low confidence unknown to avoid flapping
-			return GestureResult(name="unknown", confidence=0.0, is_hold=False, hold_seconds=0.0)
+			return GestureResult(name="unknown", confidence=0.0, stable=False)
 
 		# Temporal swipes override for strong movement
-		swipe = self.state.check_swipe(width_px)
+		swipe = self.state.check_swipe(width_px, height_px)
 		if swipe is not None and name in ("open_palm", "two_fingers", "unknown"):
-			name = swipe
-			conf = 0.9
-
-		# Hold detection
-		now = time.time()
-		is_hold = False
-		hold_seconds = 0.0
-		if name == self.state.last_gesture:
-			hold_seconds = now - self.state.last_change_time
-			if hold_seconds >= THRESHOLDS.hold_min_duration_s:
-				is_hold = True
-		else:
-			self.state.last_gesture = name
-			self.state.last_change_time = now
+			name, conf, onset = swipe
 
-		return GestureResult(name=name, confidence=conf, is_hold=is_hold, hold_seconds=hold_seconds)
+		# Holds are timed by the controller's SequenceEngine, across both hands
+		return GestureResult(name=name, confidence=conf, onset_time=onset)
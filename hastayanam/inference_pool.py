@@ -0,0 +1,284 @@
+"""Multi-process hand tracking: N workers, each with its own HandTracker, fed through shared memory.
+
+Frames live in a shared-memory FrameRing; only (stream, frame_id, slot) crosses the process
+boundary, and only landmarks come back. Frames that capture already read into the pool's ring
+are submitted without any copy; others are copied into a free slot once.
+Results are released per stream in frame_id order. A frame the tracker fails on still gets an
+(empty) answer carrying the error, which the pool counts; a worker that exits makes submit()
+and results() raise WorkerError instead of waiting for answers that can't come.
+
+Usage (throughput check): python -m hastayanam.inference_pool --cameras 0 1 --workers 4 --seconds 20
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import argparse
+import multiprocessing as mp
+import queue
+import threading
+import time
+import numpy as np
+from .config import FRAMES, POOL, TRACKING, VIDEO
+from .frames import FrameLease, FrameRing
+from .tracking import FrameResult, HandObservation
+
+
+@dataclass
+class _Job:
+	stream: int
+	frame_id: int
+	slot: int
+	height: int
+	width: int
+
+
+class WorkerError(RuntimeError):
+	"""A tracking worker process exited while the pool was running."""
+
+
+def _worker_main(shm_name: str, slot_shape: Tuple[int, int, int], slots: int, jobs, results, max_hands: int):
+	# Imported here so only worker processes pay for the model
+	from .tracking import HandTracker
+
+	ring = FrameRing(slot_shape, slots, name=shm_name)
+	try:
+		tracker = HandTracker(max_hands=max_hands)
+		tracker.warmup(slot_shape[1], slot_shape[0])
+	except Exception as exc:
+		# Slot -1: not a frame, just the reason this worker is about to exit
+		results.put((-1, -1, -1, 0, 0, [], 0.0, f"{type(exc).__name__}: {exc}"))
+		ring.close()
+		raise
+	try:
+		while True:
+			job = jobs.get()
+			if job is None:
+				break
+			t0 = time.perf_counter()
+			hands: List[Tuple[str, np.ndarray]] = []
+			error = ""
+			try:
+				res = tracker.process(ring.buffers[job.slot, :job.height, :job.width])
+				hands = [(hand.label, hand.pts) for hand in res.hands]
+			except Exception as exc:
+				# Still answer, or the reorder buffer would wait for this frame forever
+				error = f"{type(exc).__name__}: {exc}"
+			results.put((job.stream, job.frame_id, job.slot, job.width, job.height, hands, time.perf_counter() - t0, error))
+	finally:
+		ring.close()
+
+
+class InferencePool:
+	def __init__(self, workers: int = POOL.workers, frame_shape: Tuple[int, int, int] = (VIDEO.height, VIDEO.width, 3), slots: Optional[int] = None, affinity: bool = POOL.stream_affinity, max_hands: int = TRACKING.max_num_hands):
+		"""affinity: send each stream to a fixed worker so MediaPipe's frame-to-frame tracking
+		stays coherent (best with one worker per camera). Otherwise frames go to any idle worker.
+		The default slot count also leaves FRAMES.ring_slots for capture to read into (see ring).
+		max_hands is passed to the workers explicitly: spawned processes don't see config changes.
+		"""
+		self.workers = workers
+		self.frame_shape = frame_shape
+		self.slots = slots or workers * POOL.slots_per_worker + FRAMES.ring_slots
+		self.affinity = affinity
+		self.dropped = 0
+		self.errors = 0  # Frames a worker failed on (answered with no hands)
+		self.last_error = ""
+		self.infer_s: Deque[float] = deque(maxlen=1000)  # Recent per-frame worker inference times
+		ctx = mp.get_context("spawn")
+		self.ring = FrameRing(frame_shape, self.slots, shared=True)
+		self._busy = [0] * workers
+		self._slot_worker: Dict[int, int] = {}
+		self._next_id: Dict[int, int] = {}
+		self._next_out: Dict[int, int] = {}
+		self._pending: Dict[int, Dict[int, FrameResult]] = {}
+		self._closing = False
+		self._results = ctx.Queue()
+		self._jobs = [ctx.Queue() for _ in range(workers)]
+		self._procs = [
+			ctx.Process(target=_worker_main, args=(self.ring.name, frame_shape, self.slots, self._jobs[i], self._results, max_hands), daemon=True)
+			for i in range(workers)
+		]
+		for p in self._procs:
+			p.start()
+
+	def check_workers(self):
+		"""Raise WorkerError if a worker has exited; its frames would never be answered."""
+		if self._closing:
+			return
+		for i, p in enumerate(self._procs):
+			if p.exitcode is not None:
+				self._drain(block=False, check=False)  # Pick up the reason it sent, if any
+				reason = f": {self.last_error}" if self.last_error else ""
+				raise WorkerError(f"tracking worker {i} exited with code {p.exitcode}{reason}")
+
+	def _pick_worker(self, stream: int) -> int:
+		if self.affinity:
+			return stream % self.workers
+		return min(range(self.workers), key=self._busy.__getitem__)
+
+	def submit(self, frame, stream: int = 0, lease: Optional[FrameLease] = None) -> Optional[int]:
+		"""Queue a frame. Returns its frame_id, or None if the worker or every slot is busy.
+
+		With a lease on this pool's ring the worker reads that slot directly (the pool holds its own
+		reference until the result is back); anything else is copied into a free slot.
+		"""
+		if frame.shape[0] > self.frame_shape[0] or frame.shape[1] > self.frame_shape[1]:
+			raise ValueError(f"frame {frame.shape} larger than pool slots {self.frame_shape}")
+		self._drain(block=False)
+		worker = self._pick_worker(stream)
+		if self._busy[worker] >= POOL.slots_per_worker:
+			self.dropped += 1
+			return None
+		h, w = frame.shape[:2]
+		if lease is not None and lease.ring is self.ring:
+			slot = lease.retain().index
+		else:
+			own = self.ring.acquire()
+			if own is None:
+				self.dropped += 1
+				return None
+			slot = own.index
+			np.copyto(self.ring.buffers[slot, :h, :w], frame)
+		frame_id = self._next_id.get(stream, 0)
+		self._next_id[stream] = frame_id + 1
+		self._busy[worker] += 1
+		self._slot_worker[slot] = worker
+		self._jobs[worker].put(_Job(stream, frame_id, slot, h, w))
+		return frame_id
+
+	def _drain(self, block: bool, timeout: Optional[float] = None, check: bool = True):
+		if check:
+			self.check_workers()
+		while True:
+			try:
+				msg = self._results.get(block, timeout)
+			except queue.Empty:
+				return
+			stream, frame_id, slot, w, h, hands, infer_s, error = msg
+			if error:
+				if not self.errors:
+					print(f"warning: tracking worker failed: {error}")
+				self.errors += 1
+				self.last_error = error
+			if slot < 0:
+				continue
+			self.ring.release(slot)
+			self._busy[self._slot_worker.pop(slot)] -= 1
+			self.infer_s.append(infer_s)
+			out = FrameResult(result=None, width=w, height=h, hands=[HandObservation(pts=pts, label=label) for label, pts in hands])
+			self._pending.setdefault(stream, {})[frame_id] = out
+			block = False
+
+	def results(self, timeout: Optional[float] = None) -> List[Tuple[int, int, FrameResult]]:
+		"""(stream, frame_id, FrameResult) that are ready, in frame_id order per stream."""
+		self._drain(block=timeout is not None and timeout > 0, timeout=timeout)
+		out = []
+		for stream, pending in self._pending.items():
+			nxt = self._next_out.get(stream, 0)
+			while nxt in pending:
+				out.append((stream, nxt, pending.pop(nxt)))
+				nxt += 1
+			self._next_out[stream] = nxt
+		return out
+
+	def in_flight(self) -> int:
+		return sum(self._busy)
+
+	def close(self):
+		self._closing = True
+		for q in self._jobs:
+			q.put(None)
+		for p in self._procs:
+			p.join(timeout=2.0)
+			if p.is_alive():
+				p.terminate()
+		self.ring.close()
+
+
+class PoolStage(threading.Thread):
+	"""Drop-in for LatestSlot + InferenceThread: CaptureThread put()s packets straight into the pool,
+	and this thread hands ordered results to fn(packet, frame_res) and on to the render slot.
+	"""
+
+	def __init__(self, pool: InferencePool, fn: Callable[[Any, FrameResult], Any], out, timer, stop: threading.Event):
+		super().__init__(name="pool-results", daemon=True)
+		self.pool = pool
+		self.fn = fn
+		self.out = out
+		self.timer = timer
+		self.stop = stop
+		self._lock = threading.Lock()
+		self._packets: Dict[int, Any] = {}
+
+	def _failed(self, exc: WorkerError):
+		# Stop the app rather than drop every frame while waiting on a dead worker
+		print(f"error: {exc}")
+		self.stop.set()
+
+	def put(self, packet):
+		with self._lock:
+			self.timer.record("frame_age", time.perf_counter() - packet.t_capture)
+			try:
+				frame_id = self.pool.submit(packet.frame, lease=packet.lease)
+			except WorkerError as exc:
+				self._failed(exc)
+				frame_id = None
+			if frame_id is None:
+				packet.release()
+			else:
+				self._packets[frame_id] = packet
+
+	def run(self):
+		while not self.stop.is_set():
+			with self._lock:
+				try:
+					ready = self.pool.results()
+				except WorkerError as exc:
+					self._failed(exc)
+					return
+			if not ready:
+				time.sleep(0.001)
+				continue
+			for _, frame_id, frame_res in ready:
+				packet = self._packets.pop(frame_id)
+				t0 = time.perf_counter()
+				packet.payload = self.fn(packet, frame_res)
+				self.timer.record("worker", time.perf_counter() - t0)
+				self.out.put(packet)
+
+
+def main():
+	from .tracking import open_camera
+
+	parser = argparse.ArgumentParser(description="Multi-camera / multi-worker tracking throughput")
+	parser.add_argument("--cameras", type=int, nargs="+", default=[VIDEO.camera_index])
+	parser.add_argument("--workers", type=int, default=POOL.workers)
+	parser.add_argument("--seconds", type=float, default=20.0)
+	args = parser.parse_args()
+
+	caps = [open_camera(index) for index in args.cameras]
+	pool = InferencePool(workers=args.workers, affinity=len(caps) > 1)
+	done = {i: 0 for i in range(len(caps))}
+	hands = {i: 0 for i in range(len(caps))}
+	start = time.perf_counter()
+	try:
+		while time.perf_counter() - start < args.seconds:
+			for stream, cap in enumerate(caps):
+				ok, frame = cap.read()
+				if ok:
+					pool.submit(frame, stream)
+			for stream, _, frame_res in pool.results():
+				done[stream] += 1
+				hands[stream] += len(frame_res.hands)
+	finally:
+		elapsed = time.perf_counter() - start
+		pool.close()
+		for cap in caps:
+			cap.release()
+	for stream, index in enumerate(args.cameras):
+		print(f"camera {index}: {done[stream] / elapsed:6.1f} fps processed, {hands[stream]} hands")
+	if pool.infer_s:
+		print(f"dropped: {pool.dropped}  median worker inference: {np.median(pool.infer_s) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+	main()
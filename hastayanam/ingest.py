@@ -0,0 +1,225 @@
+"""Batch-convert recorded videos into .hlm landmark recordings on a process pool.
+
+Each worker process owns one HandTracker and takes whole videos, longest first, so MediaPipe's
+frame-to-frame tracking stays coherent within a video and the pool isn't left waiting on one
+long file at the end. Frames are decoded into one preallocated buffer per worker, and the
+tracker converts them in place into its reused RGB buffer. Timestamps are video time
+(frame / fps), so recordings replay and tune like live ones.
+
+Output mirrors the input tree: videos/a/b.mp4 -> out/a/b.hlm. A video is written to b.hlm.part
+and renamed when done, and the part is flushed every INGEST.flush_frames frames. A rerun skips
+finished videos that are newer than their source, and continues part files after their last
+whole frame (the tracker re-detects hands there, as on a scene cut).
+
+Usage:
+	python -m hastayanam.ingest videos/ out/ --workers 8
+	python -m hastayanam.ingest a.mp4 b.mp4 out/ --force
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import time
+import numpy as np
+from .config import INGEST, TRACKING
+from .lazy import lazy_import
+from .recording import LandmarkRecorder, complete_frames
+
+cv2 = lazy_import("cv2")
+
+
+@dataclass
+class IngestJob:
+	index: int
+	source: str
+	out: str
+	frames: int  # As the container reports it; only used for ordering and progress
+	fps: float
+
+
+@dataclass
+class IngestResult:
+	index: int
+	frames: int  # Processed in this run
+	resumed: int  # Already in the part file from an earlier run
+	hands: int
+	video_s: float
+	wall_s: float
+
+
+def find_videos(inputs: Sequence[str], extensions: str = INGEST.extensions) -> List[Tuple[str, str]]:
+	"""(path, path relative to its input) for every video file under the inputs."""
+	exts = tuple(e.strip().lower() for e in extensions.split(",") if e.strip())
+	found = []
+	for root in inputs:
+		if os.path.isfile(root):
+			found.append((root, os.path.basename(root)))
+			continue
+		if not os.path.isdir(root):
+			raise FileNotFoundError(f"no such video or directory: {root}")
+		for dirpath, dirnames, filenames in os.walk(root):
+			dirnames.sort()
+			for name in sorted(filenames):
+				if name.lower().endswith(exts):
+					path = os.path.join(dirpath, name)
+					found.append((path, os.path.relpath(path, root)))
+	return found
+
+
+def plan(inputs: Sequence[str], out_dir: str, force: bool = False) -> Tuple[List[IngestJob], List[str]]:
+	"""(jobs longest first, finished videos skipped)."""
+	jobs, skipped = [], []
+	for path, rel in find_videos(inputs):
+		out = os.path.join(out_dir, os.path.splitext(rel)[0] + ".hlm")
+		if not force and os.path.exists(out) and os.path.getmtime(out) >= os.path.getmtime(path):
+			skipped.append(path)
+			continue
+		cap = cv2.VideoCapture(path)
+		frames, fps = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), cap.get(cv2.CAP_PROP_FPS)
+		cap.release()
+		jobs.append(IngestJob(0, path, out, max(frames, 0), fps))
+	jobs.sort(key=lambda job: -job.frames)
+	for i, job in enumerate(jobs):
+		job.index = i
+	return jobs, skipped
+
+
+def ingest_video(job: IngestJob, tracker, progress=None, force: bool = False) -> IngestResult:
+	"""Run one video through `tracker` into job.out. progress, if given, gets (index, frames
+	done) now and then."""
+	t0 = time.perf_counter()
+	cap = cv2.VideoCapture(job.source)
+	if not cap.isOpened():
+		raise OSError(f"cannot decode video {job.source}")
+	width, height = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+	fps = cap.get(cv2.CAP_PROP_FPS) or job.fps
+	part = job.out + ".part"
+	os.makedirs(os.path.dirname(job.out) or ".", exist_ok=True)
+	resumed, size = complete_frames(part) if os.path.exists(part) and not force else (0, 0)
+	if size:
+		with open(part, "r+b") as fh:
+			fh.truncate(size)  # Drop a frame cut off mid-write
+		for _ in range(resumed):
+			# Decoding without inference is cheap next to the model
+			if not cap.grab():
+				break
+	tracker.reset()
+	frame = np.empty((height, width, 3), dtype=np.uint8)
+	k, hands = resumed, 0
+	next_report = time.perf_counter() + 1.0
+	try:
+		with LandmarkRecorder(part, width, height, append=size > 0) as recorder:
+			while True:
+				ok, image = cap.read(frame)
+				if not ok:
+					break
+				frame = image  # Same buffer unless the stream changed size
+				frame_res = tracker.process(image)
+				recorder.write(k / fps if fps > 0 else cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0, frame_res)
+				hands += len(frame_res.hands)
+				k += 1
+				if recorder.frames % INGEST.flush_frames == 0:
+					recorder.flush()
+				if progress is not None and time.perf_counter() >= next_report:
+					progress.put((job.index, k))
+					next_report = time.perf_counter() + 1.0
+	finally:
+		cap.release()
+	os.replace(part, job.out)
+	if progress is not None:
+		progress.put((job.index, k))
+	return IngestResult(job.index, k - resumed, resumed, hands, (k - resumed) / fps if fps > 0 else 0.0, time.perf_counter() - t0)
+
+
+_WORKER: Dict[str, object] = {}
+
+
+def _init_worker(progress, max_hands: int, force: bool):
+	# Imported here so only worker processes pay for the model
+	from .tracking import HandTracker
+
+	cv2.setNumThreads(INGEST.decode_threads)
+	_WORKER["tracker"] = HandTracker(max_hands=max_hands)
+	_WORKER["progress"] = progress
+	_WORKER["force"] = force
+
+
+def _ingest_in_worker(job: IngestJob) -> IngestResult:
+	return ingest_video(job, _WORKER["tracker"], _WORKER["progress"], _WORKER["force"])
+
+
+def _clock(seconds: float) -> str:
+	seconds = int(seconds)
+	return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def ingest(inputs: Sequence[str], out_dir: str, workers: Optional[int] = None, max_hands: int = TRACKING.max_num_hands, force: bool = False, interval_s: float = INGEST.progress_interval_s) -> Tuple[List[IngestResult], List[str]]:
+	"""Process every video under `inputs` into out_dir, printing progress every interval_s.
+	Returns the results and the videos that failed."""
+	jobs, skipped = plan(inputs, out_dir, force)
+	total = sum(job.frames for job in jobs)
+	workers = min(workers or os.cpu_count() or 1, max(len(jobs), 1))
+	print(f"{len(jobs)} videos ({total} frames) on {workers} workers; {len(skipped)} already done")
+	if not jobs:
+		return [], []
+	ctx = mp.get_context("spawn")
+	progress = ctx.Queue()
+	done_frames = [0] * len(jobs)
+	results: List[IngestResult] = []
+	failed: List[str] = []
+	start = time.perf_counter()
+	next_print = start + interval_s
+	with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(progress, max_hands, force)) as pool:
+		futures = {pool.submit(_ingest_in_worker, job): job for job in jobs}
+		pending = set(futures)
+		while pending:
+			finished, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+			try:
+				while True:
+					index, frames = progress.get_nowait()
+					done_frames[index] = max(done_frames[index], frames)
+			except queue.Empty:
+				pass
+			for future in finished:
+				job = futures[future]
+				try:
+					res = future.result()
+				except Exception as exc:
+					failed.append(job.source)
+					print(f"failed: {job.source}: {exc}")
+					continue
+				results.append(res)
+				done_frames[job.index] = max(done_frames[job.index], res.resumed + res.frames)
+				print(f"done: {job.source} -> {job.out} ({res.frames} frames, {res.hands} hands, {res.video_s / res.wall_s if res.wall_s else 0.0:.1f}x real time{f', resumed at frame {res.resumed}' if res.resumed else ''})")
+			now = time.perf_counter()
+			if now >= next_print and pending:
+				next_print = now + interval_s
+				frames = sum(done_frames)
+				rate = frames / (now - start)
+				eta = f", ETA {_clock((total - frames) / rate)}" if rate > 0 and total > frames else ""
+				print(f"{len(results) + len(failed)}/{len(jobs)} videos, {frames}/{total} frames, {rate:.0f} frames/s{eta}")
+	wall = time.perf_counter() - start
+	video_s = sum(res.video_s for res in results)
+	print(f"{len(results)} videos, {sum(res.frames for res in results)} frames in {_clock(wall)}: {video_s / wall if wall else 0.0:.1f}x real time; {len(failed)} failed")
+	return results, failed
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Extract hand landmarks from recorded videos into .hlm recordings")
+	parser.add_argument("inputs", nargs="+", help="Video files or directories (searched recursively)")
+	parser.add_argument("out_dir")
+	parser.add_argument("--workers", type=int, default=INGEST.workers or None, help="Processes, each with its own tracker (default: every core)")
+	parser.add_argument("--max-hands", type=int, default=TRACKING.max_num_hands)
+	parser.add_argument("--force", action="store_true", help="Redo finished videos and discard part files")
+	args = parser.parse_args()
+
+	_, failed = ingest(args.inputs, args.out_dir, args.workers, args.max_hands, args.force)
+	if failed:
+		raise SystemExit(1)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,282 @@
+"""Where actions send their keystrokes and system commands.
+
+The actions_* modules describe what to do in pyautogui key names (press("volumeup"),
+hotkey("ctrl", "tab")); a backend turns that into input events:
+- win32: SendInput with every key of a chord in one call; LockWorkStation for locking.
+- linux: pynput, on X11 (XTEST) or uinput per ACTIONS.linux_device.
+- pyautogui: the portable fallback; sleeps ACTIONS.pyautogui_pause_s after every call.
+- recording: keeps (time, op, args) in memory and never touches the desktop.
+
+get_backend() resolves ACTIONS.backend on first use; set_backend() swaps it (benchmarks, tests).
+"""
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Tuple, Union
+import os
+import subprocess
+import sys
+import threading
+from .config import ACTIONS
+from .lazy import lazy_import
+from .utils import now as current_time
+
+
+class InputBackend(ABC):
+	"""Backends implement press and hotkey; lock/hibernate/shutdown default to the OS tools."""
+	name = "base"
+
+	@abstractmethod
+	def press(self, key: str, presses: int = 1):
+		...
+
+	@abstractmethod
+	def hotkey(self, *keys: str):
+		...
+
+	def lock_screen(self):
+		_run_system("lock")
+
+	def hibernate(self):
+		_run_system("hibernate")
+
+	def shutdown(self):
+		_run_system("shutdown")
+
+
+_SYSTEM_COMMANDS = {
+	"win32": {
+		"hibernate": ["shutdown", "/h"],  # Requires hibernation enabled
+		"shutdown": ["shutdown", "/s", "/t", "0"],
+	},
+	"linux": {
+		"lock": ["loginctl", "lock-session"],
+		"hibernate": ["systemctl", "hibernate"],
+		"shutdown": ["systemctl", "poweroff"],
+	},
+}
+
+
+def _run_system(op: str):
+	if sys.platform == "win32" and op == "lock":
+		import ctypes
+		ctypes.windll.user32.LockWorkStation()
+		return
+	commands = _SYSTEM_COMMANDS.get("linux" if sys.platform.startswith("linux") else sys.platform, {})
+	if op not in commands:
+		raise NotImplementedError(f"{op} is not supported on {sys.platform}")
+	subprocess.run(commands[op], check=True)
+
+
+# Virtual-key codes for the key names the actions use (pyautogui's names)
+_VK = {
+	"backspace": 0x08, "tab": 0x09, "enter": 0x0D, "shift": 0x10, "ctrl": 0x11, "alt": 0x12,
+	"esc": 0x1B, "space": 0x20, "pageup": 0x21, "pagedown": 0x22, "end": 0x23, "home": 0x24,
+	"left": 0x25, "up": 0x26, "right": 0x27, "down": 0x28, "delete": 0x2E,
+	"winleft": 0x5B, "winright": 0x5C, "volumemute": 0xAD, "volumedown": 0xAE, "volumeup": 0xAF,
+	"nexttrack": 0xB0, "prevtrack": 0xB1, "playpause": 0xB3,
+	**{f"f{i}": 0x6F + i for i in range(1, 25)},
+}
+# Keys that need KEYEVENTF_EXTENDEDKEY, or SendInput delivers their numpad twins
+_VK_EXTENDED = {
+	0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28, 0x2E, 0x5B, 0x5C, 0xAD, 0xAE, 0xAF, 0xB0, 0xB1, 0xB3,
+}
+_KEYEVENTF_EXTENDEDKEY = 0x0001
+_KEYEVENTF_KEYUP = 0x0002
+_INPUT_KEYBOARD = 1
+
+
+def _vk(key: str) -> int:
+	key = key.lower()
+	if key in _VK:
+		return _VK[key]
+	if len(key) == 1 and key.isalnum():
+		return ord(key.upper())
+	raise ValueError(f"no virtual-key code for {key!r}")
+
+
+class Win32Backend(InputBackend):
+	"""SendInput directly: a chord or a run of presses is one call, with no sleeps."""
+
+	name = "win32"
+
+	def __init__(self):
+		import ctypes
+		from ctypes import wintypes
+
+		class KEYBDINPUT(ctypes.Structure):
+			_fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+				("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+		class MOUSEINPUT(ctypes.Structure):
+			_fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+				("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+		class _UNION(ctypes.Union):
+			# The mouse member sets the union's size, which SendInput checks against cbSize
+			_fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+
+		class INPUT(ctypes.Structure):
+			_fields_ = [("type", wintypes.DWORD), ("u", _UNION)]
+
+		self._ctypes = ctypes
+		self._INPUT = INPUT
+		self._user32 = ctypes.WinDLL("user32", use_last_error=True)
+		self._user32.SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+		self._user32.SendInput.restype = wintypes.UINT
+
+	def _send(self, events: Sequence[Tuple[int, bool]]):
+		inputs = (self._INPUT * len(events))()
+		for slot, (vk, up) in zip(inputs, events):
+			slot.type = _INPUT_KEYBOARD
+			slot.u.ki.wVk = vk
+			slot.u.ki.dwFlags = (_KEYEVENTF_KEYUP if up else 0) | (_KEYEVENTF_EXTENDEDKEY if vk in _VK_EXTENDED else 0)
+		sent = self._user32.SendInput(len(inputs), inputs, self._ctypes.sizeof(self._INPUT))
+		if sent != len(inputs):
+			# Blocked by UIPI (e.g. an elevated window has focus) or another input injector
+			raise OSError(self._ctypes.get_last_error(), f"SendInput delivered {sent} of {len(inputs)} events")
+
+	def press(self, key: str, presses: int = 1):
+		vk = _vk(key)
+		self._send([(vk, up) for _ in range(presses) for up in (False, True)])
+
+	def hotkey(self, *keys: str):
+		vks = [_vk(k) for k in keys]
+		self._send([(vk, False) for vk in vks] + [(vk, True) for vk in reversed(vks)])
+
+	def lock_screen(self):
+		if not self._user32.LockWorkStation():
+			raise OSError(self._ctypes.get_last_error(), "LockWorkStation failed")
+
+
+# pynput Key members for pyautogui names that differ
+_PYNPUT_KEYS = {
+	"winleft": "cmd", "winright": "cmd_r", "pageup": "page_up", "pagedown": "page_down",
+	"volumeup": "media_volume_up", "volumedown": "media_volume_down", "volumemute": "media_volume_mute",
+	"playpause": "media_play_pause", "nexttrack": "media_next", "prevtrack": "media_previous",
+}
+
+
+class LinuxBackend(InputBackend):
+	"""pynput keyboard controller; X11 through XTEST, or a uinput virtual keyboard."""
+
+	name = "linux"
+
+	def __init__(self, device: str = ACTIONS.linux_device):
+		# pynput picks its platform backend at import time from this variable
+		os.environ.setdefault("PYNPUT_BACKEND", device)
+		from pynput import keyboard
+
+		self._Key = keyboard.Key
+		self._kb = keyboard.Controller()
+
+	def _key(self, key: str):
+		key = key.lower()
+		if len(key) == 1:
+			return key
+		return getattr(self._Key, _PYNPUT_KEYS.get(key, key))
+
+	def press(self, key: str, presses: int = 1):
+		k = self._key(key)
+		for _ in range(presses):
+			self._kb.press(k)
+			self._kb.release(k)
+
+	def hotkey(self, *keys: str):
+		ks = [self._key(k) for k in keys]
+		for k in ks:
+			self._kb.press(k)
+		for k in reversed(ks):
+			self._kb.release(k)
+
+
+class PyAutoGuiBackend(InputBackend):
+	name = "pyautogui"
+
+	def __init__(self, pause_s: float = ACTIONS.pyautogui_pause_s):
+		self._pag = lazy_import("pyautogui")
+		self._pag.PAUSE = pause_s
+
+	def press(self, key: str, presses: int = 1):
+		self._pag.press(key, presses=presses)
+
+	def hotkey(self, *keys: str):
+		self._pag.hotkey(*keys)
+
+
+class RecordingBackend(InputBackend):
+	"""Records every call as (utils.now(), op, args); nothing reaches the desktop."""
+
+	name = "recording"
+
+	def __init__(self):
+		self.events: List[Tuple[float, str, Tuple]] = []
+		self._lock = threading.Lock()
+
+	def _record(self, op: str, *args):
+		with self._lock:
+			self.events.append((current_time(), op, args))
+
+	def press(self, key: str, presses: int = 1):
+		self._record("press", key, presses)
+
+	def hotkey(self, *keys: str):
+		self._record("hotkey", *keys)
+
+	def lock_screen(self):
+		self._record("lock")
+
+	def hibernate(self):
+		self._record("hibernate")
+
+	def shutdown(self):
+		self._record("shutdown")
+
+	def clear(self):
+		with self._lock:
+			self.events.clear()
+
+
+BACKENDS = {
+	"win32": Win32Backend,
+	"linux": LinuxBackend,
+	"pyautogui": PyAutoGuiBackend,
+	"recording": RecordingBackend,
+}
+
+
+def _auto() -> str:
+	if sys.platform == "win32":
+		return "win32"
+	if sys.platform.startswith("linux"):
+		return "linux"
+	return "pyautogui"
+
+
+_backend: Optional[InputBackend] = None
+_name: Optional[str] = None  # Set by set_backend(name); ACTIONS.backend otherwise
+_lock = threading.Lock()
+
+
+def make_backend(name: str = ACTIONS.backend) -> InputBackend:
+	name = _auto() if name == "auto" else name
+	if name not in BACKENDS:
+		raise ValueError(f"unknown action backend {name!r}; expected auto or one of {', '.join(BACKENDS)}")
+	return BACKENDS[name]()
+
+
+def get_backend() -> InputBackend:
+	"""The active backend, created on first use (and retried after a failed creation)."""
+	global _backend
+	if _backend is None:
+		with _lock:
+			if _backend is None:
+				_backend = make_backend(_name or ACTIONS.backend)
+	return _backend
+
+
+def set_backend(backend: Union[InputBackend, str, None] = None):
+	"""Install a backend instance, or a name that get_backend() creates on first use.
+	None goes back to ACTIONS.backend."""
+	global _backend, _name
+	with _lock:
+		_backend = backend if isinstance(backend, InputBackend) else None
+		_name = backend if isinstance(backend, str) else None
@@ -0,0 +1,66 @@
+"""Deferred imports for heavy or platform-specific dependencies.
+
+mediapipe, cv2 and pyautogui take from a few hundred ms to seconds to import, and pyautogui needs
+a display. Modules bind them with lazy_import() and only pay (or fail) on first attribute access,
+so recordings, tuning and the classifiers import anywhere.
+"""
+from typing import Dict
+import importlib
+import threading
+import time
+
+# Seconds each lazily bound module took to import, filled in on first use
+IMPORT_TIMES: Dict[str, float] = {}
+
+_lock = threading.RLock()
+
+
+class LazyModule:
+	"""Stands in for a module until one of its attributes is used.
+
+	After loading, the module's namespace is copied onto the proxy, so later lookups are plain
+	attribute hits rather than __getattr__ calls (hot paths call cv2 every frame).
+	"""
+
+	def __init__(self, name: str):
+		self.__dict__["_lazy_name"] = name
+		self.__dict__["_lazy_module"] = None
+
+	def _lazy_load(self):
+		with _lock:
+			module = self.__dict__["_lazy_module"]
+			if module is None:
+				name = self.__dict__["_lazy_name"]
+				t0 = time.perf_counter()
+				module = importlib.import_module(name)
+				IMPORT_TIMES[name] = time.perf_counter() - t0
+				self.__dict__.update(module.__dict__)
+				self.__dict__["_lazy_module"] = module
+			return module
+
+	def __getattr__(self, attr: str):
+		return getattr(self._lazy_load(), attr)
+
+	def __setattr__(self, attr: str, value):
+		setattr(self._lazy_load(), attr, value)
+		self.__dict__[attr] = value
+
+	def __dir__(self):
+		return dir(self._lazy_load())
+
+	def __repr__(self) -> str:
+		state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+		return f"<lazy module {self.__dict__['_lazy_name']!r} ({state})>"
+
+
+_proxies: Dict[str, LazyModule] = {}
+
+
+def lazy_import(name: str) -> LazyModule:
+	"""Proxy for module `name`, imported on first attribute access; one proxy per name."""
+	with _lock:
+		proxy = _proxies.get(name)
+		if proxy is None:
+			proxy = _proxies[name] = LazyModule(name)
+		return proxy
+
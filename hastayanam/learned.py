@@ -0,0 +1,273 @@
+"""Trained static-pose backend: a one-hidden-layer NumPy MLP over normalized landmarks.
+
+Features are translation-, scale- and rotation-normalized (wrist at the origin, wrist -> middle
+MCP as the unit "up" axis, mirrored so the thumb is always on the same side), plus the pairwise
+fingertip distances, and the palm axis and the thumb/index directions in image coordinates so
+up/down poses stay distinguishable.
+Confidences are softmax probabilities after temperature scaling fitted on held-out frames.
+
+Training data is the same labeled recordings tuning.py uses (session.hlm + session.labels.json).
+Frames inside a static-pose segment are labeled with it, frames outside every segment become
+"unknown", and frames in swipe segments are left out.
+
+Usage:
+	python -m hastayanam.learned train sessions/*.hlm --out gestures_mlp.npz
+	python -m hastayanam.learned eval gestures_mlp.npz sessions/*.hlm
+	python app.py --classifier-model gestures_mlp.npz
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+import argparse
+import numpy as np
+from .config import CLASSIFIER
+from .gestures import RULES, STATIC_LABELS, classify_batch
+
+FEATURE_VERSION = 2  # 2: added pairwise fingertip distances
+_PALM_AXIS = 9  # Middle finger MCP
+_THUMB_MCP = 2
+_THUMB_TIP = 4
+_INDEX_TIP = 8
+_TIPS = np.array([4, 8, 12, 16, 20]) - 1  # Into the wrist-relative landmarks 1..20
+_TIP_PAIRS = np.triu_indices(len(_TIPS), k=1)
+N_FEATURES = 60 + len(_TIP_PAIRS[0]) + 6
+
+
+def invariant_features(pts: np.ndarray) -> np.ndarray:
+	"""(N, N_FEATURES) features for (21, 3) or (N, 21, 3) landmarks."""
+	b = np.asarray(pts, dtype=np.float32)
+	if b.ndim == 2:
+		b = b[None]
+	n = len(b)
+	rel = b[:, 1:, :] - b[:, :1, :]  # Landmarks 1..20 relative to the wrist
+	axis = rel[:, _PALM_AXIS - 1, :2]
+	inv = 1.0 / (np.sqrt((axis * axis).sum(axis=1)) + 1e-6)
+	c, s = axis[:, 0] * inv, axis[:, 1] * inv
+	# One batched matmul rotates the palm axis onto image "up" (-y) and divides by its length
+	rot = np.empty((n, 2, 2), dtype=np.float32)
+	rot[:, 0, 0], rot[:, 0, 1] = -s * inv, -c * inv
+	rot[:, 1, 0], rot[:, 1, 1] = c * inv, -s * inv
+	out = np.empty((n, N_FEATURES), dtype=np.float32)
+	shape = out[:, :60].reshape(n, 20, 3)
+	shape[:, :, :2] = rel[:, :, :2] @ rot
+	shape[:, :, 2] = rel[:, :, 2] * inv[:, None]
+	# Left and right hands look the same after mirroring the thumb onto +x
+	shape[:, :, 0] *= np.sign(shape[:, _THUMB_MCP - 1, 0] + 1e-9)[:, None]
+	# Fingertip-to-fingertip distances in palm lengths (pinch, fingers together or spread)
+	tips = shape[:, _TIPS, :]
+	diff = tips[:, _TIP_PAIRS[0]] - tips[:, _TIP_PAIRS[1]]
+	out[:, 60:70] = np.sqrt((diff * diff).sum(axis=2))
+	# Orientation in the image: palm axis, thumb and index tip directions (unit = palm axis length)
+	out[:, 70:76].reshape(n, 3, 2)[:] = rel[:, [_PALM_AXIS - 1, _THUMB_TIP - 1, _INDEX_TIP - 1], :2] * inv[:, None, None]
+	return out
+
+
+def _softmax(z: np.ndarray) -> np.ndarray:
+	z = z - z.max(axis=1, keepdims=True)
+	e = np.exp(z)
+	return e / e.sum(axis=1, keepdims=True)
+
+
+@dataclass
+class MlpModel:
+	classes: np.ndarray  # (C,) str
+	mean: np.ndarray  # (D,) feature standardization
+	std: np.ndarray
+	w1: np.ndarray  # (D, H)
+	b1: np.ndarray
+	w2: np.ndarray  # (H, C)
+	b2: np.ndarray
+	temperature: float = 1.0
+
+	def logits(self, feats: np.ndarray) -> np.ndarray:
+		h = np.maximum(((feats - self.mean) / self.std) @ self.w1 + self.b1, 0.0)
+		return h @ self.w2 + self.b2
+
+	def predict_proba(self, feats: np.ndarray) -> np.ndarray:
+		return _softmax(self.logits(feats) / self.temperature)
+
+	def save(self, path: str):
+		np.savez(path, version=FEATURE_VERSION, classes=self.classes, mean=self.mean, std=self.std,
+			w1=self.w1, b1=self.b1, w2=self.w2, b2=self.b2, temperature=self.temperature)
+
+	@classmethod
+	def load(cls, path: str) -> "MlpModel":
+		with np.load(path) as z:
+			if int(z["version"]) != FEATURE_VERSION:
+				raise ValueError(f"{path}: feature version {int(z['version'])}, expected {FEATURE_VERSION}; retrain")
+			return cls(z["classes"].astype(str), z["mean"], z["std"], z["w1"], z["b1"], z["w2"], z["b2"], float(z["temperature"]))
+
+
+class MlpBackend:
+	"""Same interface as gestures.RuleBackend. Standardization and temperature are folded into
+	the weights at load, so classify() is the feature transform plus two small matmuls.
+	"""
+	name = "mlp"
+
+	def __init__(self, model: MlpModel):
+		self.model = model
+		self.classes = model.classes.tolist()
+		self._w1 = (model.w1 / model.std[:, None]).astype(np.float32)
+		self._b1 = (model.b1 - (model.mean / model.std) @ model.w1).astype(np.float32)
+		self._w2 = (model.w2 / model.temperature).astype(np.float32)
+		self._b2 = (model.b2 / model.temperature).astype(np.float32)
+
+	def proba(self, pts: np.ndarray) -> np.ndarray:
+		h = np.maximum(invariant_features(pts) @ self._w1 + self._b1, 0.0)
+		return _softmax(h @ self._w2 + self._b2)
+
+	def classify(self, pts: np.ndarray) -> List[Tuple[str, float]]:
+		p = self.proba(pts)
+		idx = p.argmax(axis=1)
+		return [(self.classes[i], float(conf)) for i, conf in zip(idx.tolist(), p[np.arange(len(p)), idx].tolist())]
+
+
+def load_backend(name: str = CLASSIFIER.backend, model_path: str = CLASSIFIER.model_path):
+	if name == "rules":
+		return RULES
+	if name == "mlp":
+		if not model_path:
+			raise ValueError("the mlp classifier needs CLASSIFIER.model_path (train one with python -m hastayanam.learned train)")
+		return MlpBackend(MlpModel.load(model_path))
+	raise ValueError(f"unknown classifier backend: {name}")
+
+
+def _fit_temperature(logits: np.ndarray, y: np.ndarray) -> float:
+	# Held-out NLL is smooth and one-dimensional in T; a log grid is plenty
+	best_t, best_nll = 1.0, np.inf
+	for t in np.geomspace(0.05, 20.0, 100):
+		p = _softmax(logits / t)
+		nll = -np.mean(np.log(p[np.arange(len(y)), y] + 1e-12))
+		if nll < best_nll:
+			best_t, best_nll = float(t), nll
+	return best_t
+
+
+def expected_calibration_error(conf: np.ndarray, correct: np.ndarray, bins: int = 15) -> float:
+	edges = np.linspace(0.0, 1.0, bins + 1)
+	which = np.clip(np.digitize(conf, edges) - 1, 0, bins - 1)
+	ece = 0.0
+	for k in range(bins):
+		m = which == k
+		if m.any():
+			ece += m.mean() * abs(conf[m].mean() - correct[m].mean())
+	return float(ece)
+
+
+def train(pts: np.ndarray, labels: Sequence[str], hidden: int = 32, epochs: int = 200, lr: float = 0.01,
+		l2: float = 1e-4, batch_size: int = 256, val_fraction: float = 0.2, seed: int = 0) -> Tuple[MlpModel, Dict[str, Any]]:
+	"""Fit on (N, 21, 3) landmarks with one label per hand. Returns the model and held-out metrics."""
+	rng = np.random.default_rng(seed)
+	classes, y = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+	X = invariant_features(pts)
+	order = rng.permutation(len(X))
+	n_val = max(1, int(len(X) * val_fraction))
+	val, tr = order[:n_val], order[n_val:]
+	mean = X[tr].mean(axis=0)
+	std = X[tr].std(axis=0) + 1e-6
+	Xs = ((X - mean) / std).astype(np.float32)
+
+	d, c = X.shape[1], len(classes)
+	params = {
+		"w1": rng.normal(0.0, np.sqrt(2.0 / d), size=(d, hidden)).astype(np.float32),
+		"b1": np.zeros(hidden, dtype=np.float32),
+		"w2": rng.normal(0.0, np.sqrt(1.0 / hidden), size=(hidden, c)).astype(np.float32),
+		"b2": np.zeros(c, dtype=np.float32),
+	}
+	m = {k: np.zeros_like(v) for k, v in params.items()}
+	v2 = {k: np.zeros_like(v) for k, v in params.items()}
+	# Balanced class weights so a long "unknown" tail doesn't swamp the poses
+	counts = np.bincount(y[tr], minlength=c).astype(np.float32)
+	class_w = (len(tr) / (c * np.maximum(counts, 1.0))).astype(np.float32)
+	step = 0
+	for _ in range(epochs):
+		shuffled = rng.permutation(tr)
+		for start in range(0, len(tr), batch_size):
+			idx = shuffled[start:start + batch_size]
+			xb, yb = Xs[idx], y[idx]
+			h_pre = xb @ params["w1"] + params["b1"]
+			h = np.maximum(h_pre, 0.0)
+			p = _softmax(h @ params["w2"] + params["b2"])
+			wb = class_w[yb][:, None]
+			g = p.copy()
+			g[np.arange(len(yb)), yb] -= 1.0
+			g *= wb / wb.sum()
+			grads = {"w2": h.T @ g + l2 * params["w2"], "b2": g.sum(axis=0)}
+			gh = (g @ params["w2"].T) * (h_pre > 0.0)
+			grads["w1"] = xb.T @ gh + l2 * params["w1"]
+			grads["b1"] = gh.sum(axis=0)
+			step += 1
+			for k in params:  # Adam
+				m[k] = 0.9 * m[k] + 0.1 * grads[k]
+				v2[k] = 0.999 * v2[k] + 0.001 * grads[k] ** 2
+				params[k] -= lr * (m[k] / (1 - 0.9 ** step)) / (np.sqrt(v2[k] / (1 - 0.999 ** step)) + 1e-8)
+
+	model = MlpModel(classes, mean.astype(np.float32), std.astype(np.float32), params["w1"], params["b1"], params["w2"], params["b2"])
+	model.temperature = _fit_temperature(model.logits(X[val]), y[val])
+	p = model.predict_proba(X[val])
+	pred, conf = p.argmax(axis=1), p.max(axis=1)
+	rules = np.array([name for name, _ in classify_batch(pts[val])])
+	report = {
+		"train": len(tr),
+		"val": len(val),
+		"val_accuracy": float((pred == y[val]).mean()),
+		"val_ece": expected_calibration_error(conf, pred == y[val]),
+		"rules_val_accuracy": float((rules == classes[y[val]]).mean()),
+		"temperature": model.temperature,
+	}
+	return model, report
+
+
+def labeled_hands(paths: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+	"""Every recorded hand with its per-frame label from the sessions' .labels.json sidecars."""
+	from .tuning import load_session
+
+	static = set(STATIC_LABELS.tolist())
+	pts: List[np.ndarray] = []
+	labels: List[str] = []
+	for path in paths:
+		session = load_session(path)
+		truth = np.full(len(session.t), "unknown", dtype=object)
+		for seg in session.segments:
+			lo, hi = np.searchsorted(session.t, [seg.start, seg.end])
+			truth[lo:hi] = seg.gesture
+		for stream in session.streams.values():
+			keep = np.array([truth[f] in static for f in stream.frames.tolist()], dtype=bool)
+			pts.append(stream.pts[keep])
+			labels.extend(truth[stream.frames[keep]].tolist())
+	return (np.concatenate(pts) if pts else np.zeros((0, 21, 3), np.float32)), labels
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Train or evaluate the MLP static-pose classifier")
+	sub = parser.add_subparsers(dest="cmd", required=True)
+	tr = sub.add_parser("train")
+	tr.add_argument("recordings", nargs="+")
+	tr.add_argument("--out", required=True)
+	tr.add_argument("--hidden", type=int, default=32)
+	tr.add_argument("--epochs", type=int, default=200)
+	tr.add_argument("--seed", type=int, default=0)
+	ev = sub.add_parser("eval")
+	ev.add_argument("model")
+	ev.add_argument("recordings", nargs="+")
+	args = parser.parse_args()
+
+	pts, labels = labeled_hands(args.recordings)
+	print(f"{len(labels)} labeled hands, classes: {sorted(set(labels))}")
+	if args.cmd == "train":
+		model, report = train(pts, labels, hidden=args.hidden, epochs=args.epochs, seed=args.seed)
+		model.save(args.out)
+		for key, value in report.items():
+			print(f"{key:>18}: {value}" if isinstance(value, int) else f"{key:>18}: {value:.4f}")
+		return
+	backend = MlpBackend(MlpModel.load(args.model))
+	out = backend.classify(pts)
+	truth = np.asarray(labels)
+	pred = np.array([name for name, _ in out])
+	conf = np.array([c for _, c in out])
+	rules = np.array([name for name, _ in classify_batch(pts)])
+	print(f"      mlp accuracy: {(pred == truth).mean():.4f}  ECE {expected_calibration_error(conf, pred == truth):.4f}")
+	print(f"    rules accuracy: {(rules == truth).mean():.4f}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,179 @@
+"""Per-stage timing with rolling p50/p95/p99, shared by every thread through PROFILER."""
+from contextlib import contextmanager
+from typing import Dict, Optional
+import csv
+import json
+import os
+import threading
+import time
+import numpy as np
+from .config import METRICS
+
+# Display order for reports; stages recorded under other names are appended after these
+STAGES = (
+	"capture", "frame_age", "convert", "inference", "normalize", "worker", "filter", "classify", "sequences", "dispatch",
+	"action", "hud", "display", "render", "latency", "gesture_to_action",
+)
+
+
+class RollingWindow:
+	"""Fixed-size ring of the most recent samples, preallocated."""
+
+	def __init__(self, size: int):
+		self._buf = np.zeros(size, dtype=np.float64)
+		self._i = 0
+		self.count = 0
+		self.last = 0.0
+
+	def add(self, value: float):
+		self._buf[self._i] = value
+		self._i = (self._i + 1) % len(self._buf)
+		self.count += 1
+		self.last = value
+
+	def values(self) -> np.ndarray:
+		return self._buf[:min(self.count, len(self._buf))]
+
+
+class _StageTimer:
+	__slots__ = ("profiler", "name", "t0")
+
+	def __init__(self, profiler: "Profiler", name: str):
+		self.profiler = profiler
+		self.name = name
+
+	def __enter__(self):
+		self.t0 = time.perf_counter_ns()
+		return self
+
+	def __exit__(self, *exc):
+		self.profiler.record_ns(self.name, time.perf_counter_ns() - self.t0)
+
+
+class _NullTimer:
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Profiler:
+	def __init__(self, window: int = METRICS.window, enabled: bool = METRICS.enabled):
+		self.window = window
+		self.enabled = enabled
+		self._stages: Dict[str, RollingWindow] = {}
+		self._lock = threading.Lock()
+
+	def stage(self, name: str):
+		"""with PROFILER.stage("inference"): ... -- times the block on a monotonic ns clock."""
+		return _StageTimer(self, name) if self.enabled else _NULL_TIMER
+
+	def record(self, name: str, seconds: float):
+		if not self.enabled:
+			return
+		with self._lock:
+			win = self._stages.get(name)
+			if win is None:
+				win = self._stages[name] = RollingWindow(self.window)
+			win.add(seconds * 1000.0)
+
+	def record_ns(self, name: str, ns: int):
+		self.record(name, ns * 1e-9)
+
+	def snapshot(self) -> Dict[str, float]:
+		"""Median milliseconds per stage."""
+		with self._lock:
+			return {name: float(np.median(win.values())) for name, win in self._stages.items() if win.count}
+
+	def report(self) -> Dict[str, Dict[str, float]]:
+		"""{stage: {count, last, p50, p95, p99}} in milliseconds, in STAGES order."""
+		with self._lock:
+			items = [(name, win.values().copy(), win.count, win.last) for name, win in self._stages.items() if win.count]
+		order = {name: i for i, name in enumerate(STAGES)}
+		items.sort(key=lambda item: order.get(item[0], len(order)))
+		out = {}
+		for name, values, count, last in items:
+			p50, p95, p99 = np.percentile(values, [50, 95, 99])
+			out[name] = {"count": count, "last": last, "p50": float(p50), "p95": float(p95), "p99": float(p99)}
+		return out
+
+	def dump(self, path: str):
+		"""Write report() as JSON, or as CSV when the path ends in .csv."""
+		rep = self.report()
+		tmp = path + ".tmp"
+		with open(tmp, "w", encoding="utf-8", newline="") as fh:
+			if path.endswith(".csv"):
+				writer = csv.writer(fh)
+				writer.writerow(["stage", "count", "last_ms", "p50_ms", "p95_ms", "p99_ms"])
+				for name, r in rep.items():
+					writer.writerow([name, r["count"], f"{r['last']:.3f}", f"{r['p50']:.3f}", f"{r['p95']:.3f}", f"{r['p99']:.3f}"])
+			else:
+				json.dump({"time": time.time(), "stages": rep}, fh, indent=1)
+		os.replace(tmp, path)
+
+
+class PeriodicDump(threading.Thread):
+	def __init__(self, profiler: "Profiler", path: str, interval_s: float, stop: threading.Event):
+		super().__init__(name="metrics-dump", daemon=True)
+		self.profiler = profiler
+		self.path = path
+		self.interval_s = interval_s
+		self.stop = stop
+
+	def run(self):
+		while not self.stop.wait(self.interval_s):
+			self.profiler.dump(self.path)
+		self.profiler.dump(self.path)
+
+
+class StartupTimer:
+	"""Milliseconds from t0 (process start) to each startup milestone; phases may overlap.
+
+	phase() records how long a step took and when it finished; mark() records a single moment,
+	such as the first processed frame. Only the first record of a name is kept.
+	"""
+
+	def __init__(self, t0: Optional[float] = None):
+		self.t0 = time.perf_counter() if t0 is None else t0
+		self.durations: Dict[str, float] = {}
+		self.marks: Dict[str, float] = {}
+		self._lock = threading.Lock()
+
+	def mark(self, name: str):
+		with self._lock:
+			self.marks.setdefault(name, (time.perf_counter() - self.t0) * 1000.0)
+
+	@contextmanager
+	def phase(self, name: str):
+		t0 = time.perf_counter()
+		try:
+			yield
+		finally:
+			with self._lock:
+				self.durations.setdefault(name, (time.perf_counter() - t0) * 1000.0)
+			self.mark(name)
+
+	def summary(self) -> str:
+		with self._lock:
+			parts = [f"{name} {self.durations[name]:.0f} ms (done at {at:.0f})" if name in self.durations else f"{name} at {at:.0f} ms" for name, at in sorted(self.marks.items(), key=lambda item: item[1])]
+		return "startup: " + ", ".join(parts)
+
+	def as_dict(self) -> Dict[str, Dict[str, float]]:
+		with self._lock:
+			return {"durations_ms": dict(self.durations), "at_ms": dict(self.marks)}
+
+
+PROFILER = Profiler()
+
+
+def start_periodic_dump(stop: threading.Event, path: Optional[str] = None) -> Optional[PeriodicDump]:
+	path = path or METRICS.dump_path
+	if not path or not PROFILER.enabled:
+		return None
+	dumper = PeriodicDump(PROFILER, path, METRICS.dump_interval_s, stop)
+	dumper.start()
+	return dumper
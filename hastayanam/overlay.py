@@ -1,43 +1,93 @@
-import cv2
+from typing import List, Optional, Tuple
 from .config import OVERLAY, THRESHOLDS
+from .lazy import lazy_import
 
+cv2 = lazy_import("cv2")
+FONT = 0  # cv2.FONT_HERSHEY_SIMPLEX, without importing cv2 here
+LAYOUTS = ("full", "compact", "off")
+HUD_BOX_W = 560
 
-def draw_hud(frame, *, mode: str, gesture: str, action: str, confidence: float, fps: float, mode_progress: float = 0.0, cooldown_hint: str = "", per_hand: list | None = None):
+
+def _darken(frame, x0: int, y0: int, x1: int, y1: int):
+	# Same result as blending a black rectangle at bg_alpha, but only touches the rectangle
+	roi = frame[y0:y1, x0:x1]
+	cv2.convertScaleAbs(roi, dst=roi, alpha=1.0 - OVERLAY.bg_alpha)
+
+
+class HudCompositor:
+	"""HUD drawn straight into the frame: only the HUD box is darkened, in place, instead of
+	copying and blending the whole frame. Text goes through putText directly; pre-rasterized
+	row sprites were measured slower to composite than putText is to draw.
+	"""
+
+	def __init__(self, layout: str = OVERLAY.hud_layout):
+		self.layout = layout
+
+	def cycle_layout(self) -> str:
+		self.layout = LAYOUTS[(LAYOUTS.index(self.layout) + 1) % len(LAYOUTS)]
+		return self.layout
+
+	def draw(self, frame, *, mode: str, gesture: str, action: str, confidence: float, fps: float, mode_progress: float = 0.0, cooldown_hint: str = "", per_hand: Optional[list] = None, timings: str = ""):
+		if self.layout == "off":
+			return
+		pad = OVERLAY.padding
+		row = OVERLAY.row_gap
+
+		# (text, color); None keeps an empty row to hold positions steady
+		lines: List[Optional[Tuple[str, Tuple[int, int, int]]]]
+		if self.layout == "compact":
+			lines = [
+				(f"Mode: {mode}", (0, 255, 255)),
+				(f"Action: {action}", (0, 255, 0)),
+				(f"FPS: {fps:.1f}", (200, 200, 200)),
+			]
+		else:
+			lines = [
+				(f"Mode: {mode}", (0, 255, 255)),
+				(f"Gesture: {gesture}", (255, 255, 255)),
+				(f"Action: {action}", (0, 255, 0)),
+				(f"Conf: {confidence:.2f} (min {THRESHOLDS.confidence_min:.2f})", (200, 200, 200)),
+				(f"FPS: {fps:.1f}", (200, 200, 200)),
+				(cooldown_hint, (0, 165, 255)) if cooldown_hint else None,
+			]
+			if timings:
+				lines.append((timings, (200, 200, 200)))
+			for item in per_hand or []:
+				track = f" #{item['track']}" if item.get("track", -1) >= 0 else ""
+				lines.append((f"{item['label']}{track}: {item['gesture']} ({item['conf']:.2f})", (180, 220, 255)))
+
+		# Background for text area (inclusive corners, like cv2.rectangle)
+		box_h = pad * 2 + row * len(lines)
+		_darken(frame, 0, 0, min(HUD_BOX_W + 1, frame.shape[1]), min(box_h + 1, frame.shape[0]))
+
+		org_y = pad + 20
+		for i, line in enumerate(lines):
+			if line is not None:
+				cv2.putText(frame, line[0], (pad, org_y + row * i), FONT, OVERLAY.font_scale, line[1], OVERLAY.thickness, cv2.LINE_AA)
+
+		# Mode switch progress bar
+		if mode_progress > 0.0:
+			bar_x, bar_y = pad, box_h + 6
+			bar_w, bar_h = 240, 10
+			cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_w, bar_y + bar_h), (80, 80, 80), 1)
+			fill_w = int(bar_w * max(0.0, min(1.0, mode_progress)))
+			cv2.rectangle(frame, (bar_x, bar_y), (bar_x + fill_w, bar_y + bar_h), (0, 255, 255), -1)
+
+
+def draw_metrics_panel(frame, report: dict):
+	"""Per-stage p50/p95/p99 table in the top-right corner."""
 	h, w = frame.shape[:2]
 	pad = OVERLAY.padding
-	row = OVERLAY.row_gap
-	alpha = OVERLAY.bg_alpha
-
-	# Background for text area
-	rows = 6 + (len(per_hand) if per_hand else 0)
-	box_w = 560
-	box_h = pad * 2 + row * rows
-	overlay = frame.copy()
-	cv2.rectangle(overlay, (0, 0), (box_w, box_h), (0, 0, 0), -1)
-	cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
-
-	# Text lines
-	org_y = pad + 20
-	font = cv2.FONT_HERSHEY_SIMPLEX
-	cv2.putText(frame, f"Mode: {mode}", (pad, org_y + row * 0), font, OVERLAY.font_scale, (0, 255, 255), OVERLAY.thickness, cv2.LINE_AA)
-	cv2.putText(frame, f"Gesture: {gesture}", (pad, org_y + row * 1), font, OVERLAY.font_scale, (255, 255, 255), OVERLAY.thickness, cv2.LINE_AA)
-	cv2.putText(frame, f"Action: {action}", (pad, org_y + row * 2), font, OVERLAY.font_scale, (0, 255, 0), OVERLAY.thickness, cv2.LINE_AA)
-	cv2.putText(frame, f"Conf: {confidence:.2f} (min {THRESHOLDS.confidence_min:.2f})", (pad, org_y + row * 3), font, OVERLAY.font_scale, (200, 200, 200), OVERLAY.thickness, cv2.LINE_AA)
-	cv2.putText(frame, f"FPS: {fps:.1f}", (pad, org_y + row * 4), font, OVERLAY.font_scale, (200, 200, 200), OVERLAY.thickness, cv2.LINE_AA)
-	if cooldown_hint:
-		cv2.putText(frame, cooldown_hint, (pad, org_y + row * 5), font, OVERLAY.font_scale, (0, 165, 255), OVERLAY.thickness, cv2.LINE_AA)
-
-	# Per hand lines
-	if per_hand:
-		start = 6
-		for i, item in enumerate(per_hand):
-			text = f"{item['label']}: {item['gesture']} ({item['conf']:.2f})"
-			cv2.putText(frame, text, (pad, org_y + row * (start + i)), font, OVERLAY.font_scale, (180, 220, 255), OVERLAY.thickness, cv2.LINE_AA)
-
-	# Mode switch progress bar
-	if mode_progress > 0.0:
-		bar_x, bar_y = pad, box_h + 6
-		bar_w, bar_h = 240, 10
-		cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_w, bar_y + bar_h), (80, 80, 80), 1)
-		fill_w = int(bar_w * max(0.0, min(1.0, mode_progress)))
-		cv2.rectangle(frame, (bar_x, bar_y), (bar_x + fill_w, bar_y + bar_h), (0, 255, 255), -1)
+	row = int(OVERLAY.row_gap * 0.75)
+	scale = OVERLAY.font_scale * 0.7
+	box_w = 420
+	box_h = pad * 2 + row * (len(report) + 1)
+	x0 = w - box_w
+	_darken(frame, x0, 0, w, box_h)
+
+	font = FONT
+	y = pad + 14
+	cv2.putText(frame, f"{'stage':<18}{'p50':>7}{'p95':>7}{'p99':>7} ms", (x0 + pad, y), font, scale, (0, 255, 255), 1, cv2.LINE_AA)
+	for i, (name, r) in enumerate(report.items()):
+		text = f"{name:<18}{r['p50']:>7.1f}{r['p95']:>7.1f}{r['p99']:>7.1f}"
+		cv2.putText(frame, text, (x0 + pad, y + row * (i + 1)), font, scale, (200, 200, 200), 1, cv2.LINE_AA)
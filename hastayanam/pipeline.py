@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+import threading
+import time
+from .frames import FrameLease, FrameRing, read_into
+from .metrics import Profiler
+
+
+@dataclass
+class FramePacket:
+	frame_id: int
+	frame: Any  # BGR np.ndarray owned by whichever stage holds the packet
+	t_capture: float  # When the frame was captured (Capture.frame_time), perf_counter clock
+	payload: Any = None  # Filled in by the inference stage
+	lease: Optional[FrameLease] = None  # Ring slot backing frame, if any
+
+	def release(self):
+		"""Hand the frame buffer back to its ring; the packet's frame must not be used afterwards."""
+		if self.lease is not None:
+			self.lease.release()
+			self.lease = None
+
+
+class LatestSlot:
+	"""Bounded single-slot queue: put() replaces any unread item, so consumers always get the newest.
+
+	on_drop is called with each replaced item, e.g. FramePacket.release to recycle its buffer.
+	"""
+
+	def __init__(self, on_drop: Optional[Callable[[Any], None]] = None):
+		self._cond = threading.Condition()
+		self._item = None
+		self.on_drop = on_drop
+		self.dropped = 0
+
+	def put(self, item):
+		with self._cond:
+			if self._item is not None:
+				self.dropped += 1
+				if self.on_drop is not None:
+					self.on_drop(self._item)
+			self._item = item
+			self._cond.notify()
+
+	def get(self, timeout: Optional[float] = None):
+		with self._cond:
+			if self._item is None:
+				self._cond.wait(timeout)
+			item = self._item
+			self._item = None
+			return item
+
+
+class CaptureThread(threading.Thread):
+	"""Reads frames into ring slots when given a FrameRing, otherwise lets cap.read() allocate."""
+
+	def __init__(self, cap, out: LatestSlot, timer: Profiler, stop: threading.Event, ring: Optional[FrameRing] = None):
+		super().__init__(name="capture", daemon=True)
+		self.cap = cap
+		self.out = out
+		self.timer = timer
+		self.stop = stop
+		self.ring = ring
+
+	def run(self):
+		frame_id = 0
+		while not self.stop.is_set():
+			t0 = time.perf_counter()
+			if self.ring is not None:
+				ok, frame, lease = read_into(self.cap, self.ring)
+			else:
+				(ok, frame), lease = self.cap.read(), None
+			if not ok:
+				self.stop.set()
+				break
+			t1 = time.perf_counter()
+			self.timer.record("capture", t1 - t0)
+			# A plain cv2.VideoCapture has no frame_time; its frames count as captured when read
+			t_capture = getattr(self.cap, "frame_time", 0.0) or t1
+			self.out.put(FramePacket(frame_id=frame_id, frame=frame, t_capture=t_capture, lease=lease))
+			frame_id += 1
+
+
+class InferenceThread(threading.Thread):
+	"""Runs fn(packet) -> payload on the newest captured frame and forwards it to the render slot."""
+
+	def __init__(self, fn: Callable[[FramePacket], Any], inp: LatestSlot, out: LatestSlot, timer: Profiler, stop: threading.Event):
+		super().__init__(name="inference", daemon=True)
+		self.fn = fn
+		self.inp = inp
+		self.out = out
+		self.timer = timer
+		self.stop = stop
+
+	def run(self):
+		while not self.stop.is_set():
+			packet = self.inp.get(timeout=0.1)
+			if packet is None:
+				continue
+			t0 = time.perf_counter()
+			self.timer.record("frame_age", t0 - packet.t_capture)
+			try:
+				packet.payload = self.fn(packet)
+			except Exception:
+				self.stop.set()
+				raise
+			self.timer.record("worker", time.perf_counter() - t0)
+			self.out.put(packet)
+
+
+def format_timings(timings: Dict[str, float]) -> str:
+	order = (("capture", "cap"), ("worker", "inf"), ("render", "ui"), ("latency", "lat"))
+	parts = [f"{short} {timings[k]:.1f}" for k, short in order if k in timings]
+	return " | ".join(parts) + " ms" if parts else ""
@@ -0,0 +1,108 @@
+"""Compact binary landmark recordings (.hlm).
+
+Layout, little-endian:
+	header: magic b"HLM1", u16 width, u16 height
+	frame:  f64 timestamp, u8 hand count, then per hand: u8 label code + 21x3 float32 landmarks
+"""
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+import struct
+import numpy as np
+from .tracking import FrameResult, HandObservation
+
+MAGIC = b"HLM1"
+LABELS = ("Unknown", "Left", "Right")
+_LABEL_CODES = {name: i for i, name in enumerate(LABELS)}
+
+_HEADER = struct.Struct("<4sHH")
+_FRAME = struct.Struct("<dB")
+_HAND_LABEL = struct.Struct("<B")
+_PTS_BYTES = 21 * 3 * 4
+HAND_BYTES = _HAND_LABEL.size + _PTS_BYTES  # Label code + landmarks, per recorded hand
+
+
+class LandmarkRecorder:
+	def __init__(self, path: str, width: int, height: int, append: bool = False):
+		"""append: add frames to an existing recording (trim a torn tail first, see complete_frames)."""
+		self.path = path
+		self.frames = 0  # Written by this recorder
+		self._fh: BinaryIO = open(path, "ab" if append else "wb")
+		if not append:
+			self._fh.write(_HEADER.pack(MAGIC, width, height))
+
+	def write(self, timestamp: float, frame_res: FrameResult):
+		self.write_hands(timestamp, [(hand.label, hand.pts) for hand in frame_res.hands])
+
+	def write_hands(self, timestamp: float, hands: List[Tuple[str, np.ndarray]]):
+		parts = [_FRAME.pack(timestamp, len(hands))]
+		for label, pts in hands:
+			parts.append(_HAND_LABEL.pack(_LABEL_CODES.get(label, 0)))
+			parts.append(np.ascontiguousarray(pts, dtype="<f4").tobytes())
+		self._fh.write(b"".join(parts))
+		self.frames += 1
+
+	def flush(self):
+		self._fh.flush()
+
+	def close(self):
+		self._fh.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.close()
+
+
+def read_header(data: bytes) -> Optional[Tuple[int, int]]:
+	"""(width, height) of a recording buffer, or None if it doesn't start with a valid header."""
+	if len(data) < _HEADER.size:
+		return None
+	magic, width, height = _HEADER.unpack_from(data, 0)
+	return (width, height) if magic == MAGIC else None
+
+
+def iter_frames(data: bytes) -> Iterator[Tuple[float, int, int]]:
+	"""(timestamp, hand count, offset of the first hand) per whole frame of a recording buffer
+	with a valid header. Hands are HAND_BYTES apart: a label code, then 21x3 "<f4" landmarks.
+	Stops at a frame cut off mid-write, e.g. when the live loop was killed."""
+	off = _HEADER.size
+	end = len(data)
+	while off + _FRAME.size <= end:
+		timestamp, n = _FRAME.unpack_from(data, off)
+		off += _FRAME.size
+		if off + n * HAND_BYTES > end:
+			return
+		yield timestamp, n, off
+		off += n * HAND_BYTES
+
+
+def complete_frames(path: str) -> Tuple[int, int]:
+	"""(frames, bytes) of the whole frames a recording holds, header included in the bytes; a
+	frame cut off mid-write is left out. (0, 0) when the file has no valid header."""
+	with open(path, "rb") as fh:
+		data = fh.read()
+	if read_header(data) is None:
+		return 0, 0
+	frames, size = 0, _HEADER.size
+	for _, n, off in iter_frames(data):
+		frames += 1
+		size = off + n * HAND_BYTES
+	return frames, size
+
+
+def read_recording(path: str) -> Iterator[Tuple[float, FrameResult]]:
+	"""Yields (timestamp, FrameResult) per recorded frame; landmarks are read-only views into the file buffer."""
+	with open(path, "rb") as fh:
+		data = fh.read()
+	size = read_header(data)
+	if size is None:
+		raise ValueError(f"{path}: not a landmark recording")
+	width, height = size
+	for timestamp, n, off in iter_frames(data):
+		frame_res = FrameResult(result=None, width=width, height=height)
+		for _ in range(n):
+			code = data[off]
+			pts = np.frombuffer(data, dtype="<f4", count=63, offset=off + 1).reshape(21, 3)
+			off += HAND_BYTES
+			frame_res.hands.append(HandObservation(pts=pts, label=LABELS[code] if code < len(LABELS) else "Unknown"))
+		yield timestamp, frame_res
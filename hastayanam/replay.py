@@ -0,0 +1,121 @@
+"""Stream landmark recordings through GestureController without a camera or a desktop.
+
+Usage: python -m hastayanam.replay session.hlm [more.hlm ...] [--realtime]
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import time
+import numpy as np
+from .controller import GestureController
+from .recording import read_recording
+from .utils import set_clock
+
+
+@dataclass
+class _Outcome:
+	label: str
+	ok: bool = True
+	duration_s: float = 0.0
+	onset: float = 0.0
+	t_done: float = 0.0
+
+
+class RecordingSink:
+	"""Stands in for ActionDispatcher: records what would have run instead of running it."""
+
+	def __init__(self, clock: Callable[[], float] = time.time):
+		self.clock = clock
+		self.actions: List[Tuple[float, str]] = []
+		self._outcomes = []
+
+	def submit(self, label: str, fn: Callable, onset: float = 0.0):
+		t = self.clock()
+		self.actions.append((t, label))
+		self._outcomes.append(_Outcome(label, onset=onset, t_done=t))
+
+	def poll(self):
+		out = self._outcomes
+		self._outcomes = []
+		return out
+
+
+@dataclass
+class ReplayStats:
+	frames: int = 0
+	hands: int = 0
+	wall_s: float = 0.0
+	recorded_s: float = 0.0
+	step_ms: List[float] = field(default_factory=list)
+	actions: List[Tuple[float, str]] = field(default_factory=list)
+
+	def summary(self) -> Dict[str, float]:
+		steps = np.asarray(self.step_ms) if self.step_ms else np.zeros(1)
+		return {
+			"frames": self.frames,
+			"hands": self.hands,
+			"actions": len(self.actions),
+			"wall_s": self.wall_s,
+			"recorded_s": self.recorded_s,
+			"fps": self.frames / self.wall_s if self.wall_s > 0 else 0.0,
+			"speedup": self.recorded_s / self.wall_s if self.wall_s > 0 else 0.0,
+			"step_p50_ms": float(np.percentile(steps, 50)),
+			"step_p95_ms": float(np.percentile(steps, 95)),
+			"step_max_ms": float(steps.max()),
+		}
+
+
+def replay(paths: List[str], realtime: bool = False, controller_factory: Optional[Callable] = None) -> ReplayStats:
+	"""Run every frame of the recordings through a fresh controller.
+
+	Gesture timing (holds, swipes, cooldowns) follows the recorded timestamps in both modes;
+	realtime additionally sleeps so frames are delivered at the recorded pace.
+	"""
+	stats = ReplayStats()
+	recorded_now = [0.0]
+	set_clock(lambda: recorded_now[0])
+	try:
+		for path in paths:
+			sink = RecordingSink(clock=lambda: recorded_now[0])
+			controller = (controller_factory or GestureController)(sink)
+			first_t = None
+			wall_start = time.perf_counter()
+			for t, frame_res in read_recording(path):
+				if first_t is None:
+					first_t = t
+				recorded_now[0] = t
+				if realtime:
+					delay = (t - first_t) - (time.perf_counter() - wall_start)
+					if delay > 0:
+						time.sleep(delay)
+				t0 = time.perf_counter()
+				controller.step(frame_res)
+				stats.step_ms.append((time.perf_counter() - t0) * 1000.0)
+				stats.frames += 1
+				stats.hands += len(frame_res.hands)
+			stats.wall_s += time.perf_counter() - wall_start
+			if first_t is not None:
+				stats.recorded_s += recorded_now[0] - first_t
+			stats.actions.extend(sink.actions)
+	finally:
+		set_clock(None)
+	return stats
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("paths", nargs="+")
+	parser.add_argument("--realtime", action="store_true", help="Deliver frames at the recorded pace")
+	parser.add_argument("--actions", action="store_true", help="List every action that would have fired")
+	args = parser.parse_args()
+
+	stats = replay(args.paths, realtime=args.realtime)
+	for key, value in stats.summary().items():
+		print(f"{key:>12}: {value:.3f}" if isinstance(value, float) else f"{key:>12}: {value}")
+	if args.actions:
+		for t, label in stats.actions:
+			print(f"{t:.3f}  {label}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,69 @@
+from dataclasses import replace
+from typing import Dict, Optional
+import time
+import numpy as np
+from .config import SCHEDULER
+from .lazy import lazy_import
+from .tracking import FrameResult, HandTracker
+
+cv2 = lazy_import("cv2")
+
+
+class AdaptiveScheduler:
+	"""Decides per frame whether HandTracker.process is worth running.
+
+	- No hands: detect at SCHEDULER.idle_detect_hz, or immediately on motion.
+	- Hand visible but the scene is static: repeat the last result for up to max_static_skips frames.
+	- Motion or a newly found hand: back to inference on every frame.
+	"""
+
+	def __init__(self, tracker: HandTracker, enabled: bool = SCHEDULER.adaptive_enabled):
+		self.tracker = tracker
+		self.enabled = enabled
+		self._probe: Optional[np.ndarray] = None  # Downsampled gray frame at the last inference
+		self._next_probe: Optional[np.ndarray] = None
+		self._last: Optional[FrameResult] = None
+		self._last_infer_time = 0.0
+		self._static_skips = 0
+		self.inferred = 0
+		self.skipped = 0
+
+	def _motion(self, frame_bgr) -> float:
+		small = cv2.resize(frame_bgr, SCHEDULER.probe_size, interpolation=cv2.INTER_AREA)
+		self._next_probe = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+		if self._probe is None:
+			return float("inf")
+		# Compared against the last *inferred* frame, so slow drift still adds up to a re-run
+		return float(cv2.absdiff(self._next_probe, self._probe).mean())
+
+	def process(self, frame_bgr) -> FrameResult:
+		if not self.enabled:
+			return self.tracker.process(frame_bgr)
+		now = time.perf_counter()
+		moving = self._motion(frame_bgr) >= SCHEDULER.motion_threshold
+		last = self._last
+		if last is not None and not moving:
+			if not last.hands:
+				if now - self._last_infer_time < 1.0 / SCHEDULER.idle_detect_hz:
+					return self._skip(last)
+			elif self._static_skips < SCHEDULER.max_static_skips:
+				self._static_skips += 1
+				return self._skip(last)
+		return self._infer(frame_bgr, now)
+
+	def _infer(self, frame_bgr, now: float) -> FrameResult:
+		out = self.tracker.process(frame_bgr)
+		self._probe = self._next_probe
+		self._last = out
+		self._last_infer_time = now
+		self._static_skips = 0
+		self.inferred += 1
+		return out
+
+	def _skip(self, last: FrameResult) -> FrameResult:
+		self.skipped += 1
+		return replace(last, reused=True)
+
+	def stats(self) -> Dict[str, float]:
+		total = self.inferred + self.skipped
+		return {"inferred": self.inferred, "skipped": self.skipped, "infer_ratio": self.inferred / total if total else 0.0}
@@ -0,0 +1,349 @@
+"""Declared gesture sequences, matched incrementally.
+
+A sequence is a list of steps, each a gesture on a hand that may have to be held for a while
+and may have to start within some time of the previous step:
+	{"name": "fist_release", "steps": ["fist", {"gesture": "open_palm", "within": 0.5}]}
+	{"name": "two_hand_pinch", "steps": [{"gesture": "pinch", "hand": "both"}]}
+	{"name": "mode_cycle", "steps": [{"gesture": "pinch", "hold": 3.0}], "cooldown": 1.2, "repeat": true}
+Step keys: gesture; hand ("any", "Right", "Left" or "both"; "any" steps after the first stay on
+the hand that started the match); hold (seconds); within (seconds after the hand left the
+previous step's gesture; 0 = no limit). Sequence keys: cooldown (seconds after a match before
+it can start again) and repeat (start again after the cooldown if the first step's gesture is
+still shown, without waiting for a new entry; meant for single-step holds like mode_cycle).
+
+SequenceEngine only reacts to changes: each frame it diffs the per-hand labels, touches the
+partial matches waiting on exactly those gestures, and pops due hold/deadline timers off a heap.
+Per-frame cost follows the number of label changes and live matches, not the number of sequences.
+It also tracks how long each hand has shown its gesture, which is what bindings call a hold.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+import heapq
+import itertools
+from .config import THRESHOLDS
+from .utils import now as current_time
+
+HANDS = ("Right", "Left")
+NO_HAND = "none"  # Label of a hand that isn't in the frame
+
+DEFAULT_SEQUENCES: List[Dict[str, Any]] = [
+	# Pinch (either hand) held to cycle System -> Media -> Browser; keeps cycling while held
+	{"name": "mode_cycle", "steps": [{"gesture": "pinch", "hold": THRESHOLDS.mode_switch_hold_s}], "cooldown": 1.2, "repeat": True},
+	{"name": "fist_release", "steps": ["fist", {"gesture": "open_palm", "within": 0.5}]},
+	{"name": "two_hand_pinch", "steps": [{"gesture": "pinch", "hand": "both"}]},
+	{"name": "double_swipe_left", "steps": ["swipe_left", {"gesture": "swipe_left", "within": 0.8}]},
+	{"name": "double_swipe_right", "steps": ["swipe_right", {"gesture": "swipe_right", "within": 0.8}]},
+]
+
+_SEQUENCE_KEYS = {"name", "steps", "cooldown", "repeat"}
+_STEP_KEYS = {"gesture", "hand", "hold", "within"}
+
+
+@dataclass(frozen=True)
+class Step:
+	gesture: str
+	hand: str = "any"
+	hold_s: float = 0.0
+	within_s: float = 0.0
+
+
+@dataclass(frozen=True)
+class Sequence:
+	name: str
+	steps: Tuple[Step, ...]
+	cooldown_s: float = 0.0
+	repeat: bool = False
+
+
+@dataclass
+class SequenceMatch:
+	name: str
+	t: float  # When the last step completed
+	onset: float  # When the first step's gesture appeared
+	hand: str  # "Right", "Left" or "both"
+
+
+def compile_sequences(entries: List[Dict[str, Any]]) -> List[Sequence]:
+	"""Sequences from their dict form. Raises ValueError on the first bad entry."""
+	out: List[Sequence] = []
+	names: Set[str] = set()
+	for i, entry in enumerate(entries):
+		unknown = set(entry) - _SEQUENCE_KEYS
+		if unknown:
+			raise ValueError(f"sequence {i}: unknown keys {sorted(unknown)}")
+		try:
+			name = str(entry["name"])
+			steps = []
+			for j, raw in enumerate(entry["steps"]):
+				raw = {"gesture": raw} if isinstance(raw, str) else dict(raw)
+				bad = set(raw) - _STEP_KEYS
+				if bad:
+					raise ValueError(f"step {j}: unknown keys {sorted(bad)}")
+				hand = str(raw.get("hand", "any"))
+				if hand not in ("any", "both") + HANDS:
+					raise ValueError(f"step {j}: hand must be any, both, Right or Left, not {hand!r}")
+				steps.append(Step(str(raw["gesture"]), hand, float(raw.get("hold", 0.0)), float(raw.get("within", 0.0))))
+			if not steps:
+				raise ValueError("no steps")
+			seq = Sequence(name, tuple(steps), float(entry.get("cooldown", 0.0)), bool(entry.get("repeat", False)))
+		except KeyError as e:
+			raise ValueError(f"sequence {i}: missing {e}") from None
+		except (TypeError, ValueError) as e:
+			raise ValueError(f"sequence {i}: {e}") from None
+		if name in names:
+			raise ValueError(f"sequence {i}: duplicate name {name!r}")
+		names.add(name)
+		out.append(seq)
+	return out
+
+
+class _Run:
+	"""One partial match: step `index` is being held (holding=True) or has completed."""
+	__slots__ = ("id", "seq", "index", "hand", "onset", "holding", "hold_start", "left_at", "keys")
+
+	def __init__(self, run_id: int, seq: Sequence, hand: str, onset: float):
+		self.id = run_id
+		self.seq = seq
+		self.index = 0
+		self.hand = hand
+		self.onset = onset
+		self.holding = False
+		self.hold_start = 0.0
+		self.left_at: Optional[float] = None  # When the hand left the completed step's gesture
+		self.keys: List[Tuple[str, Any]] = []  # Index entries to remove when the run moves on
+
+
+class SequenceEngine:
+	def __init__(self, sequences: Optional[List[Sequence]] = None):
+		self.sequences = compile_sequences(DEFAULT_SEQUENCES) if sequences is None else sequences
+		self._by_name = {seq.name: seq for seq in self.sequences}
+		# First-step gesture -> sequences that can start on it
+		self._starts: Dict[str, List[Sequence]] = {}
+		for seq in self.sequences:
+			self._starts.setdefault(seq.steps[0].gesture, []).append(seq)
+		self._labels: Dict[str, str] = {hand: NO_HAND for hand in HANDS}
+		self._since: Dict[str, float] = {hand: current_time() for hand in HANDS}
+		self._runs: Dict[int, _Run] = {}
+		self._by_seq: Dict[str, Set[int]] = {}
+		self._waiting: Dict[str, Set[int]] = {}  # Gesture -> runs whose next step starts with it
+		self._held: Dict[Tuple[str, str], Set[int]] = {}  # (hand, gesture) -> runs that care when it ends
+		self._timers: List[Tuple[float, int, str, int]] = []  # (due, tiebreak, kind, run id or -1)
+		self._rearm: Dict[int, Tuple[Sequence, str]] = {}
+		self._cooldown_until: Dict[str, float] = {}
+		self._ids = itertools.count()
+		self._matches: List[SequenceMatch] = []
+
+	# -- per-frame entry point -------------------------------------------------------------
+
+	def update(self, labels: Dict[str, str], t: Optional[float] = None) -> List[SequenceMatch]:
+		"""Advance to time t with the current per-hand labels.
+
+		labels maps "Right"/"Left" to a gesture name; a hand that's missing from the frame should
+		map to NO_HAND, and a hand left out of the dict keeps its previous label (e.g. while the
+		classifier is still settling). Returns the sequences completed since the last call.
+		"""
+		t = current_time() if t is None else t
+		self._fire_timers(t)
+		for hand, label in labels.items():
+			old = self._labels.get(hand)
+			if label == old:
+				continue
+			self._labels[hand] = label
+			self._since[hand] = t
+			self._on_exit(hand, old, t)
+			self._on_enter(hand, label, t)
+		out, self._matches = self._matches, []
+		return out
+
+	def label(self, hand: str) -> str:
+		return self._labels.get(hand, NO_HAND)
+
+	def held_for(self, hand: str, t: Optional[float] = None) -> float:
+		"""Seconds the hand has shown its current label."""
+		t = current_time() if t is None else t
+		return t - self._since[hand] if self._labels.get(hand, NO_HAND) != NO_HAND else 0.0
+
+	def progress(self, name: str, t: Optional[float] = None) -> float:
+		"""0..1 through the hold of the furthest live match of the sequence; 0 if none is holding."""
+		t = current_time() if t is None else t
+		best = 0.0
+		for run_id in self._by_seq.get(name, ()):
+			run = self._runs[run_id]
+			if run.holding:
+				step = run.seq.steps[run.index]
+				best = max(best, min(1.0, (t - run.hold_start) / step.hold_s))
+		return best
+
+	def active(self) -> int:
+		return len(self._runs)
+
+	def reset(self):
+		self.__init__(self.sequences)
+
+	# -- events ---------------------------------------------------------------------------
+
+	def _on_exit(self, hand: str, gesture: Optional[str], t: float):
+		for run_id in list(self._held.get((hand, gesture), ())):
+			run = self._runs.get(run_id)
+			if run is None:
+				continue
+			if run.holding:
+				self._drop(run)  # Let go before the hold was up
+				continue
+			step = run.seq.steps[run.index + 1]
+			self._unindex(run, ("held", (hand, gesture)))
+			run.left_at = t
+			if step.within_s > 0:
+				self._push(t + step.within_s, "deadline", run.id)
+		for token, (seq, rearm_hand) in list(self._rearm.items()):
+			if rearm_hand in (hand, "both") and seq.steps[0].gesture == gesture:
+				del self._rearm[token]
+
+	def _on_enter(self, hand: str, gesture: str, t: float):
+		matched_before = len(self._matches)
+		for run_id in list(self._waiting.get(gesture, ())):
+			run = self._runs.get(run_id)
+			if run is None:
+				continue
+			step = run.seq.steps[run.index + 1]
+			matched = self._step_hand(step, run.hand, hand)
+			if matched is None:
+				continue
+			self._unindex(run)
+			run.index += 1
+			self._begin_step(run, matched, t)
+		# The entry that completed a sequence doesn't also start it again (three swipes are one double swipe)
+		just_matched = {m.name for m in self._matches[matched_before:]}
+		for seq in self._starts.get(gesture, ()):
+			if seq.name in just_matched or t < self._cooldown_until.get(seq.name, 0.0):
+				continue
+			matched = self._step_hand(seq.steps[0], None, hand)
+			if matched is None:
+				continue
+			same = [self._runs[r] for r in self._by_seq.get(seq.name, ()) if self._runs[r].index == 0 and self._runs[r].hand == matched]
+			if any(run.holding for run in same):
+				continue
+			# Showing the first gesture again starts over: a run still waiting after the earlier
+			# showing would otherwise keep that showing's deadline and block the new one
+			for run in same:
+				self._drop(run)
+			self._start(seq, matched, t)
+
+	def _step_hand(self, step: Step, run_hand: Optional[str], hand: str) -> Optional[str]:
+		# Which hand(s) this event satisfies the step with, or None
+		if step.hand == "both":
+			other = HANDS[1] if hand == HANDS[0] else HANDS[0]
+			return "both" if self._labels.get(other) == step.gesture else None
+		want = step.hand if step.hand != "any" else (run_hand if run_hand not in (None, "both") else None)
+		return hand if want is None or want == hand else None
+
+	# -- run bookkeeping ----------------------------------------------------------------------
+
+	def _start(self, seq: Sequence, hand: str, t: float):
+		run = _Run(next(self._ids), seq, hand, t)
+		self._runs[run.id] = run
+		self._by_seq.setdefault(seq.name, set()).add(run.id)
+		self._begin_step(run, hand, t)
+
+	def _begin_step(self, run: _Run, hand: str, t: float):
+		step = run.seq.steps[run.index]
+		if run.index == 0:
+			run.hand = hand
+		run.left_at = None
+		if step.hold_s > 0:
+			run.holding = True
+			run.hold_start = t
+			self._index_held(run, hand, step.gesture)
+			self._push(t + step.hold_s, "hold", run.id)
+		else:
+			self._complete_step(run, t)
+
+	def _complete_step(self, run: _Run, t: float):
+		run.holding = False
+		step = run.seq.steps[run.index]
+		if run.index == len(run.seq.steps) - 1:
+			self._finish(run, t)
+			return
+		# Wait for the next step; its deadline only starts once the hand lets go of this gesture
+		hands = HANDS if run.hand == "both" else (run.hand,)
+		still = [h for h in hands if self._labels.get(h) == step.gesture]
+		self._unindex(run)
+		nxt = run.seq.steps[run.index + 1]
+		self._waiting.setdefault(nxt.gesture, set()).add(run.id)
+		run.keys.append(("waiting", nxt.gesture))
+		if still:
+			for h in still:
+				self._index_held(run, h, step.gesture)
+		else:
+			run.left_at = t
+			if nxt.within_s > 0:
+				self._push(t + nxt.within_s, "deadline", run.id)
+
+	def _finish(self, run: _Run, t: float):
+		seq = run.seq
+		self._matches.append(SequenceMatch(seq.name, t, run.onset, run.hand))
+		# A match consumes every other partial match of the same sequence
+		for run_id in list(self._by_seq.get(seq.name, ())):
+			self._drop(self._runs[run_id])
+		if seq.cooldown_s > 0:
+			self._cooldown_until[seq.name] = t + seq.cooldown_s
+		if seq.repeat:
+			token = next(self._ids)
+			self._rearm[token] = (seq, run.hand)
+			self._push(t + seq.cooldown_s, "rearm", token)
+
+	def _index_held(self, run: _Run, hand: str, gesture: str):
+		key = (hand, gesture)
+		self._held.setdefault(key, set()).add(run.id)
+		run.keys.append(("held", key))
+
+	def _unindex(self, run: _Run, only: Optional[Tuple[str, Any]] = None):
+		keep = []
+		for kind, key in run.keys:
+			if only is not None and (kind, key) != only:
+				keep.append((kind, key))
+				continue
+			index = self._waiting if kind == "waiting" else self._held
+			ids = index.get(key)
+			if ids is not None:
+				ids.discard(run.id)
+				if not ids:
+					del index[key]
+		run.keys = keep
+
+	def _drop(self, run: _Run):
+		self._unindex(run)
+		self._runs.pop(run.id, None)
+		ids = self._by_seq.get(run.seq.name)
+		if ids is not None:
+			ids.discard(run.id)
+
+	# -- timers -------------------------------------------------------------------------------
+
+	def _push(self, due: float, kind: str, ref: int):
+		heapq.heappush(self._timers, (due, next(self._ids), kind, ref))
+
+	def _fire_timers(self, t: float):
+		# Entries for runs that have moved on are skipped when they come up, not searched for
+		while self._timers and self._timers[0][0] <= t:
+			due, _, kind, ref = heapq.heappop(self._timers)
+			if kind == "rearm":
+				entry = self._rearm.pop(ref, None)
+				if entry is not None:
+					seq, hand = entry
+					if self._still_showing(hand, seq.steps[0].gesture):
+						self._start(seq, hand, due)
+				continue
+			run = self._runs.get(ref)
+			if run is None:
+				continue
+			if kind == "hold" and run.holding and abs(due - (run.hold_start + run.seq.steps[run.index].hold_s)) < 1e-9:
+				self._complete_step(run, due)
+			elif kind == "deadline" and not run.holding and run.left_at is not None:
+				step = run.seq.steps[run.index + 1]
+				if due >= run.left_at + step.within_s - 1e-9:
+					self._drop(run)
+
+	def _still_showing(self, hand: str, gesture: str) -> bool:
+		hands = HANDS if hand == "both" else (hand,)
+		return all(self._labels.get(h) == gesture for h in hands)
@@ -0,0 +1,88 @@
+"""Local control channel and status output for running without the preview window.
+
+Line-based commands over TCP on SERVICE.control_host:control_port, one reply line each:
+	quit
+	mode system|media|browser|next
+	preview on|off|toggle
+	reload               re-read the gesture bindings file
+	status               -> one JSON line
+"""
+from typing import Any, Callable, Dict, Optional, Tuple
+import json
+import os
+import queue
+import socketserver
+import threading
+from .config import SERVICE
+
+# Command -> accepted arguments
+COMMANDS = {
+	"quit": ("",),
+	"mode": ("system", "media", "browser", "next"),
+	"preview": ("on", "off", "toggle", ""),
+	"reload": ("",),
+	"status": ("",),
+}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+	def handle(self):
+		server: "ControlServer" = self.server.owner  # type: ignore[attr-defined]
+		for raw in self.rfile:
+			line = raw.decode("utf-8", "replace").strip()
+			if not line:
+				continue
+			reply = server.handle_line(line)
+			self.wfile.write((reply + "\n").encode("utf-8"))
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+	daemon_threads = True
+	allow_reuse_address = True
+
+
+class ControlServer:
+	"""Parses commands on socket threads and queues them for the main loop to apply with poll()."""
+
+	def __init__(self, status: Callable[[], Dict[str, Any]], host: str = SERVICE.control_host, port: int = SERVICE.control_port):
+		self.status = status
+		self._commands: "queue.SimpleQueue[Tuple[str, str]]" = queue.SimpleQueue()
+		self._server = _TCPServer((host, port), _Handler)
+		self._server.owner = self  # type: ignore[attr-defined]
+		self.address = self._server.server_address
+		self._thread = threading.Thread(target=self._server.serve_forever, name="control", daemon=True)
+
+	def start(self):
+		self._thread.start()
+		return self
+
+	def handle_line(self, line: str) -> str:
+		cmd, _, arg = line.partition(" ")
+		cmd, arg = cmd.lower(), arg.strip().lower()
+		if cmd not in COMMANDS:
+			return f"error unknown command: {cmd}"
+		if arg not in COMMANDS[cmd]:
+			return f"error {cmd} expects one of: {', '.join(a for a in COMMANDS[cmd] if a)}"
+		if cmd == "status":
+			return json.dumps(self.status())
+		self._commands.put((cmd, arg))
+		return "ok"
+
+	def poll(self) -> Optional[Tuple[str, str]]:
+		"""Next queued (command, argument), or None. Never blocks."""
+		try:
+			return self._commands.get_nowait()
+		except queue.Empty:
+			return None
+
+	def close(self):
+		self._server.shutdown()
+		self._server.server_close()
+
+
+def write_status(path: str, status: Dict[str, Any]):
+	# Write-then-rename so readers never see a half-written file
+	tmp = path + ".tmp"
+	with open(tmp, "w", encoding="utf-8") as fh:
+		json.dump(status, fh)
+	os.replace(tmp, path)
@@ -0,0 +1,210 @@
+"""Hand tracking on MediaPipe Tasks' HandLandmarker in LIVE_STREAM mode.
+
+HandTracker (the legacy solutions API) blocks the inference thread for the whole model run.
+Here frames are submitted with a timestamp and return at once; HandLandmarker answers on its
+own thread through a callback, which converts all hands to one (N, 21, 3) array and queues the
+FrameResult. LiveStreamStage takes the place of LatestSlot + InferenceThread, like PoolStage.
+
+HandLandmarker drops frames it is too busy for without calling back, so a result for frame k
+means every earlier outstanding frame was dropped. Submissions beyond
+TRACKING.tasks_max_in_flight are refused so frames don't pile up behind the model.
+
+The model bundle (TRACKING.tasks_model_path) is the hand_landmarker.task file from MediaPipe's
+model page.
+"""
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import os
+import threading
+import time
+import numpy as np
+from .config import TRACKING, VIDEO
+from .lazy import lazy_import
+from .tracking import FrameResult, HandObservation
+from .utils import landmarks_to_array
+
+cv2 = lazy_import("cv2")
+mp = lazy_import("mediapipe")
+
+# A frame still unanswered after this long was dropped without its successor being answered
+# yet (e.g. two drops in a row); give up its in-flight place
+_STALE_S = 0.5
+
+
+def _task_label(handedness, i: int) -> str:
+	label = "Unknown"
+	if i < len(handedness) and handedness[i]:
+		label = handedness[i][0].category_name or "Unknown"
+		if VIDEO.swap_handedness:
+			label = "Right" if label == "Left" else ("Left" if label == "Right" else label)
+	return label
+
+
+def frame_result_from_task(result, width: int, height: int) -> FrameResult:
+	"""FrameResult from a HandLandmarkerResult; hands carry no landmark protos (drawn from pts)."""
+	out = FrameResult(result=result, width=width, height=height)
+	hands = result.hand_landmarks or []
+	if hands:
+		pts = landmarks_to_array(hands)
+		out.hands = [HandObservation(pts=pts[i], label=_task_label(result.handedness, i)) for i in range(len(hands))]
+	return out
+
+
+class LiveStreamTracker:
+	def __init__(self, model_path: str = TRACKING.tasks_model_path, max_in_flight: int = TRACKING.tasks_max_in_flight, num_hands: int = TRACKING.max_num_hands):
+		if not os.path.exists(model_path):
+			raise FileNotFoundError(f"HandLandmarker model not found: {model_path} (set TRACKING.tasks_model_path)")
+		from mediapipe.tasks.python import BaseOptions, vision
+
+		self.max_in_flight = max_in_flight
+		self._lock = threading.Lock()
+		self._ready = threading.Condition(self._lock)
+		self._done: Deque[Tuple[int, FrameResult, float]] = deque()
+		self._pending: Dict[int, Tuple[int, float, Tuple[int, int]]] = {}  # timestamp_ms -> (frame_id, t_submit, (w, h))
+		self._last_ts = -1
+		self._next_id = 0
+		self._rgb: Optional[np.ndarray] = None  # Reused; mp.Image copies the pixels on submit
+		self.submitted = 0
+		self.refused = 0
+		self.dropped = 0
+		self.latency_s: Deque[float] = deque(maxlen=256)  # Submit-to-callback, per answered frame
+		options = vision.HandLandmarkerOptions(
+			base_options=BaseOptions(model_asset_path=model_path),
+			running_mode=vision.RunningMode.LIVE_STREAM,
+			num_hands=num_hands,
+			min_hand_detection_confidence=0.5,
+			min_hand_presence_confidence=0.5,
+			min_tracking_confidence=0.5,
+			result_callback=self._on_result,
+		)
+		self._landmarker = vision.HandLandmarker.create_from_options(options)
+
+	def submit(self, frame_bgr, frame_id: Optional[int] = None) -> Optional[int]:
+		"""Queue a BGR frame; returns its id, or None if max_in_flight frames are still out."""
+		with self._lock:
+			if len(self._pending) >= self.max_in_flight:
+				oldest = min(self._pending)
+				if time.perf_counter() - self._pending[oldest][1] < _STALE_S:
+					self.refused += 1
+					return None
+				del self._pending[oldest]
+				self.dropped += 1
+			if frame_id is None:
+				frame_id = self._next_id
+			self._next_id = frame_id + 1
+			# LIVE_STREAM needs strictly increasing timestamps
+			ts = max(int(time.perf_counter() * 1000), self._last_ts + 1)
+			self._last_ts = ts
+			h, w = frame_bgr.shape[:2]
+			self._pending[ts] = (frame_id, time.perf_counter(), (w, h))
+		if self._rgb is None or self._rgb.shape != frame_bgr.shape:
+			self._rgb = np.empty_like(frame_bgr)
+		cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=self._rgb)
+		try:
+			self._landmarker.detect_async(mp.Image(image_format=mp.ImageFormat.SRGB, data=self._rgb), ts)
+		except Exception:
+			with self._lock:
+				self._pending.pop(ts, None)
+			raise
+		self.submitted += 1
+		return frame_id
+
+	def _on_result(self, result, image, timestamp_ms: int):
+		# HandLandmarker's thread: convert and queue, nothing else
+		t = time.perf_counter()
+		with self._lock:
+			entry = self._pending.pop(timestamp_ms, None)
+			if entry is None:
+				return
+			frame_id, t_submit, (w, h) = entry
+			for ts in [ts for ts in self._pending if ts < timestamp_ms]:
+				del self._pending[ts]
+				self.dropped += 1
+		frame_res = frame_result_from_task(result, w, h)
+		with self._ready:
+			self.latency_s.append(t - t_submit)
+			self._done.append((frame_id, frame_res, t_submit))
+			self._ready.notify()
+
+	def results(self, timeout: Optional[float] = None) -> List[Tuple[int, FrameResult, float]]:
+		"""Answered frames as (frame_id, FrameResult, t_submit), oldest first; waits up to timeout for one."""
+		with self._ready:
+			if not self._done and timeout:
+				self._ready.wait(timeout)
+			out = list(self._done)
+			self._done.clear()
+			return out
+
+	def in_flight(self) -> int:
+		with self._lock:
+			return len(self._pending)
+
+	def stats(self) -> Dict[str, float]:
+		lat = np.asarray(self.latency_s) if self.latency_s else np.zeros(1)
+		return {
+			"submitted": self.submitted, "refused": self.refused, "dropped": self.dropped,
+			"latency_p50_ms": float(np.percentile(lat, 50) * 1000), "latency_p95_ms": float(np.percentile(lat, 95) * 1000),
+		}
+
+	def warmup(self, width: int = VIDEO.width, height: int = VIDEO.height, timeout: float = 5.0):
+		"""Push one blank frame through and wait for its answer, so model setup happens now."""
+		if self.submit(np.zeros((height, width, 3), dtype=np.uint8)) is not None:
+			deadline = time.perf_counter() + timeout
+			while self.in_flight() and time.perf_counter() < deadline:
+				self.results(timeout=0.05)
+		with self._lock:
+			self._done.clear()
+			self.latency_s.clear()
+			self.submitted = self.refused = self.dropped = 0
+
+	def close(self):
+		self._landmarker.close()
+
+
+class LiveStreamStage(threading.Thread):
+	"""Drop-in for LatestSlot + InferenceThread over a LiveStreamTracker: CaptureThread put()s
+	packets, which are submitted at once (or released when the model is saturated), and this
+	thread hands each answered frame to fn(packet, frame_res) and on to the render slot.
+	"""
+
+	def __init__(self, tracker: LiveStreamTracker, fn: Callable[[Any, FrameResult], Any], out, timer, stop: threading.Event):
+		super().__init__(name="tasks-results", daemon=True)
+		self.tracker = tracker
+		self.fn = fn
+		self.out = out
+		self.timer = timer
+		self.stop = stop
+		self._lock = threading.Lock()
+		self._packets: Dict[int, Any] = {}
+
+	def put(self, packet):
+		with self._lock:
+			t0 = time.perf_counter()
+			self.timer.record("frame_age", t0 - packet.t_capture)
+			frame_id = self.tracker.submit(packet.frame, packet.frame_id)
+			if frame_id is None:
+				packet.release()
+				return
+			self.timer.record("convert", time.perf_counter() - t0)
+			self._packets[frame_id] = packet
+
+	def run(self):
+		while not self.stop.is_set():
+			ready = self.tracker.results(timeout=0.1)
+			for frame_id, frame_res, t_submit in ready:
+				with self._lock:
+					# Earlier packets never got an answer: HandLandmarker dropped them
+					for stale in [i for i in self._packets if i < frame_id]:
+						self._packets.pop(stale).release()
+					packet = self._packets.pop(frame_id, None)
+				if packet is None:
+					continue
+				self.timer.record("inference", time.perf_counter() - t_submit)
+				t0 = time.perf_counter()
+				packet.payload = self.fn(packet, frame_res)
+				self.timer.record("worker", time.perf_counter() - t0)
+				self.out.put(packet)
+		with self._lock:
+			for packet in self._packets.values():
+				packet.release()
+			self._packets.clear()
@@ -1,59 +1,232 @@
+from dataclasses import dataclass, field
 from typing import Optional, Tuple, List, Dict, Any
-import cv2
-import mediapipe as mp
-from .config import VIDEO
-from .utils import normalize_landmarks
+import numpy as np
+from .capture import open_capture
+from .config import VIDEO, TRACKING
+from .lazy import lazy_import
+from .metrics import PROFILER
+from .utils import landmarks_to_array
+
+# The data classes below are used offline too; only HandTracker and drawing need these
+cv2 = lazy_import("cv2")
+mp = lazy_import("mediapipe")
+
+
+@dataclass
+class HandObservation:
+	pts: np.ndarray  # (21, 3) normalized landmarks
+	label: str  # 'Left' | 'Right' | 'Unknown' (after swap_handedness)
+	landmarks: Any = None  # Raw NormalizedLandmarkList, kept for drawing
+	predicted: bool = False  # pts extrapolated by a filter rather than observed this frame
+	track_id: int = -1  # Persistent identity from tracks.TrackAssociator; -1 before association
+
+
+@dataclass
+class FrameResult:
+	"""Everything derived from one MediaPipe inference on one frame."""
+	result: Any
+	width: int
+	height: int
+	hands: List[HandObservation] = field(default_factory=list)
+	reused: bool = False  # True when a scheduler skipped inference and repeated an earlier result
+
+	def by_label(self, label: str) -> Optional[HandObservation]:
+		for hand in self.hands:
+			if hand.label == label:
+				return hand
+		return None
+
+
+# MediaPipe's 21-landmark hand topology, for drawing hands that arrive without raw landmark protos
+HAND_CONNECTIONS = (
+	(0, 1), (1, 2), (2, 3), (3, 4), (0, 5), (5, 6), (6, 7), (7, 8), (5, 9), (9, 10), (10, 11), (11, 12),
+	(9, 13), (13, 14), (14, 15), (15, 16), (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+
+def draw_hand_points(frame_bgr, pts: np.ndarray):
+	h, w = frame_bgr.shape[:2]
+	px = (pts[:, :2] * (w, h)).astype(np.int32)
+	for a, b in HAND_CONNECTIONS:
+		cv2.line(frame_bgr, tuple(px[a]), tuple(px[b]), (224, 224, 224), 2)
+	for p in px:
+		cv2.circle(frame_bgr, tuple(p), 2, (0, 0, 255), 2)
+
+
+def draw_hands(frame_bgr, frame_result: FrameResult, drawer=None):
+	for hand in frame_result.hands:
+		if hand.landmarks is not None and drawer is not None:
+			drawer.draw_landmarks(frame_bgr, hand.landmarks, mp.solutions.hands.HAND_CONNECTIONS)
+		else:
+			draw_hand_points(frame_bgr, hand.pts)
+
+
+def _resolve_label(handedness, i: int) -> str:
+	label = "Unknown"
+	if i < len(handedness) and handedness[i].classification:
+		label = handedness[i].classification[0].label
+		if VIDEO.swap_handedness:
+			label = "Right" if label == "Left" else ("Left" if label == "Right" else label)
+	return label
+
+
+class RoiPredictor:
+	"""Predicts where the hands will be next frame from the previous frame's landmarks."""
+
+	def __init__(self, padding: float = TRACKING.roi_padding, refresh_frames: int = TRACKING.roi_refresh_frames):
+		self.padding = padding
+		self.refresh_frames = refresh_frames
+		self._box: Optional[np.ndarray] = None  # x0, y0, x1, y1 normalized
+		self._velocity = np.zeros(2, dtype=np.float32)
+		self._since_full = 0
+		self.hits = 0
+		self.misses = 0
+		self.full = 0
+
+	def predict(self) -> Optional[Tuple[float, float, float, float]]:
+		if self._box is None or self._since_full >= self.refresh_frames:
+			return None
+		x0, y0, x1, y1 = self._box
+		dx, dy = self._velocity
+		pw = (x1 - x0) * self.padding
+		ph = (y1 - y0) * self.padding
+		return (
+			max(0.0, x0 + dx - pw),
+			max(0.0, y0 + dy - ph),
+			min(1.0, x1 + dx + pw),
+			min(1.0, y1 + dy + ph),
+		)
+
+	def update(self, hands: List[HandObservation], full_frame: bool):
+		if full_frame:
+			self.full += 1
+			self._since_full = 0
+		else:
+			self._since_full += 1
+		if not hands:
+			self._box = None
+			self._velocity[:] = 0.0
+			return
+		xy = np.concatenate([hand.pts[:, :2] for hand in hands])
+		box = np.concatenate([xy.min(axis=0), xy.max(axis=0)])
+		if self._box is not None:
+			self._velocity = (box[:2] + box[2:] - self._box[:2] - self._box[2:]) * 0.5
+		self._box = box
+
+	def stats(self) -> Dict[str, float]:
+		tried = self.hits + self.misses
+		return {"hits": self.hits, "misses": self.misses, "full": self.full, "hit_rate": self.hits / tried if tried else 0.0}
 
 
 class HandTracker:
-	def __init__(self):
+	def __init__(self, roi: bool = TRACKING.roi_enabled, max_hands: int = TRACKING.max_num_hands):
 		self.mp_hands = mp.solutions.hands
 		self.hands = self.mp_hands.Hands(
 			static_image_mode=False,
-			max_num_hands=2,
+			max_num_hands=max_hands,
 			min_detection_confidence=0.5,
 			min_tracking_confidence=0.5,
 		)
 		self.drawer = mp.solutions.drawing_utils
+		self._rgb: Optional[np.ndarray] = None  # Reused full-frame RGB buffer; process() copies it into its packet
+		self.roi: Optional[RoiPredictor] = None
+		if roi:
+			self.roi = RoiPredictor()
+			# Separate instance so crop-space tracking state never leaks into full-frame tracking
+			self._roi_hands = self.mp_hands.Hands(
+				static_image_mode=False,
+				max_num_hands=max_hands,
+				min_detection_confidence=0.5,
+				min_tracking_confidence=0.5,
+			)
 
-	def process(self, frame_bgr) -> Dict[str, Any]:
-		# Convert to RGB for MediaPipe
-		rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-		result = self.hands.process(rgb)
-		return {
-			"result": result,
-			"hands": result.multi_hand_landmarks or [],
-			"handedness": result.multi_handedness or [],
-		}
-
-	def extract_normalized(self, frame_bgr) -> List[Dict[str, Any]]:
-		"""Returns list of dicts: { 'pts': np.ndarray(21,3), 'label': 'Left'|'Right' }"""
-		out = []
-		proc = self.process(frame_bgr)
-		hands = proc["hands"]
-		hness = proc["handedness"]
-		if not hands:
-			return out
+	def warmup(self, width: int = VIDEO.width, height: int = VIDEO.height):
+		"""Run one blank frame through each model so graph setup and first-inference allocation
+		happen now (e.g. while the camera opens) rather than on the first real frame."""
+		blank = np.zeros((height, width, 3), dtype=np.uint8)
+		self.hands.process(blank)
+		if self.roi is not None:
+			side = TRACKING.roi_min_side_px
+			self._roi_hands.process(np.zeros((side, side, 3), dtype=np.uint8))
+
+	def reset(self):
+		"""Forget the hands tracked so far, e.g. before frames from an unrelated video."""
+		self.hands.reset()
+		if self.roi is not None:
+			self.roi = RoiPredictor()
+			self._roi_hands.reset()
+
+	def process(self, frame_bgr) -> FrameResult:
+		if self.roi is None:
+			return self._process_full(frame_bgr)
+		box = self.roi.predict()
+		if box is not None:
+			out = self._process_roi(frame_bgr, box)
+			if out.hands:
+				self.roi.hits += 1
+				self.roi.update(out.hands, full_frame=False)
+				return out
+			# Lost the hands inside the crop; redo this frame on the full image
+			self.roi.misses += 1
+		out = self._process_full(frame_bgr)
+		self.roi.update(out.hands, full_frame=True)
+		return out
+
+	def _process_full(self, frame_bgr) -> FrameResult:
+		# Convert to RGB for MediaPipe; this is the only inference per frame
+		with PROFILER.stage("convert"):
+			if self._rgb is None or self._rgb.shape != frame_bgr.shape:
+				self._rgb = np.empty_like(frame_bgr)
+			rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=self._rgb)
+		with PROFILER.stage("inference"):
+			result = self.hands.process(rgb)
 		h, w = frame_bgr.shape[:2]
-		for i, hand_lms in enumerate(hands):
-			label = "Unknown"
-			if i < len(hness) and hness[i].classification:
-				label = hness[i].classification[0].label
-				if VIDEO.swap_handedness:
-					label = "Right" if label == "Left" else ("Left" if label == "Right" else label)
-			pts = normalize_landmarks(hand_lms.landmark, w, h)
-			out.append({"pts": pts, "label": label})
+		return self._build(result, w, h)
+
+	def _process_roi(self, frame_bgr, box: Tuple[float, float, float, float]) -> FrameResult:
+		h, w = frame_bgr.shape[:2]
+		x0, y0 = int(box[0] * w), int(box[1] * h)
+		x1, y1 = int(np.ceil(box[2] * w)), int(np.ceil(box[3] * h))
+		crop = frame_bgr[y0:y1, x0:x1]
+		cw, ch = x1 - x0, y1 - y0
+		if cw < 2 or ch < 2:
+			return FrameResult(result=None, width=w, height=h)
+		short = min(cw, ch)
+		if short < TRACKING.roi_min_side_px:
+			# Uniform scale, so normalized crop coordinates are unchanged
+			scale = TRACKING.roi_min_side_px / short
+			crop = cv2.resize(crop, (int(cw * scale), int(ch * scale)), interpolation=cv2.INTER_LINEAR)
+		with PROFILER.stage("convert"):
+			rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+		with PROFILER.stage("inference"):
+			result = self._roi_hands.process(rgb)
+		# Map crop-normalized landmarks back into full-frame normalized coordinates in place,
+		# so both the arrays and the drawing data agree with the full frame
+		for lms in result.multi_hand_landmarks or []:
+			for lm in lms.landmark:
+				lm.x = (x0 + lm.x * cw) / w
+				lm.y = (y0 + lm.y * ch) / h
+				lm.z = lm.z * cw / w
+		return self._build(result, w, h)
+
+	def _build(self, result, w: int, h: int) -> FrameResult:
+		out = FrameResult(result=result, width=w, height=h)
+		hand_lms = result.multi_hand_landmarks or []
+		hness = result.multi_handedness or []
+		with PROFILER.stage("normalize"):
+			pts = landmarks_to_array([lms.landmark for lms in hand_lms])
+			for i, lms in enumerate(hand_lms):
+				out.hands.append(HandObservation(
+					pts=pts[i],
+					label=_resolve_label(hness, i),
+					landmarks=lms,
+				))
 		return out
 
-	def draw(self, frame_bgr, proc_dict: Dict[str, Any]):
-		result = proc_dict.get("result") if isinstance(proc_dict, dict) else proc_dict
-		if result and result.multi_hand_landmarks:
-			for i, hand_landmarks in enumerate(result.multi_hand_landmarks):
-				self.drawer.draw_landmarks(frame_bgr, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
+	def draw(self, frame_bgr, frame_result: FrameResult):
+		draw_hands(frame_bgr, frame_result, self.drawer)
 
 
 def open_camera(index: int = VIDEO.camera_index, width: int = VIDEO.width, height: int = VIDEO.height):
-	cap = cv2.VideoCapture(index)
-	cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
-	cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
-	return cap
+	"""Camera `index` with CAPTURE's negotiated format, rate and buffering (see capture.py)."""
+	return open_capture(str(index), width, height)
@@ -0,0 +1,137 @@
+"""Persistent hand identities across frames.
+
+MediaPipe numbers hands per frame, and its handedness can flip from one frame to the next or
+come back "Unknown". State keyed by the "Left"/"Right" label then lands on the wrong hand or
+gets dropped. TrackAssociator matches each frame's hands to the live tracks by palm position
+and stamps them with a track_id that lasts while the hand stays in view. A track's label is the
+majority of its recent handedness votes, so a one-frame flip doesn't relabel it.
+
+Tracks unseen for TRACKING.track_ttl_s are evicted; their ids are listed in `evicted` after
+the apply() that dropped them, so per-hand state can be released.
+"""
+from collections import Counter, deque
+from dataclasses import replace
+from typing import Deque, Dict, List, Optional
+import itertools
+import math
+import numpy as np
+from .config import TRACKING
+from .tracking import FrameResult
+from .utils import now as current_time
+
+# Wrist and knuckles: they move with the hand, not with the fingers
+_PALM = np.array([0, 5, 9, 13, 17])
+_LABELS = ("Right", "Left")
+_LABEL_PENALTY = 0.25  # Added to the match cost when a hand's label contradicts the track's
+
+
+class Track:
+	__slots__ = ("id", "palm", "size", "first_seen", "last_seen", "votes", "_counts")
+
+	def __init__(self, track_id: int, palm: np.ndarray, t: float, votes: int):
+		self.id = track_id
+		self.palm = palm
+		self.size = _palm_size(palm)
+		self.first_seen = self.last_seen = t
+		self.votes: Deque[str] = deque(maxlen=votes)
+		self._counts: Counter = Counter()
+
+	def vote(self, label: str):
+		if label not in _LABELS:
+			return
+		if len(self.votes) == self.votes.maxlen:
+			self._counts[self.votes[0]] -= 1
+		self.votes.append(label)
+		self._counts[label] += 1
+
+	@property
+	def label(self) -> str:
+		"""Majority handedness of the recent votes; the newest vote breaks a tie."""
+		if not self.votes:
+			return "Unknown"
+		right, left = self._counts["Right"], self._counts["Left"]
+		return self.votes[-1] if right == left else ("Right" if right > left else "Left")
+
+
+def _palm_size(palm: np.ndarray) -> float:
+	# Wrist to middle knuckle, floored so a degenerate detection can't zero the gate
+	return max(math.hypot(float(palm[2, 0] - palm[0, 0]), float(palm[2, 1] - palm[0, 1])), 0.02)
+
+
+class TrackAssociator:
+	def __init__(self, max_distance: float = TRACKING.track_max_distance, ttl_s: float = TRACKING.track_ttl_s, votes: int = TRACKING.track_label_votes):
+		self.max_distance = max_distance
+		self.ttl_s = ttl_s
+		self.votes = votes
+		self.tracks: Dict[int, Track] = {}
+		self.evicted: List[int] = []
+		self._ids = itertools.count()
+		self.created = 0
+		self.relabeled = 0  # Hands whose reported handedness the track's majority overrode
+
+	def __contains__(self, track_id: int) -> bool:
+		return track_id in self.tracks
+
+	def apply(self, frame_res: FrameResult, t: Optional[float] = None) -> FrameResult:
+		"""frame_res with every hand carrying a track_id and its track's label."""
+		t = current_time() if t is None else t
+		self.evicted = [tid for tid, track in self.tracks.items() if t - track.last_seen > self.ttl_s]
+		for tid in self.evicted:
+			del self.tracks[tid]
+		if not frame_res.hands:
+			return frame_res
+		palms = np.stack([hand.pts[_PALM, :2] for hand in frame_res.hands])
+		assigned = self._associate(frame_res, palms)
+		hands = []
+		for i, hand in enumerate(frame_res.hands):
+			track = assigned[i]
+			if track is None:
+				tid = next(self._ids)
+				track = self.tracks[tid] = Track(tid, palms[i], t, self.votes)
+				self.created += 1
+			track.palm = palms[i]
+			track.size = _palm_size(palms[i])
+			track.last_seen = t
+			if not frame_res.reused:
+				track.vote(hand.label)
+			label = track.label if track.votes else hand.label
+			if label != hand.label and hand.label in _LABELS:
+				self.relabeled += 1
+			hands.append(replace(hand, track_id=track.id, label=label))
+		return replace(frame_res, hands=hands)
+
+	def _associate(self, frame_res: FrameResult, palms: np.ndarray) -> List[Optional[Track]]:
+		"""Greedy lowest-cost matching (with a handful of hands this equals the optimal one in
+		practice), then hands that moved too far for it (a fast swipe at a low frame rate) fall back
+		to the most recently seen free track with the same label, which is what keying by label did."""
+		assigned: List[Optional[Track]] = [None] * len(palms)
+		if not self.tracks:
+			return assigned
+		tracks = list(self.tracks.values())
+		# Mean palm-point distance in units of the track's palm length
+		diff = palms[:, None] - np.stack([tr.palm for tr in tracks])[None]
+		cost = np.sqrt(np.einsum("ijpk,ijpk->ijp", diff, diff)).sum(axis=-1) / ([len(_PALM) * tr.size for tr in tracks])
+		track_labels = [tr.label for tr in tracks]
+		for i, hand in enumerate(frame_res.hands):
+			if hand.label in _LABELS:
+				for j, label in enumerate(track_labels):
+					if label in _LABELS and label != hand.label:
+						cost[i, j] += _LABEL_PENALTY
+		pairs = sorted((c, i, j) for i, row in enumerate(cost.tolist()) for j, c in enumerate(row) if c <= self.max_distance)
+		used = set()
+		for _, i, j in pairs:
+			if assigned[i] is None and j not in used:
+				assigned[i] = tracks[j]
+				used.add(j)
+		free = [tr for j, tr in enumerate(tracks) if j not in used]
+		for i, hand in enumerate(frame_res.hands):
+			if assigned[i] is None and hand.label in _LABELS:
+				same = [tr for tr in free if tr.label == hand.label]
+				if same:
+					assigned[i] = max(same, key=lambda tr: tr.last_seen)
+					free.remove(assigned[i])
+		return assigned
+
+	def reset(self):
+		self.evicted = list(self.tracks)
+		self.tracks.clear()
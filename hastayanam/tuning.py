@@ -0,0 +1,250 @@
+"""Sweep Thresholds values over labeled recordings and report the Pareto-best configs.
+
+Each recording session.hlm needs a sidecar session.labels.json:
+	{"segments": [{"start": 1.2, "end": 3.0, "gesture": "fist"}, ...]}
+with times in seconds from the start of the recording. Frames outside every segment are
+expected to produce no gesture. Hands are followed by track id, as in GestureController.
+
+Only the thresholds the per-hand classifier reads can be swept (see TUNABLE); holds, the mode
+switch and cooldowns happen after it and don't change the score.
+
+Usage:
+	python -m hastayanam.tuning sessions/*.hlm --grid stability_frames=3,4,5 pinch_distance_threshold=0.04,0.05
+	python -m hastayanam.tuning sessions/*.hlm --grid swipe_min_speed_px_s=400:900 --samples 200 --out best.json
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import argparse
+import itertools
+import json
+import os
+import random
+import numpy as np
+from .config import FILTER, THRESHOLDS, Thresholds
+from .filtering import filter_sequence
+from .gestures import GestureClassifier, HandFeatures, STATIC_CONFIDENCES, STATIC_LABELS, classify_features, hand_features
+from .recording import read_recording
+from .tracks import TrackAssociator
+from .utils import set_clock
+
+# Thresholds the evaluator's classifier pipeline reads; sweeping any other field can't change a score
+TUNABLE = (
+	"confidence_min", "stability_frames", "pinch_distance_threshold", "swipe_min_displacement_px",
+	"swipe_window_s", "swipe_min_speed_px_s", "swipe_refractory_s",
+)
+_FIELD_TYPES = {f.name: f.type for f in fields(Thresholds) if f.name in TUNABLE}
+
+
+@dataclass
+class Segment:
+	start: float
+	end: float
+	gesture: str
+
+
+@dataclass
+class _Stream:
+	label: str  # Handedness the track showed most often
+	frames: np.ndarray  # (K,) frame numbers in the session timeline where this hand was seen
+	pts: np.ndarray  # (K, 21, 3)
+	features: HandFeatures  # Threshold-independent, computed once per worker
+
+
+@dataclass
+class LabeledSession:
+	name: str
+	width: int
+	height: int
+	t: np.ndarray  # (F,) seconds from the first frame
+	streams: Dict[int, _Stream]  # By track id
+	segments: List[Segment]
+
+
+@dataclass
+class Score:
+	params: Dict[str, Any]
+	accuracy: float  # Fraction of labeled frames emitting the labeled gesture
+	false_triggers: int  # Gesture onsets that don't match the label at that time
+	latency_s: float  # Mean segment start -> first correct emission; misses count as the full segment
+	missed: int
+
+
+def load_session(path: str) -> LabeledSession:
+	with open(os.path.splitext(path)[0] + ".labels.json", encoding="utf-8") as fh:
+		segments = [Segment(**s) for s in json.load(fh)["segments"]]
+	times: List[float] = []
+	per_track: Dict[int, Tuple[List[int], List[np.ndarray], List[str]]] = {}
+	tracks = TrackAssociator()
+	width = height = 0
+	for i, (t, frame_res) in enumerate(read_recording(path)):
+		width, height = frame_res.width, frame_res.height
+		times.append(t)
+		for hand in tracks.apply(frame_res, t).hands:
+			idx, pts, labels = per_track.setdefault(hand.track_id, ([], [], []))
+			idx.append(i)
+			pts.append(hand.pts)
+			labels.append(hand.label)
+	t = np.asarray(times, dtype=np.float64)
+	t = t - t[0] if len(t) else t
+	streams = {}
+	for track_id, (idx, pts, labels) in per_track.items():
+		stacked = np.stack(pts)
+		if FILTER.enabled:
+			# Same smoothing GestureController applies live (without dropout prediction)
+			stacked = filter_sequence(stacked, t[idx])
+		label = max(set(labels), key=labels.count)
+		streams[track_id] = _Stream(label=label, frames=np.asarray(idx), pts=stacked, features=hand_features(stacked))
+	return LabeledSession(os.path.basename(path), width, height, t, streams, segments)
+
+
+def _apply(params: Dict[str, Any]):
+	for name, value in params.items():
+		setattr(THRESHOLDS, name, value)
+
+
+def _emit(session: LabeledSession) -> Tuple[np.ndarray, np.ndarray]:
+	"""Per-frame (gesture, confidence) after the real GestureClassifier, one classifier per track."""
+	n = len(session.t)
+	names = np.full(n, "unknown", dtype=object)
+	confs = np.zeros(n)
+	clock = [0.0]
+	set_clock(lambda: clock[0])
+	try:
+		# Right hands first so they win ties, as in GestureController
+		for track_id in sorted(session.streams, key=lambda tid: (session.streams[tid].label != "Right", tid)):
+			stream = session.streams[track_id]
+			clf = GestureClassifier()
+			static_idx = classify_features(stream.features).tolist()
+			labels, static_confs = STATIC_LABELS.tolist(), STATIC_CONFIDENCES.tolist()
+			for k, frame in enumerate(stream.frames.tolist()):
+				clock[0] = session.t[frame]
+				i = static_idx[k]
+				res = clf.infer(stream.pts[k], (session.width, session.height), (labels[i], static_confs[i]))
+				if res.confidence > confs[frame]:
+					names[frame] = res.name
+					confs[frame] = res.confidence
+	finally:
+		set_clock(None)
+	return names, confs
+
+
+def evaluate(sessions: Sequence[LabeledSession], params: Dict[str, Any]) -> Score:
+	defaults = {name: getattr(THRESHOLDS, name) for name in params}
+	_apply(params)
+	try:
+		correct = labeled = false_triggers = missed = 0
+		latencies: List[float] = []
+		for session in sessions:
+			names, confs = _emit(session)
+			fired = np.where(confs >= THRESHOLDS.confidence_min, names, "unknown")
+			truth = np.full(len(session.t), "unknown", dtype=object)
+			for seg in session.segments:
+				lo, hi = np.searchsorted(session.t, [seg.start, seg.end])
+				truth[lo:hi] = seg.gesture
+				hits = np.flatnonzero(fired[lo:hi] == seg.gesture)
+				if len(hits):
+					latencies.append(session.t[lo + hits[0]] - seg.start)
+				else:
+					missed += 1
+					latencies.append(seg.end - seg.start)
+			in_seg = truth != "unknown"
+			labeled += int(in_seg.sum())
+			correct += int((fired[in_seg] == truth[in_seg]).sum())
+			onset = (fired != "unknown") & np.concatenate([[True], fired[1:] != fired[:-1]])
+			false_triggers += int((onset & (fired != truth)).sum())
+		return Score(
+			params=params,
+			accuracy=correct / labeled if labeled else 0.0,
+			false_triggers=false_triggers,
+			latency_s=float(np.mean(latencies)) if latencies else 0.0,
+			missed=missed,
+		)
+	finally:
+		_apply(defaults)
+
+
+_WORKER_SESSIONS: List[LabeledSession] = []
+
+
+def _init_worker(paths: Sequence[str]):
+	global _WORKER_SESSIONS
+	_WORKER_SESSIONS = [load_session(p) for p in paths]
+
+
+def _evaluate_in_worker(params: Dict[str, Any]) -> Score:
+	return evaluate(_WORKER_SESSIONS, params)
+
+
+def pareto_front(scores: Sequence[Score]) -> List[Score]:
+	"""Scores not dominated on (higher accuracy, fewer false triggers, lower latency)."""
+	keys = np.array([(-s.accuracy, s.false_triggers, s.latency_s) for s in scores])
+	front = []
+	for i, k in enumerate(keys):
+		dominated = np.any(np.all(keys <= k, axis=1) & np.any(keys < k, axis=1))
+		if not dominated:
+			front.append(scores[i])
+	return sorted(front, key=lambda s: (-s.accuracy, s.false_triggers, s.latency_s))
+
+
+def _parse_value(name: str, text: str):
+	return int(float(text)) if _FIELD_TYPES[name] in (int, "int") else float(text)
+
+
+def candidates(specs: Sequence[str], samples: int = 0, seed: int = 0) -> List[Dict[str, Any]]:
+	"""Expand name=a,b,c (grid) and name=lo:hi (random range) specs into parameter dicts."""
+	grid: Dict[str, List[Any]] = {}
+	ranges: Dict[str, Tuple[float, float]] = {}
+	for spec in specs:
+		name, _, values = spec.partition("=")
+		if name not in _FIELD_TYPES:
+			raise ValueError(f"{name} can't be tuned here; the evaluator only uses {', '.join(TUNABLE)}")
+		if ":" in values:
+			lo, hi = values.split(":")
+			ranges[name] = (float(lo), float(hi))
+		else:
+			grid[name] = [_parse_value(name, v) for v in values.split(",")]
+	combos = [dict(zip(grid, vals)) for vals in itertools.product(*grid.values())]
+	if not ranges and not samples:
+		return combos
+	rng = random.Random(seed)
+	out = []
+	for _ in range(samples or 100):
+		params = dict(rng.choice(combos)) if grid else {}
+		for name, (lo, hi) in ranges.items():
+			is_int = _FIELD_TYPES[name] in (int, "int")
+			params[name] = rng.randint(int(lo), int(hi)) if is_int else rng.uniform(lo, hi)
+		out.append(params)
+	return out
+
+
+def sweep(paths: Sequence[str], params_list: Sequence[Dict[str, Any]], workers: Optional[int] = None) -> List[Score]:
+	# Sessions are loaded once per worker, never pickled per candidate
+	with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(list(paths),)) as pool:
+		chunk = max(1, len(params_list) // ((workers or os.cpu_count() or 1) * 4))
+		return list(pool.map(_evaluate_in_worker, params_list, chunksize=chunk))
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Threshold sweep over labeled landmark recordings")
+	parser.add_argument("recordings", nargs="+")
+	parser.add_argument("--grid", nargs="+", default=[], metavar="NAME=VALUES", help="a,b,c for a grid or lo:hi for a random range")
+	parser.add_argument("--samples", type=int, default=0, help="Random samples instead of the full grid")
+	parser.add_argument("--workers", type=int, default=None)
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--out", help="Write the Pareto front as JSON")
+	args = parser.parse_args()
+
+	params_list = candidates(args.grid, args.samples, args.seed) or [{}]
+	scores = sweep(args.recordings, params_list, args.workers)
+	front = pareto_front(scores)
+	print(f"{len(scores)} candidates, {len(front)} on the Pareto front")
+	for s in front:
+		print(f"acc={s.accuracy:.3f} false={s.false_triggers:4d} latency={s.latency_s:.3f}s missed={s.missed}  {s.params}")
+	if args.out:
+		with open(args.out, "w", encoding="utf-8") as fh:
+			json.dump([s.__dict__ for s in front], fh, indent=1)
+
+
+if __name__ == "__main__":
+	main()
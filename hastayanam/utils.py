@@ -1,7 +1,24 @@
+from collections import deque
+from itertools import chain
+from typing import Sequence, Tuple
 import time
 import numpy as np
 
 
+# Wall clock used by all gesture timing (holds, swipes, cooldowns, mode switch).
+# Replays swap it for recorded timestamps so timing logic runs faster than real time.
+_clock = time.time
+
+
+def now() -> float:
+	return _clock()
+
+
+def set_clock(fn=None):
+	global _clock
+	_clock = time.time if fn is None else fn
+
+
 class FpsMeter:
 	def __init__(self, smoothing: float = 0.9):
 		self.prev_time = None
@@ -21,11 +38,14 @@ class FpsMeter:
 		return self.fps
 
 
-def normalize_landmarks(landmarks, width: int, height: int):
-	# Convert to np.array of shape (21, 3), normalized to [0,1]
-	pts = np.array([[lm.x, lm.y, lm.z] for lm in landmarks], dtype=np.float32)
-	# Already normalized by MediaPipe in x,y; keep as-is for consistency
-	return pts
+def landmarks_to_array(hands: Sequence) -> np.ndarray:
+	"""(N, 21, 3) float32 from N hands' landmark sequences (protobuf or Tasks objects with x/y/z).
+
+	One np.fromiter over every coordinate of every hand, instead of a nested list per hand.
+	"""
+	n = len(hands)
+	coords = chain.from_iterable((lm.x, lm.y, lm.z) for hand in hands for lm in hand)
+	return np.fromiter(coords, dtype=np.float32, count=n * 63).reshape(n, 21, 3)
 
 
 def landmark_to_pixel(landmark_xy, width: int, height: int):
@@ -47,12 +67,10 @@ def distance(a: np.ndarray, b: np.ndarray) -> float:
 class RingBuffer:
 	def __init__(self, size: int):
 		self.size = size
-		self.buf = []
+		self.buf = deque(maxlen=size)
 
 	def append(self, item):
 		self.buf.append(item)
-		if len(self.buf) > self.size:
-			self.buf.pop(0)
 
 	def items(self):
 		return self.buf
@@ -61,16 +79,54 @@ class RingBuffer:
 		self.buf.clear()
 
 
+class TrajectoryBuffer:
+	"""Preallocated ring of timestamped 2D points, read back by time window rather than count,
+	so the same window covers the same motion at any frame rate. capacity must exceed the
+	samples in the longest window read (64 covers 0.5 s at 120 fps).
+	"""
+
+	def __init__(self, capacity: int = 64):
+		# Every sample is written twice, capacity apart, so the newest `capacity` samples are
+		# always one contiguous slice and window() can return views
+		self.capacity = capacity
+		self._t = np.zeros(2 * capacity, dtype=np.float64)
+		self._xy = np.zeros((2 * capacity, 2), dtype=np.float64)
+		self._i = 0
+		self.count = 0
+
+	def append(self, t: float, xy):
+		i = self._i
+		self._t[i] = self._t[i + self.capacity] = t
+		self._xy[i] = self._xy[i + self.capacity] = xy
+		self._i = (i + 1) % self.capacity
+		self.count += 1
+
+	def clear(self):
+		self._i = 0
+		self.count = 0
+
+	def window(self, seconds: float) -> Tuple[np.ndarray, np.ndarray]:
+		"""(t, xy) views of the samples within `seconds` of the newest one, oldest first.
+		Valid until the next append().
+		"""
+		end = self._i + self.capacity
+		t = self._t[end - min(self.count, self.capacity):end]
+		if not len(t):
+			return t, self._xy[end:end]
+		start = end - len(t) + int(np.searchsorted(t, t[-1] - seconds))
+		return self._t[start:end], self._xy[start:end]
+
+
 class CooldownManager:
 	def __init__(self, default_seconds: float = 0.6):
 		self.default_seconds = default_seconds
 		self._gesture_to_next_time = {}
 
 	def ready(self, gesture_name: str) -> bool:
-		now = time.time()
+		now = _clock()
 		return now >= self._gesture_to_next_time.get(gesture_name, 0.0)
 
 	def trigger(self, gesture_name: str, seconds: float | None = None):
-		now = time.time()
+		now = _clock()
 		interval = self.default_seconds if seconds is None else seconds
 		self._gesture_to_next_time[gesture_name] = now + interval